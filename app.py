@@ -1,24 +1,85 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.responses import HTMLResponse, RedirectResponse
 from uvicorn import run as app_run
-import time
 
+import json
+import time
 from typing import Optional
 
 # Importing constants and pipeline modules from the project
-from src.constants import APP_HOST, APP_PORT
-from src.pipline.prediction_pipeline import VehicleData, VehicleDataClassifier
-from src.pipline.training_pipeline import TrainingPipeline
+from src.constants import APP_HOST, APP_PORT, PREDICTION_DEFAULT_THRESHOLD
+from src.entity.model_holder import ModelHolder
+from src.entity.prediction_cache import PredictionCache
+from src.logger import logging
+from src.pipline.bulk_prediction import BulkPredictor
+from src.pipline.model_refresher import ModelRefresher
+from src.pipline.prediction_batcher import PredictionBatcher
+from src.pipline.prediction_pipeline import (VehicleData, VehicleDataBatch, VehicleDataClassifier, VehicleDataSchema,
+                                             VehicleDataValidationError)
+from src.pipline.training_jobs import TrainingJobManager
+from src.utils.executor import ExecutorOverloadedError, ServingExecutor
+from src.utils.json_codec import FastJSONResponse, json_loads
+from src.utils.metrics import (HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT,
+                               PREDICTION_BATCH_SIZE, PREDICTION_STAGE_DURATION, metrics_registry)
+
+# Production model shared by every request and worker thread of this process
+model_holder = ModelHolder()
+
+# Memo of recent row predictions, dropped whenever a new model is loaded
+prediction_cache = PredictionCache()
+model_holder.add_load_listener(prediction_cache.invalidate)
+
+# Thread pools that keep model loading and scoring off the event loop
+serving_executor = ServingExecutor()
+
+# Gathers concurrent single-row predictions into vectorized batches
+prediction_batcher = PredictionBatcher(
+    predict_func=VehicleDataClassifier(model_holder=model_holder,
+                                       prediction_cache=prediction_cache).predict_vehicle_data,
+    serving_executor=serving_executor
+)
+
+# Polls the model version marker and hot-swaps newly pushed models
+model_refresher = ModelRefresher(model_holder, serving_executor,
+                                 model_holder.prediction_pipeline_config.model_refresh_interval_seconds)
+
+# Field types and ranges of the JSON prediction API, read once from schema.yaml
+vehicle_data_schema = VehicleDataSchema.from_schema_file()
+
+# Runs training in a background process, one job at a time
+training_job_manager = TrainingJobManager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads and warms up the production model once at startup instead of on the first
+    prediction, so the readiness probe only passes once the model can serve traffic.
+    Later model versions are swapped in by the model refresher.
+    """
+    try:
+        await serving_executor.run_io(model_holder.load)
+    except Exception as e:
+        # Keep serving; the model is loaded on the first prediction instead
+        logging.error(f"Model could not be loaded at startup: {e}")
+    await prediction_batcher.start()
+    await model_refresher.start()
+    yield
+    await model_refresher.stop()
+    await prediction_batcher.stop()
+    training_job_manager.shutdown()
+    serving_executor.shutdown()
 
 # Initialize FastAPI application
 app = FastAPI(
     title="AI Vehicle Insurance Predictor",
     description="An ML-powered application to predict customer interest in vehicle insurance",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Mount the 'static' directory for serving static files (like CSS)
@@ -39,6 +100,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class RequestMetricsMiddleware:
+    """
+    Counts, times and tracks in-flight requests per route template.
+
+    A plain ASGI middleware rather than @app.middleware("http"): the timer stops
+    when the final response body message (more_body false) has been sent, so the
+    duration of a streamed response such as /predict/upload covers the whole
+    body instead of ending when the handler returns the StreamingResponse.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        recorded = False
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The route template (not the raw path) keeps label cardinality bounded
+            matched_route = scope.get("route")
+            route = matched_route.path if matched_route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.labels(route=route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method=scope["method"], route=route, status=status).inc()
+
+        async def send_and_record(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        finally:
+            # Requests that fail or are disconnected before the final body message
+            record()
+
+app.add_middleware(RequestMetricsMiddleware)
+
 class DataForm:
     """
     DataForm class to handle and process incoming form data.
@@ -86,23 +198,82 @@ async def index(request: Request):
     return templates.TemplateResponse(
             "vehicledata.html",{"request": request, "context": "Rendering"})
 
+# Liveness probe: the process is up and the event loop responds
+@app.get("/health/live", tags=["health"])
+async def livenessRouteClient():
+    """
+    Always returns 200 while the application can answer requests.
+    """
+    return {"status": "alive"}
+
+# Readiness probe: the production model is loaded and warmed up
+@app.get("/health/ready", tags=["health"])
+async def readinessRouteClient():
+    """
+    Returns 200 with the model version, load time and warm-up latency once the model
+    is resident, 503 while it is not so the load balancer holds back traffic.
+    """
+    model_info = model_holder.get_model_info()
+    if not model_info["loaded"]:
+        return JSONResponse(status_code=503, content=dict(model_info, status="not ready"))
+    return dict(model_info, status="ready")
+
+# Route to report which model is resident and when it was loaded
+@app.get("/model", tags=["model"])
+async def modelInfoRouteClient():
+    """
+    Returns the identity and load time of the resident production model.
+    """
+    return model_holder.get_model_info()
+
+# Route to check for a newly pushed model now instead of at the next refresher poll
+@app.post("/model/refresh", tags=["model"])
+async def modelRefreshRouteClient():
+    """
+    Swaps in the model version the version marker names, if it changed, and returns the
+    identity of the resident model; requests keep being served during the load.
+    """
+    swapped = await model_refresher.check()
+    return dict(model_holder.get_model_info(), swapped=swapped)
+
+# Route to expose request, stage latency, model load and batch size metrics to Prometheus
+@app.get("/metrics", tags=["model"])
+async def metricsRouteClient():
+    """
+    Returns every metric of this process in the Prometheus text exposition format.
+    """
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Route to report queue depth and load of the serving thread pools
+@app.get("/executor/stats", tags=["model"])
+async def executorStatsRouteClient():
+    """
+    Returns queued, running and completed task counts of the inference and I/O pools
+    and the batch sizes formed by the prediction batcher.
+    """
+    return dict(serving_executor.get_stats(), batcher=prediction_batcher.get_stats())
+
+# Route to report prediction cache effectiveness
+@app.get("/cache/stats", tags=["model"])
+async def cacheStatsRouteClient():
+    """
+    Returns hit, miss and eviction counters and the size of the prediction cache.
+    """
+    return prediction_cache.get_stats()
+
 # Route to trigger the model training process
 @app.get("/train", tags=["model"])
 async def trainRouteClient(request: Request):
     """
-    Endpoint to initiate the model training pipeline.
+    Endpoint to start the model training pipeline in the background.
+    Returns immediately; a request made while training runs joins the running job.
     """
     try:
-        # Add a small delay to simulate AI processing
-        time.sleep(1)
-        
-        train_pipeline = TrainingPipeline()
-        train_pipeline.run_pipeline()
-        
-        # Return to the main page with a success message
+        job, created = training_job_manager.submit()
+        message = "started" if created else "already running"
         return templates.TemplateResponse(
             "vehicledata.html",
-            {"request": request, "context": "Model trained successfully!"}
+            {"request": request, "context": f"Training job {job.job_id} {message}"}
         )
 
     except Exception as e:
@@ -111,6 +282,36 @@ async def trainRouteClient(request: Request):
             {"request": request, "context": f"Error: {str(e)}"}
         )
 
+# Route to start a training job from API clients
+@app.post("/train/jobs", tags=["model"])
+async def trainJobSubmitRouteClient():
+    """
+    Starts a background training job, or returns the running one.
+    Responds 202 with the job status; "created" is false when the submission was coalesced.
+    """
+    job, created = training_job_manager.submit()
+    job_info = training_job_manager.get_job(job.job_id)
+    return JSONResponse(status_code=202, content=dict(job_info, created=created))
+
+# Route to list recent training jobs
+@app.get("/train/jobs", tags=["model"])
+async def trainJobsRouteClient():
+    """
+    Returns the recent training jobs, most recent first.
+    """
+    return dict(training_job_manager.get_stats(), history=training_job_manager.get_jobs())
+
+# Route to report the progress of one training job
+@app.get("/train/jobs/{job_id}", tags=["model"])
+async def trainJobStatusRouteClient(job_id: str):
+    """
+    Returns the status, running stage and per-stage durations of a training job.
+    """
+    job_info = training_job_manager.get_job(job_id)
+    if job_info is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown training job {job_id}"})
+    return job_info
+
 # Route to handle form submission and make predictions
 @app.post("/", tags=["prediction"])
 async def predictRouteClient(request: Request):
@@ -118,11 +319,9 @@ async def predictRouteClient(request: Request):
     Endpoint to receive form data, process it, and make a prediction.
     """
     try:
-        # Add a small delay to simulate AI processing
-        time.sleep(0.5)
-        
         form = DataForm(request)
-        await form.get_vehicle_data()
+        with PREDICTION_STAGE_DURATION.labels(stage="form_parse").time():
+            await form.get_vehicle_data()
         
         vehicle_data = VehicleData(
                                 Gender= form.Gender,
@@ -138,14 +337,8 @@ async def predictRouteClient(request: Request):
                                 Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
                                 )
 
-        # Convert form data into a DataFrame for the model
-        vehicle_df = vehicle_data.get_vehicle_input_data_frame()
-
-        # Initialize the prediction pipeline
-        model_predictor = VehicleDataClassifier()
-
-        # Make a prediction and retrieve the result
-        value = model_predictor.predict(dataframe=vehicle_df)[0]
+        # Make a prediction through the micro-batcher and retrieve the result
+        value = await prediction_batcher.predict(vehicle_data)
 
         # Interpret the prediction result as 'Response-Yes' or 'Response-No'
         status = "Response-Yes" if value == 1 else "Response-No"
@@ -162,6 +355,163 @@ async def predictRouteClient(request: Request):
             {"request": request, "context": f"Error: {str(e)}"},
         )
 
+# Route to score one record posted as JSON, for machine clients
+@app.post("/predict", tags=["prediction"])
+async def predictJsonRouteClient(request: Request):
+    """
+    Endpoint to receive the 11 model features as a JSON object and return the prediction.
+    Body: {"Gender": 1, "Age": 44, "Driving_License": 1, "Region_Code": 28.0, ...}
+    Response: {"prediction": 1, "status": "Response-Yes"}; 422 with per-field errors
+    when a field is missing, not numeric or outside the range configured in schema.yaml.
+    """
+    try:
+        vehicle_data = vehicle_data_schema.parse(json_loads(await request.body()))
+    except VehicleDataValidationError as e:
+        return FastJSONResponse(status_code=422, content={"errors": e.errors})
+    except ValueError:
+        return FastJSONResponse(status_code=422, content={"errors": {"body": "invalid JSON"}})
+
+    try:
+        value = await prediction_batcher.predict(vehicle_data)
+        return FastJSONResponse({"prediction": int(value), "status": "Response-Yes" if value == 1 else "Response-No"})
+    except ExecutorOverloadedError as e:
+        return FastJSONResponse(status_code=503, content={"error": str(e)})
+    except Exception as e:
+        return FastJSONResponse(status_code=500, content={"error": str(e)})
+
+# Route to score many records with a single vectorized model call
+@app.post("/predict/batch", tags=["prediction"])
+async def predictBatchRouteClient(request: Request):
+    """
+    Endpoint to receive a JSON list of records and return one prediction per record.
+    Body: {"records": [{"Gender": 1, "Age": 44, ...}, ...]}
+    Every record is validated like the body of /predict; 422 with errors keyed
+    "records[<position>].<field>" when one is not.
+    """
+    try:
+        payload = json_loads(await request.body())
+    except ValueError:
+        return FastJSONResponse(status_code=422, content={"errors": {"body": "invalid JSON"}})
+    try:
+        records = payload.get("records") if isinstance(payload, dict) else payload
+        vehicle_batch = VehicleDataBatch(records, vehicle_data_schema)
+    except VehicleDataValidationError as e:
+        return FastJSONResponse(status_code=422, content={"errors": e.errors})
+    PREDICTION_BATCH_SIZE.labels(source="batch_api").observe(len(vehicle_batch))
+
+    try:
+        # One preprocessing transform and one forest predict over the whole batch
+        vehicle_df = vehicle_batch.get_vehicle_input_data_frame()
+        model_predictor = VehicleDataClassifier(model_holder=model_holder)
+        values = await serving_executor.run_inference(model_predictor.predict, dataframe=vehicle_df)
+
+        predictions = [
+            {"prediction": int(value), "status": "Response-Yes" if value == 1 else "Response-No"}
+            for value in values
+        ]
+        return FastJSONResponse({"count": len(predictions), "predictions": predictions})
+
+    except ExecutorOverloadedError as e:
+        return FastJSONResponse(status_code=503, content={"error": str(e)})
+    except Exception as e:
+        return FastJSONResponse(status_code=500, content={"error": str(e)})
+
+# Route to score and rank many records with a single vectorized probability pass
+@app.post("/predict/proba", tags=["prediction"])
+async def predictProbaRouteClient(request: Request):
+    """
+    Endpoint to receive a JSON list of records and return, for every record, the
+    probability of a positive response and its class at the requested threshold,
+    plus the records ranked by descending score.
+    Body: {"records": [...], "threshold": 0.5, "top_k": 100}
+    Records are validated like the body of /predict; 422 with errors keyed
+    "records[<position>].<field>", "threshold" or "top_k" when the input is invalid.
+    """
+    try:
+        payload = json_loads(await request.body())
+    except ValueError:
+        return FastJSONResponse(status_code=422, content={"errors": {"body": "invalid JSON"}})
+    if not isinstance(payload, dict):
+        return FastJSONResponse(status_code=422,
+                                content={"errors": {"body": "expected a JSON object with a 'records' list"}})
+
+    errors, vehicle_batch = {}, None
+    try:
+        vehicle_batch = VehicleDataBatch(payload.get("records"), vehicle_data_schema)
+    except VehicleDataValidationError as e:
+        errors.update(e.errors)
+    threshold = payload.get("threshold", PREDICTION_DEFAULT_THRESHOLD)
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not 0.0 <= threshold <= 1.0:
+        errors["threshold"] = "must be a number between 0 and 1"
+    top_k = payload.get("top_k")
+    if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+        errors["top_k"] = "must be a positive integer"
+    if errors:
+        return FastJSONResponse(status_code=422, content={"errors": errors})
+    threshold = float(threshold)
+    PREDICTION_BATCH_SIZE.labels(source="batch_api").observe(len(vehicle_batch))
+
+    try:
+        vehicle_df = vehicle_batch.get_vehicle_input_data_frame()
+        model_predictor = VehicleDataClassifier(model_holder=model_holder)
+        result = await serving_executor.run_inference(model_predictor.score, vehicle_df,
+                                                      threshold=threshold, top_k=top_k)
+
+        scores = [
+            {"score": float(score), "prediction": int(value),
+             "status": "Response-Yes" if value == 1 else "Response-No"}
+            for score, value in zip(result.scores, result.predictions)
+        ]
+        return FastJSONResponse({"count": len(scores), "threshold": result.threshold,
+                                 "scores": scores, "ranking": result.ranking.tolist()})
+
+    except ExecutorOverloadedError as e:
+        return FastJSONResponse(status_code=503, content={"error": str(e)})
+    except Exception as e:
+        return FastJSONResponse(status_code=500, content={"error": str(e)})
+
+# Route to score an uploaded CSV/NDJSON file, streaming results back chunk by chunk
+@app.post("/predict/upload", tags=["prediction"])
+async def predictUploadRouteClient(request: Request):
+    """
+    Endpoint to receive a multipart upload ('file' field) of raw or engineered customer
+    rows and stream back one NDJSON line per row, followed by a summary line with rows/sec.
+    A chunk with a feature outside the schema.yaml ranges ends the stream with an
+    {"errors": ...} line keyed "row <number>.<field>", as /predict reports fields.
+    The upload is spooled to disk by the form parser and read in fixed-size chunks,
+    so memory use does not grow with the size of the file.
+    """
+    try:
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "file"):
+            raise ValueError("Expected a multipart upload in the 'file' field")
+        file_format = BulkPredictor.get_file_format(upload.filename, upload.content_type)
+    except ValueError as e:
+        return JSONResponse(status_code=422, content={"error": str(e)})
+
+    bulk_predictor = BulkPredictor(VehicleDataClassifier(model_holder=model_holder), schema=vehicle_data_schema)
+
+    async def stream_predictions():
+        try:
+            chunks = bulk_predictor.read_chunks(upload.file, file_format)
+            while True:
+                # Parsing and scoring both block, so neither runs on the event loop
+                chunk = await serving_executor.run_io(next, chunks, None)
+                if chunk is None:
+                    break
+                scored = await serving_executor.run_inference(bulk_predictor.score_chunk, chunk)
+                yield scored.to_json(orient="records", lines=True, double_precision=15).rstrip("\n") + "\n"
+            yield json.dumps({"summary": bulk_predictor.get_summary()}) + "\n"
+        except VehicleDataValidationError as e:
+            yield json.dumps({"errors": e.errors, "summary": bulk_predictor.get_summary()}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e), "summary": bulk_predictor.get_summary()}) + "\n"
+        finally:
+            await upload.close()
+
+    return StreamingResponse(stream_predictions(), media_type="application/x-ndjson")
+
 # Main entry point to start the FastAPI server
 if __name__ == "__main__":
     app_run(app, host=APP_HOST, port=APP_PORT)
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+Load-tests the FastAPI app in-process and reports throughput and latency percentiles as JSON.
+
+The app is driven through its ASGI interface (httpx.ASGITransport) with its
+lifespan running, so startup model loading, the micro-batcher, the executors
+and the metrics middleware all take part. S3 is replaced by a local directory
+(benchmarks.local_storage) holding the model.pkl, which still goes through
+Proj1Estimator and ModelHolder. Each scenario sends --requests requests from
+--concurrency concurrent clients, drawing records from a pool of distinct
+synthetic rows so the prediction cache only hits on repeats. The client runs
+in the same process and on the same CPUs as the app: numbers compare
+revisions and settings on one machine, not a production deployment.
+
+Settings read at import time (USE_COMPILED_FOREST, PREDICTION_BATCH_MAX_WAIT_MS,
+INFERENCE_WORKERS, ...) are passed with --env KEY=VALUE.
+
+Usage: python -m benchmarks.bench_app_load [--model path/to/model.pkl] [--concurrency 1 16]
+       [--requests 500] [--scenarios predict_json predict_form] [--output results.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+def make_records(n_rows: int, seed: int = 3) -> list:
+    from benchmarks.synthetic_model import make_features
+
+    # A JSON round trip turns the numpy scalars into plain ints and floats
+    return json.loads(make_features(n_rows, seed=seed).to_json(orient="records"))
+
+
+def build_scenarios(records: list, batch_size: int) -> dict:
+    """
+    Returns scenario name -> (path, request kwargs for request i, response check).
+    """
+    def batch(i: int) -> list:
+        start = (i * batch_size) % len(records)
+        return (records[start:] + records[:start])[:batch_size]
+
+    return {
+        "predict_json": ("/predict",
+                         lambda i: {"json": records[i % len(records)]},
+                         lambda response: response.status_code == 200),
+        # The page renders a prediction error like a negative result, so only the result block is checked
+        "predict_form": ("/",
+                         lambda i: {"data": {name: str(value) for name, value in records[i % len(records)].items()}},
+                         lambda response: response.status_code == 200 and 'class="result ' in response.text),
+        "predict_batch": ("/predict/batch",
+                          lambda i: {"json": {"records": batch(i)}},
+                          lambda response: response.status_code == 200),
+        "predict_proba": ("/predict/proba",
+                          lambda i: {"json": {"records": batch(i), "top_k": 10}},
+                          lambda response: response.status_code == 200),
+    }
+
+
+def summarize(latencies: list, elapsed: float, statuses: Counter, failures: int) -> dict:
+    latencies_ms = np.asarray(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": round(float(latencies_ms.mean()), 2),
+            "p50": round(float(np.percentile(latencies_ms, 50)), 2),
+            "p95": round(float(np.percentile(latencies_ms, 95)), 2),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 2),
+            "max": round(float(latencies_ms.max()), 2),
+        },
+    }
+
+
+async def run_scenario(client, scenario: tuple, concurrency: int, requests: int, first_request: int = 0) -> dict:
+    """
+    Sends requests numbered first_request onwards; runs start at different numbers
+    so they do not replay the records (and cached predictions) of earlier runs.
+    """
+    path, build_request, is_success = scenario
+    request_ids = itertools.count(first_request)
+    latencies, statuses = [], Counter()
+    failures = 0
+
+    async def run_client():
+        nonlocal failures
+        while True:
+            request_id = next(request_ids)
+            if request_id >= first_request + requests:
+                return
+            request_kwargs = build_request(request_id)
+            start = time.perf_counter()
+            response = await client.post(path, **request_kwargs)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+            if not is_success(response):
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, statuses, failures)
+
+
+async def run_load_test(args) -> dict:
+    import httpx
+
+    from app import app
+
+    records = make_records(args.pool_size)
+    scenarios = build_scenarios(records, args.batch_size)
+    results = []
+    first_request = 0
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for name in args.scenarios:
+                # Warm-up pass, discarded
+                await run_scenario(client, scenarios[name], 1, args.warmup_requests, first_request)
+                first_request += args.warmup_requests
+                for concurrency in args.concurrency:
+                    result = await run_scenario(client, scenarios[name], concurrency, args.requests, first_request)
+                    first_request += args.requests
+                    results.append(dict(scenario=name, route=scenarios[name][0], concurrency=concurrency,
+                                        batch_size=args.batch_size if name in ("predict_batch", "predict_proba")
+                                        else 1, **result))
+                    print(f"{name} c={concurrency}: {result['throughput_rps']} req/s, "
+                          f"p99 {result['latency_ms']['p99']} ms", file=sys.stderr)
+    return results
+
+
+def get_git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="dill-pickled MyModel; a synthetic model is trained when omitted")
+    parser.add_argument("--scenarios", nargs="+", default=["predict_json", "predict_form", "predict_batch",
+                                                           "predict_proba"],
+                        choices=["predict_json", "predict_form", "predict_batch", "predict_proba"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario and concurrency")
+    parser.add_argument("--warmup-requests", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=100, help="Records per batch request")
+    parser.add_argument("--pool-size", type=int, default=10000, help="Distinct synthetic records to draw from")
+    parser.add_argument("--env", nargs="*", default=[], metavar="KEY=VALUE",
+                        help="Environment settings applied before the app is imported")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    settings = dict(entry.split("=", 1) for entry in args.env)
+    os.environ.update(settings)
+    # The project is imported only now: its config dataclasses read the environment at import time
+    from benchmarks.local_storage import use_local_storage
+    from benchmarks.synthetic_model import load_or_build_model
+    from src.constants import MODEL_BUCKET_NAME, MODEL_FILE_NAME
+    from src.utils.common import save_object
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        model_path = os.path.join(storage_dir, MODEL_BUCKET_NAME, MODEL_FILE_NAME)
+        save_object(model_path, load_or_build_model(args.model))
+        with use_local_storage(storage_dir):
+            results = asyncio.run(run_load_test(args))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": get_git_revision(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "model": args.model or "synthetic",
+        "env": settings,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares the compiled flat-array forest engine with sklearn's predict.
+
+Usage: python -m benchmarks.bench_forest_engine [--model path/to/model.pkl]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_model import load_or_build_model, make_features
+from src.constants import PREDICTION_FEATURE_COLUMNS
+from src.entity.forest_engine import CompiledForest
+
+
+def time_call(func, X, min_seconds: float = 1.0) -> float:
+    """
+    Returns the mean seconds per call of func(X), repeating for at least min_seconds.
+    """
+    func(X)
+    calls, start = 0, time.perf_counter()
+    while True:
+        func(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="dill-pickled MyModel; a synthetic model is trained when omitted")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 10000])
+    args = parser.parse_args()
+
+    model = load_or_build_model(args.model)
+    forest = model.trained_model_object
+    start = time.perf_counter()
+    compiled_forest = CompiledForest.from_sklearn(forest)
+    compile_seconds = time.perf_counter() - start
+
+    features = make_features(max(args.batch_sizes), seed=42)
+    X = model.get_compiled_preprocessor().transform(features[list(PREDICTION_FEATURE_COLUMNS)].to_numpy("float64"))
+
+    results = {"n_trees": compiled_forest.n_trees, "n_nodes": int(len(compiled_forest.feature)),
+               "compile_seconds": compile_seconds, "batches": []}
+    for batch_size in args.batch_sizes:
+        batch = X[:batch_size]
+        identical = (np.array_equal(forest.predict_proba(batch), compiled_forest.predict_proba(batch))
+                     and np.array_equal(forest.predict(batch), compiled_forest.predict(batch)))
+        sklearn_seconds = time_call(forest.predict, batch)
+        compiled_seconds = time_call(compiled_forest.predict, batch)
+        results["batches"].append({
+            "batch_size": batch_size,
+            "identical": bool(identical),
+            "sklearn_ms": sklearn_seconds * 1e3,
+            "compiled_ms": compiled_seconds * 1e3,
+            "speedup": sklearn_seconds / compiled_seconds,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
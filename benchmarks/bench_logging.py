@@ -0,0 +1,138 @@
+"""
+Times a request with logging enabled and disabled in each logging mode.
+
+Every mode runs in a fresh process, because src.logger configures logging at
+import time. A request is a POST /predict/batch of one JSON record to the
+FastAPI app, driven through its ASGI interface (httpx.ASGITransport) with its
+lifespan running: routing, the metrics middleware, validation, the executors,
+VehicleDataClassifier and the compiled forest, which emit the info lines of
+production (the single-record routes log nothing per request). S3 is replaced
+by a local directory (benchmarks.local_storage); every request sends a
+distinct synthetic record, so none is answered from the prediction cache.
+
+Within a process requests alternate between logging enabled and switched off
+with logging.disable, so both see the same warm-up and machine state;
+logging_overhead_us is the difference of their means. Requests are sent one at
+a time with a short idle interval, as a lightly loaded worker sees them, so a
+background listener can drain the queue between them. Console output goes to
+/dev/null; the log file is written as usual. dropped_records counts the
+records discarded by the rate limit or a full queue.
+
+Usage: python -m benchmarks.bench_logging [--model path/to/model.pkl] [--requests 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "sync": {"LOG_MODE": "sync"},
+    "queue": {"LOG_MODE": "queue"},
+    "queue_rate_limited": {"LOG_MODE": "queue", "LOG_RATE_LIMIT_PER_SECOND": "10"},
+    "queue_module_levels": {"LOG_MODE": "queue",
+                            "LOG_MODULE_LEVELS": "src.entity.estimator=WARNING,src.pipline=WARNING"},
+}
+# Scored on the compiled forest, so the request is not dominated by sklearn's per-call overhead
+CHILD_ENV = {"USE_COMPILED_FOREST": "1"}
+
+
+def percentile_us(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6, 1)
+
+
+def summarize(samples: list) -> dict:
+    return {"mean_us": round(sum(samples) / len(samples) * 1e6, 1),
+            "p50_us": percentile_us(samples, 0.50), "p99_us": percentile_us(samples, 0.99)}
+
+
+async def time_requests(requests: int, interval_ms: float) -> dict:
+    """
+    :return: "enabled" and "disabled" -> request durations in seconds
+    """
+    import httpx
+
+    from app import app
+    from benchmarks.bench_app_load import make_records
+    from src.logger import logging
+
+    # The benchmark client's own request log is not part of the request path
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    records = make_records(requests)
+    samples = {"enabled": [], "disabled": []}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for record in records[:50]:
+                await client.post("/predict/batch", json={"records": [record]})
+            for i, record in enumerate(records):
+                logging_enabled = i % 2 == 0
+                logging.disable(logging.NOTSET if logging_enabled else logging.CRITICAL)
+                await asyncio.sleep(interval_ms / 1e3)
+                start = time.perf_counter()
+                response = await client.post("/predict/batch", json={"records": [record]})
+                samples["enabled" if logging_enabled else "disabled"].append(time.perf_counter() - start)
+                response.raise_for_status()
+            logging.disable(logging.NOTSET)
+    return samples
+
+
+def run_child(model_path: str, requests: int, interval_ms: float) -> dict:
+    from benchmarks.local_storage import use_local_storage
+    from src.constants import MODEL_BUCKET_NAME, MODEL_FILE_NAME
+    from src.utils.common import load_object, save_object
+    from src.utils.metrics import LOG_RECORDS_DROPPED
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        save_object(os.path.join(storage_dir, MODEL_BUCKET_NAME, MODEL_FILE_NAME), load_object(model_path))
+        with use_local_storage(storage_dir):
+            samples = asyncio.run(time_requests(requests, interval_ms))
+    enabled, disabled = summarize(samples["enabled"]), summarize(samples["disabled"])
+    return {"enabled": enabled, "disabled": disabled,
+            "logging_overhead_us": round(enabled["mean_us"] - disabled["mean_us"], 1),
+            "dropped_records": {reason: int(LOG_RECORDS_DROPPED.labels(reason=reason).get())
+                                for reason in ("rate_limited", "queue_full")}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="dill-pickled MyModel; a synthetic model is trained when omitted")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="Idle time between requests")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.model, args.requests, args.interval_ms)))
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        model_path = args.model
+        if model_path is None:
+            from benchmarks.synthetic_model import build_model
+            from src.utils.common import save_object
+            model_path = os.path.join(work_dir, "model.pkl")
+            save_object(model_path, build_model())
+
+        results = {}
+        for mode, env in MODES.items():
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_logging", "--child",
+                 "--model", model_path, "--requests", str(args.requests),
+                 "--interval-ms", str(args.interval_ms)],
+                env=dict(os.environ, **CHILD_ENV, **env), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                check=True, text=True,
+            ).stdout
+            results[mode] = dict(json.loads(output.strip().splitlines()[-1]), env=env)
+
+    for mode in results.values():
+        mode["saved_us_vs_sync"] = round(results["sync"]["logging_overhead_us"] - mode["logging_overhead_us"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compares loading the model from the dill pickle and from the memory-mapped model artifact.
+
+Every load runs in a fresh process, so import state and allocator reuse do not
+carry over. Per format the child measures the load time, RSS/PSS growth
+after the load and after scoring 1000 rows (which touches the node arrays),
+and checks the predictions. Modes:
+  pickle    pickle.loads of the whole file read into memory, as SimpleStorageService.load_model does
+  artifact  load_model_artifact, a memory map of the aligned arrays
+  manifest  read_model_artifact_manifest, the metadata alone
+The artifact file is in the page cache for every run after the first, as on a
+node where workers restart; first-read disk time is not measured.
+
+Usage: python -m benchmarks.bench_model_artifact [--model path/to/model.pkl] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.bench_shared_model_store import read_memory_kb
+
+
+def run_child(mode: str, model_path: str, artifact_path: str) -> dict:
+    from benchmarks.synthetic_model import make_features
+    from src.entity.model_store import load_model_artifact, read_model_artifact_manifest
+
+    features = make_features(1000, seed=7)
+    memory_before = read_memory_kb()
+    start = time.perf_counter()
+    if mode == "pickle":
+        with open(model_path, "rb") as file_obj:
+            model = pickle.loads(file_obj.read())
+    elif mode == "artifact":
+        model = load_model_artifact(artifact_path)
+    else:
+        read_model_artifact_manifest(artifact_path)
+        model = None
+    load_seconds = time.perf_counter() - start
+    memory_loaded = read_memory_kb()
+
+    result = {"load_ms": load_seconds * 1e3,
+              "rss_after_load_mb": (memory_loaded["rss"] - memory_before["rss"]) / 1024}
+    if model is not None:
+        start = time.perf_counter()
+        predictions = model.predict(features)
+        result["first_predict_ms"] = (time.perf_counter() - start) * 1e3
+        memory_scored = read_memory_kb()
+        result["rss_after_predict_mb"] = (memory_scored["rss"] - memory_before["rss"]) / 1024
+        result["pss_after_predict_mb"] = (memory_scored["pss"] - memory_before["pss"]) / 1024
+        result["checksum"] = int(np.sum(predictions))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="dill-pickled MyModel; a synthetic model is trained when omitted")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per mode")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "MODEL", "ARTIFACT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(*args.child)))
+        return
+
+    from benchmarks.synthetic_model import load_or_build_model
+    from src.entity.model_store import save_model_artifact
+    from src.utils.common import save_object
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        model_path = args.model
+        model = load_or_build_model(model_path)
+        if model_path is None:
+            model_path = os.path.join(work_dir, "model.pkl")
+            save_object(model_path, model)
+        artifact_path = os.path.join(work_dir, "model.vipmodel")
+        start = time.perf_counter()
+        save_model_artifact(artifact_path, model)
+        convert_seconds = time.perf_counter() - start
+        del model
+
+        results = {
+            "model_pickle_mb": round(os.path.getsize(model_path) / 1024 / 1024, 2),
+            "model_artifact_mb": round(os.path.getsize(artifact_path) / 1024 / 1024, 2),
+            "convert_seconds": round(convert_seconds, 3),
+            "modes": {},
+        }
+        for mode in ("pickle", "artifact", "manifest"):
+            runs = []
+            for _ in range(args.repeat):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_model_artifact", "--child", mode, model_path,
+                     artifact_path],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, text=True,
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            results["modes"][mode] = {
+                name: round(statistics.median(run[name] for run in runs), 2)
+                for name in runs[0] if name != "checksum"
+            }
+            if "checksum" in runs[0]:
+                results["modes"][mode]["checksums"] = sorted({run["checksum"] for run in runs})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compares model compression codecs: stored size, download time and load time per codec.
+
+Runs against a local S3 stand-in (benchmarks.local_s3). Per codec the model
+is written with save_object(compression=...) and uploaded with upload_file,
+which records the codec in the object metadata. Measured:
+  size_mb / ratio      stored model size, and the uncompressed size divided by it
+  save_seconds         pickling and compressing into the local file
+  download_seconds     download_file of the stored object, the transfer alone
+  s3_load_seconds      SimpleStorageService.load_model: download, decompress and unpickle
+  s3_load_peak_mb      peak Python/numpy allocations during load_model (tracemalloc, separate run)
+  disk_load_seconds    load_object of the local file, as a model cache hit does
+Every codec's model must predict identically to the original. The stand-in
+has no network latency or bandwidth limit; against S3 the download share and
+so the gain of smaller objects is larger.
+
+Usage: python -m benchmarks.bench_model_compression [--model path/to/model.pkl] [--codecs none gzip lzma zstd]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+BUCKET_NAME = "benchmark-bucket"
+
+
+def time_call(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    from src.utils.compression import zstandard
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="dill-pickled MyModel; a synthetic model is trained when omitted")
+    parser.add_argument("--codecs", nargs="+",
+                        default=["none", "gzip", "bz2", "lzma"] + (["zstd"] if zstandard is not None else []))
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (median reported)")
+    args = parser.parse_args()
+
+    from benchmarks.local_s3 import create_bucket, local_s3_server
+    from benchmarks.synthetic_model import load_or_build_model
+    from src.entity.model_holder import make_synthetic_features
+    from src.utils.common import load_object, save_object
+
+    model = load_or_build_model(args.model)
+    features = make_synthetic_features(1000, seed=3)
+    expected = model.predict_proba(features)
+
+    with local_s3_server(), tempfile.TemporaryDirectory() as work_dir:
+        from src.cloud_storage.aws_storage import SimpleStorageService
+
+        create_bucket(BUCKET_NAME)
+        storage = SimpleStorageService()
+        results = {"codecs": {}}
+        for codec in args.codecs:
+            model_path = os.path.join(work_dir, f"model-{codec}.pkl")
+            model_key = f"model-{codec}.pkl"
+            save_seconds = time_call(lambda: save_object(model_path, model, compression=codec), 1)
+            storage.upload_file(model_path, to_filename=model_key, bucket_name=BUCKET_NAME, remove=False)
+
+            download_path = os.path.join(work_dir, "download.bin")
+            download_seconds = time_call(lambda: storage.download_file(model_key, BUCKET_NAME, download_path),
+                                         args.repeat)
+            s3_load_seconds = time_call(lambda: storage.load_model(model_key, BUCKET_NAME), args.repeat)
+            disk_load_seconds = time_call(lambda: load_object(model_path), args.repeat)
+
+            tracemalloc.start()
+            loaded_model = storage.load_model(model_key, BUCKET_NAME)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results["codecs"][codec] = {
+                "size_mb": round(os.path.getsize(model_path) / 1024 / 1024, 2),
+                "save_seconds": round(save_seconds, 3),
+                "download_seconds": round(download_seconds, 3),
+                "s3_load_seconds": round(s3_load_seconds, 3),
+                "s3_load_peak_mb": round(peak_bytes / 1024 / 1024, 1),
+                "disk_load_seconds": round(disk_load_seconds, 3),
+                "identical_predictions": bool(np.array_equal(loaded_model.predict_proba(features), expected)),
+            }
+        uncompressed_size = results["codecs"].get("none", {}).get("size_mb")
+        for codec_result in results["codecs"].values():
+            if uncompressed_size:
+                codec_result["ratio"] = round(uncompressed_size / codec_result["size_mb"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
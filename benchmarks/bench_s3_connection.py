@@ -0,0 +1,107 @@
+"""
+Compares a fresh boto3 client and resource per S3Connection with the shared, pooled connection.
+
+Runs against a local S3 stand-in (benchmarks.local_s3). "per_instance" does
+what S3Connection did before: boto3.client and boto3.resource on every
+construction. "shared" is the current S3Connection. Measured:
+  construction   creating the storage connection alone
+  request_path   connection + one HEAD request, as each prediction or model
+                 check did, so every per_instance request opens a new HTTP connection
+  concurrent     --threads threads doing request_path at once, as the serving I/O pool does
+
+Usage: python -m benchmarks.bench_s3_connection [--iterations 200] [--threads 8]
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+BUCKET_NAME = "benchmark-bucket"
+OBJECT_KEY = "model.pkl"
+
+
+def connect_per_instance():
+    import boto3
+
+    from src.constants import AWS_ACCESS_KEY_ID_ENV_KEY, AWS_SECRET_ACCESS_KEY_ENV_KEY, REGION_NAME
+
+    credentials = dict(aws_access_key_id=os.getenv(AWS_ACCESS_KEY_ID_ENV_KEY),
+                       aws_secret_access_key=os.getenv(AWS_SECRET_ACCESS_KEY_ENV_KEY), region_name=REGION_NAME)
+    return boto3.client("s3", **credentials), boto3.resource("s3", **credentials)
+
+
+def connect_shared():
+    from src.configuration.aws_connection import S3Connection
+
+    connection = S3Connection()
+    return connection.s3_client, connection.s3_resource
+
+
+def summarize(samples: list, elapsed: float = None) -> dict:
+    result = {"mean_ms": round(statistics.mean(samples) * 1e3, 3),
+              "p50_ms": round(statistics.median(samples) * 1e3, 3),
+              "p99_ms": round(sorted(samples)[int(0.99 * (len(samples) - 1))] * 1e3, 3)}
+    if elapsed is not None:
+        result["throughput_rps"] = round(len(samples) / elapsed, 1)
+    return result
+
+
+def time_calls(func, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def request_path(connect) -> None:
+    s3_client, _ = connect()
+    s3_client.head_object(Bucket=BUCKET_NAME, Key=OBJECT_KEY)
+
+
+def run_concurrent(connect, threads: int, iterations: int) -> dict:
+    samples, lock = [], threading.Lock()
+
+    def worker():
+        thread_samples = time_calls(lambda: request_path(connect), iterations)
+        with lock:
+            samples.extend(thread_samples)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return summarize(samples, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per measurement (per thread when concurrent)")
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    from benchmarks.local_s3 import create_bucket, local_s3_server
+
+    with local_s3_server():
+        create_bucket(BUCKET_NAME)
+        connect_shared()[0].put_object(Bucket=BUCKET_NAME, Key=OBJECT_KEY, Body=b"model")
+
+        results = {}
+        for name, connect in (("per_instance", connect_per_instance), ("shared", connect_shared)):
+            request_path(connect)
+            results[name] = {
+                "construction": summarize(time_calls(connect, args.iterations)),
+                "request_path": summarize(time_calls(lambda: request_path(connect), args.iterations)),
+                "concurrent": dict(threads=args.threads,
+                                   **run_concurrent(connect, args.threads, max(1, args.iterations // args.threads))),
+            }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
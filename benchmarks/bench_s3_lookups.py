@@ -0,0 +1,97 @@
+"""
+Compares S3 existence/metadata lookups: prefix listing, exact-key HEAD and the metadata cache.
+
+Runs against a local S3 stand-in (benchmarks.local_s3) filled with --keys
+objects in two layouts:
+  unrelated      the model key plus keys under another prefix
+  shared_prefix  the model key plus keys that start with it (e.g. model.pkl.bak-17),
+                 which the previous bucket.objects.filter(Prefix=...) lookups had to page through
+Methods:
+  listing          the previous lookup: every object under the prefix, materialized
+  head             SimpleStorageService.get_object_metadata without the cache
+  cached           get_object_metadata within the cache TTL
+  key_available    SimpleStorageService.s3_key_path_available
+Reported per lookup: mean and p50 latency and the S3 requests sent.
+
+Usage: python -m benchmarks.bench_s3_lookups [--keys 2000] [--lookups 50]
+"""
+import argparse
+import json
+import statistics
+import time
+
+BUCKET_NAME = "benchmark-bucket"
+MODEL_KEY = "model.pkl"
+
+
+def fill_bucket(s3_client, layout: str, n_keys: int) -> None:
+    s3_client.put_object(Bucket=BUCKET_NAME, Key=MODEL_KEY, Body=b"model")
+    key_format = "data/part-{:06d}.csv" if layout == "unrelated" else MODEL_KEY + ".bak-{:06d}"
+    for index in range(n_keys - 1):
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=key_format.format(index), Body=b"")
+
+
+def time_lookups(lookup, lookups: int, request_counts: dict) -> dict:
+    lookup()
+    request_counts.clear()
+    samples = []
+    for _ in range(lookups):
+        start = time.perf_counter()
+        lookup()
+        samples.append(time.perf_counter() - start)
+    return {
+        "mean_ms": round(statistics.mean(samples) * 1e3, 3),
+        "p50_ms": round(statistics.median(samples) * 1e3, 3),
+        "requests_per_lookup": {name: count / lookups for name, count in sorted(request_counts.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=2000, help="Objects in the bucket per layout")
+    parser.add_argument("--lookups", type=int, default=50)
+    args = parser.parse_args()
+
+    from benchmarks.local_s3 import count_requests, local_s3_server
+
+    with local_s3_server():
+        from src.cloud_storage.aws_storage import SimpleStorageService
+
+        storage = SimpleStorageService()
+        request_counts = count_requests(storage.s3_client)
+        resource_counts = count_requests(storage.s3_resource.meta.client)
+        results = {"keys": args.keys, "layouts": {}}
+        for layout in ("unrelated", "shared_prefix"):
+            storage.s3_client.create_bucket(Bucket=BUCKET_NAME)
+            fill_bucket(storage.s3_client, layout, args.keys)
+            bucket = storage.get_bucket(BUCKET_NAME)
+
+            def listing():
+                return [file_object for file_object in bucket.objects.filter(Prefix=MODEL_KEY)]
+
+            def head():
+                return storage.get_object_metadata(MODEL_KEY, BUCKET_NAME, use_cache=False)
+
+            def cached():
+                return storage.get_object_metadata(MODEL_KEY, BUCKET_NAME)
+
+            def key_available():
+                # Dropped first so every lookup reaches S3
+                storage.metadata_cache.invalidate(BUCKET_NAME, MODEL_KEY)
+                return storage.s3_key_path_available(BUCKET_NAME, MODEL_KEY)
+
+            methods = {}
+            for name, lookup in (("listing", listing), ("head", head), ("cached", cached),
+                                 ("key_available", key_available)):
+                counts = resource_counts if name == "listing" else request_counts
+                methods[name] = time_lookups(lookup, args.lookups, counts)
+            results["layouts"][layout] = methods
+
+            storage.s3_resource.Bucket(BUCKET_NAME).objects.all().delete()
+            storage.s3_client.delete_bucket(Bucket=BUCKET_NAME)
+            storage.metadata_cache.invalidate(BUCKET_NAME)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares S3 model downloads and uploads: one streamed GET against parallel multipart transfers.
+
+Runs against a local S3 stand-in (benchmarks.local_s3) with a random object of
+--size-mb. Methods:
+  get_read         the previous load_model: get_object()["Body"].read() into one bytes object
+  download_fileobj SimpleStorageService.download_fileobj into a BytesIO, as load_model does now
+  download_file    SimpleStorageService.download_file to disk, as the model cache does
+  upload_file      SimpleStorageService.upload_file, as the model pusher does
+each with every --concurrency and --chunk-mb setting (the threshold follows the
+chunk size; concurrency 1 disables the transfer threads). Reported: seconds
+and MB/s per method and setting. The stand-in has no network latency or
+per-connection bandwidth limit, so parallel parts gain less here than against S3.
+
+Usage: python -m benchmarks.bench_s3_transfer [--size-mb 64] [--concurrency 1 4 10] [--chunk-mb 8 16]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from io import BytesIO
+
+BUCKET_NAME = "benchmark-bucket"
+OBJECT_KEY = "model.pkl"
+
+
+def time_transfer(transfer, repeat: int, size_bytes: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transfer()
+        samples.append(time.perf_counter() - start)
+    seconds = statistics.median(samples)
+    return {"seconds": round(seconds, 3), "mb_per_second": round(size_bytes / 1024 / 1024 / seconds, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 10])
+    parser.add_argument("--chunk-mb", type=int, nargs="+", default=[8, 16])
+    parser.add_argument("--repeat", type=int, default=3, help="Transfers per measurement (median reported)")
+    args = parser.parse_args()
+
+    from benchmarks.local_s3 import create_bucket, local_s3_server
+
+    with local_s3_server(), tempfile.TemporaryDirectory() as work_dir:
+        from src.cloud_storage.aws_storage import SimpleStorageService
+        from src.entity.config_entity import S3TransferConfig
+
+        create_bucket(BUCKET_NAME)
+        size_bytes = args.size_mb * 1024 * 1024
+        source_path = os.path.join(work_dir, "source.bin")
+        with open(source_path, "wb") as file_obj:
+            file_obj.write(os.urandom(size_bytes))
+        download_path = os.path.join(work_dir, "download.bin")
+        SimpleStorageService().upload_file(source_path, OBJECT_KEY, BUCKET_NAME, remove=False)
+
+        storage = SimpleStorageService()
+        results = {"size_mb": args.size_mb, "get_read": time_transfer(
+            lambda: storage.s3_client.get_object(Bucket=BUCKET_NAME, Key=OBJECT_KEY)["Body"].read(),
+            args.repeat, size_bytes), "settings": {}}
+        for chunk_mb in args.chunk_mb:
+            for concurrency in args.concurrency:
+                storage = SimpleStorageService(S3TransferConfig(multipart_threshold_mb=chunk_mb,
+                                                                chunk_size_mb=chunk_mb,
+                                                                max_concurrency=concurrency))
+                results["settings"][f"chunk_{chunk_mb}mb_concurrency_{concurrency}"] = {
+                    "download_fileobj": time_transfer(
+                        lambda: storage.download_fileobj(OBJECT_KEY, BUCKET_NAME, BytesIO()), args.repeat, size_bytes),
+                    "download_file": time_transfer(
+                        lambda: storage.download_file(OBJECT_KEY, BUCKET_NAME, download_path), args.repeat, size_bytes),
+                    "upload_file": time_transfer(
+                        lambda: storage.upload_file(source_path, OBJECT_KEY, BUCKET_NAME, remove=False),
+                        args.repeat, size_bytes),
+                }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Measures resident memory per worker with private unpickled models and with the shared model store.
+
+Starts N worker processes per mode; each loads the model, scores a batch and,
+once all workers of the mode are loaded, reads its RSS and PSS (RSS with
+shared pages divided among the processes sharing them) from
+/proc/self/smaps_rollup. Modes:
+  baseline  imports only, no model
+  pickle    every worker unpickles its own model.pkl (one private copy each)
+  shared    every worker maps the file packed by SharedModelStore
+
+Usage: python -m benchmarks.bench_shared_model_store [--model path/to/model.pkl] [--workers 4]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic_model import load_or_build_model, make_features
+from src.constants import PREDICTION_FEATURE_COLUMNS
+from src.entity.model_store import SharedModelStore
+from src.utils.common import load_object, save_object
+
+MODEL_VERSION = "benchmark"
+
+
+def read_memory_kb() -> dict:
+    """
+    Returns Rss and Pss of the current process in kB (Linux only).
+    """
+    memory = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss"):
+                memory[name.lower()] = int(value.split()[0])
+    return memory
+
+
+def run_worker(mode: str, model_path: str, store_dir: str, barrier, results) -> None:
+    predictions = None
+    if mode != "baseline":
+        if mode == "pickle":
+            model = load_object(model_path)
+        else:
+            model = SharedModelStore(store_dir).load_model(MODEL_VERSION)
+        features = make_features(1000, seed=7)[list(PREDICTION_FEATURE_COLUMNS)].to_numpy("float64")
+        # Touches every node array, as serving traffic would
+        predictions = model.predict_features(features)
+    barrier.wait()
+    results.put(dict(read_memory_kb(), checksum=None if predictions is None else int(np.sum(predictions))))
+    barrier.wait()
+
+
+def measure(mode: str, workers: int, model_path: str, store_dir: str) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=run_worker, args=(mode, model_path, store_dir, barrier, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    rss_mb = [sample["rss"] / 1024 for sample in samples]
+    pss_mb = [sample["pss"] / 1024 for sample in samples]
+    return {
+        "mode": mode,
+        "workers": workers,
+        "rss_mb_per_worker": round(float(np.mean(rss_mb)), 1),
+        "pss_mb_per_worker": round(float(np.mean(pss_mb)), 1),
+        "pss_mb_total": round(float(np.sum(pss_mb)), 1),
+        "checksums": sorted({sample["checksum"] for sample in samples}, key=str),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="dill-pickled MyModel; a synthetic model is trained when omitted")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        model_path = args.model
+        model = load_or_build_model(model_path)
+        if model_path is None:
+            model_path = os.path.join(work_dir, "model.pkl")
+            save_object(model_path, model)
+        store_dir = os.path.join(work_dir, "store")
+        packed_path = SharedModelStore(store_dir).save_model(model, MODEL_VERSION)
+        del model
+
+        results = {
+            "model_pickle_mb": round(os.path.getsize(model_path) / 1024 / 1024, 1),
+            "packed_model_mb": round(os.path.getsize(packed_path) / 1024 / 1024, 1),
+            "modes": [measure(mode, args.workers, model_path, store_dir)
+                      for mode in ("baseline", "pickle", "shared")],
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Local S3 stand-in for benchmarks: an in-process moto server on a free port.
+
+Unlike benchmarks.local_storage, requests go through boto3 and HTTP, so
+request counts, connection handling and transfer settings behave as against
+S3 (without its network latency). Requires moto with its server extras:
+pip install "moto[server]".
+"""
+import logging
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+from src.configuration.aws_connection import S3Connection
+from src.constants import AWS_ACCESS_KEY_ID_ENV_KEY, AWS_SECRET_ACCESS_KEY_ENV_KEY, REGION_NAME
+
+
+@contextmanager
+def local_s3_server() -> Iterator[str]:
+    """
+    Starts the server and points boto3 (AWS_ENDPOINT_URL) and S3Connection (dummy credentials) at it.
+    :return: Endpoint URL of the server
+    """
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError as e:
+        raise ImportError('The local S3 stand-in requires moto: pip install "moto[server]"') from e
+
+    # The server's access log would otherwise reach the project's root logger
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    endpoint_url = f"http://{host}:{port}"
+    previous_env = {name: os.environ.get(name) for name in
+                    ("AWS_ENDPOINT_URL", AWS_ACCESS_KEY_ID_ENV_KEY, AWS_SECRET_ACCESS_KEY_ENV_KEY)}
+    os.environ["AWS_ENDPOINT_URL"] = endpoint_url
+    os.environ.setdefault(AWS_ACCESS_KEY_ID_ENV_KEY, "benchmark")
+    os.environ.setdefault(AWS_SECRET_ACCESS_KEY_ENV_KEY, "benchmark")
+    # The shared connection keeps the endpoint it was created with
+    S3Connection.reset()
+    try:
+        yield endpoint_url
+    finally:
+        server.stop()
+        S3Connection.reset()
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def create_bucket(bucket_name: str) -> None:
+    import boto3
+
+    boto3.client("s3", region_name=REGION_NAME).create_bucket(Bucket=bucket_name)
+
+
+def count_requests(s3_client) -> dict:
+    """
+    Counts the HTTP requests a boto3 client sends, per operation, into the returned dict.
+    """
+    counts = {}
+
+    def on_request(model, **kwargs):
+        counts[model.name] = counts.get(model.name, 0) + 1
+
+    s3_client.meta.events.register("before-call.s3", on_request)
+    return counts
@@ -0,0 +1,108 @@
+"""
+Directory-backed stand-in for SimpleStorageService, so benchmarks can run the
+real model loading path (Proj1Estimator, ModelHolder) without S3 credentials.
+Objects are files under storage_dir/<bucket_name>/<key>; the ETag is the MD5
+of the content, as S3 reports it for single-part uploads.
+"""
+import hashlib
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+from src.entity import s3_estimator
+from src.utils.common import load_object
+from src.utils.compression import compress_file, detect_file_compression, normalize_compression
+
+
+class LocalObject:
+    """
+    The parts of a boto3 ObjectSummary that the project reads.
+    """
+
+    def __init__(self, bucket_name: str, key: str, path: str):
+        self.bucket_name = bucket_name
+        self.key = key
+        self.path = path
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    @property
+    def e_tag(self) -> str:
+        with open(self.path, "rb") as file_obj:
+            return f'"{hashlib.md5(file_obj.read()).hexdigest()}"'
+
+    def get(self) -> dict:
+        return {"Body": open(self.path, "rb"), "ContentLength": self.size}
+
+
+class LocalStorageService:
+    def __init__(self, storage_dir: str):
+        """
+        :param storage_dir: Directory holding one sub-directory per bucket
+        """
+        self.storage_dir = storage_dir
+
+    def _get_path(self, bucket_name: str, key: str) -> str:
+        return os.path.join(self.storage_dir, bucket_name, key)
+
+    def s3_key_path_available(self, bucket_name: str, s3_key: str) -> bool:
+        return os.path.exists(self._get_path(bucket_name, s3_key))
+
+    def get_file_object(self, filename: str, bucket_name: str) -> LocalObject:
+        path = self._get_path(bucket_name, filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No object {filename} in bucket {bucket_name}")
+        return LocalObject(bucket_name, filename, path)
+
+    def get_object_metadata(self, s3_key: str, bucket_name: str, use_cache: bool = True) -> dict:
+        file_object = self.get_file_object(s3_key, bucket_name)
+        return {"size": file_object.size, "e_tag": file_object.e_tag.strip('"'),
+                "last_modified": datetime.fromtimestamp(os.path.getmtime(file_object.path), timezone.utc),
+                "compression": detect_file_compression(file_object.path)}
+
+    @staticmethod
+    def read_object(object_name: LocalObject, decode: bool = True, make_readable: bool = False):
+        with object_name.get()["Body"] as body:
+            content = body.read()
+        return content.decode() if decode else content
+
+    def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
+        return self.load_model_and_version(model_name, bucket_name, model_dir)[0]
+
+    def load_model_and_version(self, model_name: str, bucket_name: str, model_dir: str = None) -> tuple:
+        model_file = model_dir + "/" + model_name if model_dir else model_name
+        file_object = self.get_file_object(model_file, bucket_name)
+        return load_object(file_object.path), file_object.e_tag.strip('"')
+
+    def download_file(self, s3_key: str, bucket_name: str, to_filename: str, metadata: dict = None) -> str:
+        os.makedirs(os.path.dirname(to_filename), exist_ok=True)
+        shutil.copyfile(self.get_file_object(s3_key, bucket_name).path, to_filename)
+        return to_filename
+
+    def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True,
+                    compression: str = None, compression_level: int = None):
+        path = self._get_path(bucket_name, to_filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if normalize_compression(compression) is not None and detect_file_compression(from_filename) is None:
+            os.replace(compress_file(from_filename, compression, compression_level), path)
+        else:
+            shutil.copyfile(from_filename, path)
+        if remove:
+            os.remove(from_filename)
+
+
+@contextmanager
+def use_local_storage(storage_dir: str) -> Iterator[LocalStorageService]:
+    """
+    Makes every Proj1Estimator created inside the block read from storage_dir instead of S3.
+    """
+    original = s3_estimator.SimpleStorageService
+    s3_estimator.SimpleStorageService = lambda: LocalStorageService(storage_dir)
+    try:
+        yield LocalStorageService(storage_dir)
+    finally:
+        s3_estimator.SimpleStorageService = original
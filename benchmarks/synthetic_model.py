@@ -0,0 +1,79 @@
+"""
+Builds a MyModel with the production preprocessing pipeline and forest
+hyperparameters on synthetic rows, so benchmarks run without MongoDB or S3.
+"""
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import DataTransformation
+from src.constants import PREDICTION_FEATURE_COLUMNS
+from src.entity.config_entity import DataTransformationConfig, ModelTrainerConfig
+from src.entity.estimator import MyModel
+from src.utils.common import load_object, save_object
+
+
+def make_features(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Returns n_rows of model-ready features (after gender mapping and dummy encoding).
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Gender": rng.integers(0, 2, n_rows),
+        "Age": rng.integers(20, 86, n_rows),
+        "Driving_License": rng.integers(0, 2, n_rows),
+        "Region_Code": rng.integers(0, 53, n_rows).astype("float64"),
+        "Previously_Insured": rng.integers(0, 2, n_rows),
+        "Annual_Premium": rng.uniform(2630, 100000, n_rows).round(1),
+        "Policy_Sales_Channel": rng.integers(1, 164, n_rows).astype("float64"),
+        "Vintage": rng.integers(10, 300, n_rows),
+        "Vehicle_Age_lt_1_Year": rng.integers(0, 2, n_rows),
+        "Vehicle_Age_gt_2_Years": rng.integers(0, 2, n_rows),
+        "Vehicle_Damage_Yes": rng.integers(0, 2, n_rows),
+    })[list(PREDICTION_FEATURE_COLUMNS)]
+
+
+def build_model(n_rows: int = 20000, seed: int = 0) -> MyModel:
+    """
+    Fits the production preprocessing pipeline and RandomForestClassifier on synthetic data.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    features = make_features(n_rows, seed)
+    rng = np.random.default_rng(seed + 1)
+    target = (((features["Vehicle_Damage_Yes"] == 1) & (features["Previously_Insured"] == 0)
+               & (rng.random(n_rows) < 0.7)) | (rng.random(n_rows) < 0.05)).astype(int)
+
+    transformation = DataTransformation(data_ingestion_artifact=None, data_validation_artifact=None,
+                                        data_transformation_config=DataTransformationConfig())
+    preprocessor = transformation.get_data_transformation_object()
+    transformed = preprocessor.fit_transform(features)
+
+    config = ModelTrainerConfig()
+    forest = RandomForestClassifier(n_estimators=config._n_estimators,
+                                    min_samples_split=config._min_samples_split,
+                                    min_samples_leaf=config._min_samples_leaf,
+                                    max_depth=config._max_depth,
+                                    criterion=config._criterion,
+                                    random_state=config._random_state)
+    forest.fit(transformed, target.to_numpy())
+    return MyModel(preprocessing_object=preprocessor, trained_model_object=forest)
+
+
+def load_or_build_model(model_path: str = None) -> MyModel:
+    """
+    Loads a dill-pickled MyModel from model_path, or builds a synthetic one.
+    """
+    return load_object(model_path) if model_path else build_model()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train and save a synthetic model.pkl for benchmarks")
+    parser.add_argument("output", help="Path of the model.pkl to write")
+    args = parser.parse_args()
+    save_object(args.output, build_model())
+
+
+if __name__ == "__main__":
+    main()
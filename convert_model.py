@@ -0,0 +1,62 @@
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from src.constants import MODEL_BUCKET_NAME
+from src.entity.model_holder import make_synthetic_features
+from src.entity.model_store import MODEL_ARTIFACT_SUFFIX, load_model_artifact, save_model_artifact
+from src.exception import CustomException
+from src.logger import logging
+from src.utils.common import get_file_sha256, load_object
+
+
+def convert_model(model_path: str, artifact_path: str, verify_rows: int = 1000) -> dict:
+    """
+    Converts a dill-pickled MyModel into a model artifact and checks that the artifact
+    predicts identically to the pickle on verify_rows synthetic rows.
+    :return: Manifest of the artifact
+    """
+    model = load_object(model_path)
+    manifest = save_model_artifact(artifact_path, model, {
+        "source_file": os.path.basename(model_path),
+        "source_sha256": get_file_sha256(model_path),
+    })
+    if verify_rows > 0:
+        features = make_synthetic_features(verify_rows, seed=1)
+        artifact_model = load_model_artifact(artifact_path)
+        if not (np.array_equal(model.predict(features), artifact_model.predict(features))
+                and np.array_equal(model.predict_proba(features), artifact_model.predict_proba(features))):
+            os.remove(artifact_path)
+            raise ValueError(f"The artifact of {model_path} does not predict identically; nothing was written")
+    logging.info(f"Converted {model_path} ({os.path.getsize(model_path) / 1024 / 1024:.1f} MB) into "
+                 f"{artifact_path} ({os.path.getsize(artifact_path) / 1024 / 1024:.1f} MB)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a dill-pickled model.pkl into a memory-mappable model artifact")
+    parser.add_argument("model_path", help="Local model.pkl written by the training pipeline")
+    parser.add_argument("artifact_path", nargs="?",
+                        help=f"Output artifact (default: model_path with the {MODEL_ARTIFACT_SUFFIX} suffix)")
+    parser.add_argument("--verify-rows", type=int, default=1000,
+                        help="Synthetic rows the artifact must predict identically on; 0 skips the check")
+    parser.add_argument("--upload-key", help=f"Also upload the artifact to this key of {MODEL_BUCKET_NAME}")
+    args = parser.parse_args()
+
+    try:
+        artifact_path = args.artifact_path or os.path.splitext(args.model_path)[0] + MODEL_ARTIFACT_SUFFIX
+        convert_model(args.model_path, artifact_path, args.verify_rows)
+        if args.upload_key:
+            from src.cloud_storage.aws_storage import SimpleStorageService
+            SimpleStorageService().upload_file(artifact_path, to_filename=args.upload_key,
+                                               bucket_name=MODEL_BUCKET_NAME, remove=False)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    main()
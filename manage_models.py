@@ -0,0 +1,48 @@
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import json
+import sys
+
+from src.constants import MODEL_BUCKET_NAME, MODEL_PUSHER_S3_KEY
+from src.entity.model_registry import ModelRegistry
+from src.exception import CustomException
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and switch the model versions of the model registry")
+    parser.add_argument("--bucket", default=MODEL_BUCKET_NAME)
+    parser.add_argument("--registry-prefix", default=MODEL_PUSHER_S3_KEY)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Manifests of all registered versions, oldest first")
+    commands.add_parser("current", help="Pointer to the served version")
+    register = commands.add_parser("register", help="Register a local model file as a new version")
+    register.add_argument("model_path")
+    register.add_argument("--promote", action="store_true", help="Also serve the new version")
+    promote = commands.add_parser("promote", help="Serve a registered version")
+    promote.add_argument("version")
+    rollback = commands.add_parser("rollback", help="Serve the previous (or the given) version again")
+    rollback.add_argument("version", nargs="?")
+    args = parser.parse_args()
+
+    try:
+        model_registry = ModelRegistry(args.bucket, args.registry_prefix)
+        if args.command == "list":
+            result = model_registry.list_versions()
+        elif args.command == "current":
+            result = model_registry.get_current_manifest()
+        elif args.command == "register":
+            result = model_registry.register_model(args.model_path)
+            if args.promote:
+                result = model_registry.promote(result["version"])
+        elif args.command == "promote":
+            result = model_registry.promote(args.version)
+        else:
+            result = model_registry.rollback(args.version)
+        print(json.dumps(result, indent=2))
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from src.constants import BULK_PREDICTION_CHUNK_SIZE
+from src.entity.model_holder import ModelHolder
+from src.exception import CustomException
+from src.logger import logging
+from src.pipline.bulk_prediction import BulkPredictor
+from src.pipline.prediction_pipeline import VehicleDataClassifier
+
+# Scorer of the current worker process, built once by _init_worker
+_bulk_predictor: BulkPredictor = None
+
+
+def _init_worker(chunk_size: int) -> None:
+    """
+    Loads the production model once per worker process.
+    """
+    global _bulk_predictor
+    model_holder = ModelHolder()
+    model_holder.load()
+    _bulk_predictor = BulkPredictor(VehicleDataClassifier(model_holder=model_holder), chunk_size=chunk_size)
+
+
+def _score_chunk(chunk_index: int, chunk: pd.DataFrame, header: bool):
+    """
+    :return: (chunk_index, rows, input row following the chunk, scored CSV text)
+    """
+    scored = _bulk_predictor.score_chunk(chunk)
+    return chunk_index, len(scored), chunk.index.stop, scored.to_csv(index=False, header=header)
+
+
+def _skip_rows(batches, rows: int):
+    """
+    Drops the first rows rows of a stream of Arrow record batches.
+    """
+    for batch in batches:
+        if rows >= batch.num_rows:
+            rows -= batch.num_rows
+            continue
+        yield batch.slice(rows) if rows else batch
+        rows = 0
+
+
+def read_chunks(input_path: str, chunk_size: int, skip_rows: int = 0, first_chunk: int = 0):
+    """
+    Yields (chunk_index, DataFrame) for a CSV or Parquet file, starting at input row skip_rows
+    with chunk index first_chunk. Chunks hold at most chunk_size rows; Parquet batches also end
+    at row group boundaries. Row numbers are kept in the index so output rows can be matched
+    back to the input.
+    """
+    if input_path.lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Scoring Parquet files requires pyarrow (pip install pyarrow)") from e
+        parquet_file = pq.ParquetFile(input_path)
+        # Row groups wholly before skip_rows are not read at all
+        row_groups, first_row = [], 0
+        for row_group in range(parquet_file.num_row_groups):
+            num_rows = parquet_file.metadata.row_group(row_group).num_rows
+            if not row_groups and first_row + num_rows <= skip_rows:
+                first_row += num_rows
+            else:
+                row_groups.append(row_group)
+        batches = parquet_file.iter_batches(batch_size=chunk_size, row_groups=row_groups) if row_groups else []
+        chunks = (batch.to_pandas() for batch in _skip_rows(batches, skip_rows - first_row))
+    else:
+        skip_row_numbers = range(1, skip_rows + 1) if skip_rows else None
+        chunks = pd.read_csv(input_path, chunksize=chunk_size, skiprows=skip_row_numbers, na_values="na")
+
+    row_offset = skip_rows
+    for chunk_index, chunk in enumerate(chunks, start=first_chunk):
+        chunk.index = pd.RangeIndex(row_offset, row_offset + len(chunk))
+        row_offset += len(chunk)
+        yield chunk_index, chunk
+
+
+class ChunkCheckpoint:
+    """
+    Records which chunks are safely written so an interrupted run can resume.
+    The file is replaced atomically after every chunk.
+    """
+
+    def __init__(self, checkpoint_path: str, input_path: str, chunk_size: int, resume: bool):
+        self.checkpoint_path = checkpoint_path
+        # next_row: input row of the first chunk not yet written to the ordered output
+        self.state = {"input_path": os.path.abspath(input_path), "chunk_size": chunk_size,
+                      "completed_chunks": [], "output_bytes": 0, "rows": 0, "next_row": 0}
+        if resume and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                state = json.load(checkpoint_file)
+            if state["input_path"] != self.state["input_path"] or state["chunk_size"] != chunk_size:
+                raise ValueError("Checkpoint was written for a different input file or chunk size")
+            self.state = state
+            logging.info(f"Resuming after {len(state['completed_chunks'])} completed chunks")
+
+    @property
+    def completed_chunks(self) -> set:
+        return set(self.state["completed_chunks"])
+
+    def mark_completed(self, chunk_index: int, rows: int, output_bytes: int = 0, next_row: int = None) -> None:
+        self.state["completed_chunks"].append(chunk_index)
+        self.state["rows"] += rows
+        self.state["output_bytes"] = output_bytes
+        if next_row is not None:
+            self.state["next_row"] = next_row
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump(self.state, checkpoint_file)
+        os.replace(temp_path, self.checkpoint_path)
+
+
+def score_file(input_path: str, output_path: str, chunk_size: int, workers: int,
+               sharded: bool, checkpoint: ChunkCheckpoint) -> dict:
+    """
+    Scores input_path on a process pool and writes the results in input order to
+    output_path, or as one CSV shard per chunk into the output_path directory.
+    """
+    completed = checkpoint.completed_chunks
+    if sharded:
+        os.makedirs(output_path, exist_ok=True)
+        output_file = None
+        # Shards may finish out of order, so every chunk is read and completed ones are skipped
+        chunks = ((index, chunk) for index, chunk in read_chunks(input_path, chunk_size) if index not in completed)
+    else:
+        output_bytes = checkpoint.state["output_bytes"]
+        if completed and (not os.path.exists(output_path) or os.path.getsize(output_path) < output_bytes):
+            raise ValueError(f"Cannot resume: {output_path} is missing or shorter than the {output_bytes} bytes "
+                             f"recorded in {checkpoint.checkpoint_path}; delete the checkpoint to start over")
+        # Ordered output: drop anything written after the last checkpointed chunk
+        output_file = open(output_path, "r+b" if completed else "wb")
+        output_file.truncate(output_bytes)
+        output_file.seek(output_bytes)
+        # Parquet chunks can be shorter than chunk_size, so resume from the recorded row
+        chunks = read_chunks(input_path, chunk_size, skip_rows=checkpoint.state["next_row"],
+                             first_chunk=len(completed))
+
+    pending_writes = {}
+    next_chunk = len(completed)
+    in_flight = set()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(chunk_size,)) as pool:
+            for chunk_index, chunk in itertools.chain(chunks, [(None, None)]):
+                if chunk_index is not None:
+                    # Every shard is a standalone CSV; the single output file has one header
+                    header = sharded or chunk_index == 0
+                    in_flight.add(pool.submit(_score_chunk, chunk_index, chunk, header))
+                # Keep at most two chunks per worker in memory: scored chunks waiting for a slower
+                # earlier one to be written count as well, so the reorder window stays bounded
+                while in_flight and (len(in_flight) + len(pending_writes) >= 2 * workers or chunk_index is None):
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, rows, next_row, csv_text = future.result()
+                        if sharded:
+                            shard_path = os.path.join(output_path, f"part-{index:05d}.csv")
+                            with open(shard_path + ".tmp", "w") as shard_file:
+                                shard_file.write(csv_text)
+                            os.replace(shard_path + ".tmp", shard_path)
+                            checkpoint.mark_completed(index, rows)
+                        else:
+                            pending_writes[index] = (rows, next_row, csv_text)
+                    while not sharded and next_chunk in pending_writes:
+                        rows, next_row, csv_text = pending_writes.pop(next_chunk)
+                        output_file.write(csv_text.encode())
+                        output_file.flush()
+                        os.fsync(output_file.fileno())
+                        checkpoint.mark_completed(next_chunk, rows, output_file.tell(), next_row)
+                        next_chunk += 1
+    finally:
+        if output_file is not None:
+            output_file.close()
+    return checkpoint.state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large CSV or Parquet file with the production model")
+    parser.add_argument("input_path", help="CSV or Parquet file of raw or engineered customer rows")
+    parser.add_argument("output_path", help="Output CSV file, or output directory with --sharded")
+    parser.add_argument("--chunk-size", type=int, default=BULK_PREDICTION_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sharded", action="store_true", help="Write one CSV shard per chunk")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output_path>.checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint of a crashed run")
+    args = parser.parse_args()
+
+    try:
+        checkpoint_path = args.checkpoint or args.output_path.rstrip("/") + ".checkpoint.json"
+        checkpoint = ChunkCheckpoint(checkpoint_path, args.input_path, args.chunk_size, args.resume)
+        state = score_file(args.input_path, args.output_path, args.chunk_size, args.workers,
+                           args.sharded, checkpoint)
+        logging.info(f"Scored {state['rows']} rows in {len(state['completed_chunks'])} chunks")
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
 import boto3
+from boto3.s3.transfer import ProgressCallbackInvoker, TransferConfig, create_transfer_manager
+from s3transfer.subscribers import BaseSubscriber
 from src.configuration.aws_connection import S3Connection
-from io import StringIO
-from typing import Union,List
+from src.constants import (MODEL_ARTIFACT_SUFFIX, S3_METADATA_CACHE_TTL_SECONDS,
+                           S3_METADATA_CACHE_TTL_SECONDS_ENV_KEY, S3_TRANSFER_PROGRESS_LOG_PERCENT)
+from src.entity.config_entity import S3TransferConfig
+from src.utils.compression import (COMPRESSION_HEADER_SIZE, compress_file, detect_compression,
+                                   detect_file_compression, normalize_compression, open_decompressed_reader)
+from src.utils.metrics import S3_TRANSFER_BYTES, S3_TRANSFER_DURATION, S3_TRANSFER_THROUGHPUT
+from io import BufferedReader, BytesIO, StringIO
+from typing import BinaryIO, Optional, Union,List
 import os,sys
+import threading
+import time
 from src.logger import logging
 from mypy_boto3_s3.service_resource import Bucket
 from src.exception import CustomException
@@ -13,20 +23,172 @@ import pickle
 s3_bucket_name = "mlopsmodelbucket"
 
 
+class ObjectMetadataCache:
+    """
+    Short-lived, process-wide memo of HEAD responses keyed by (bucket, key).
+
+    Model loads, version checks and evaluations look up the same few keys over
+    and over; within ttl_seconds they are answered from memory. Missing objects
+    are remembered too. Writes through SimpleStorageService invalidate their key,
+    so a process always sees its own uploads.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        """
+        :param ttl_seconds: Seconds an entry is reused for; 0 disables the cache
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, bucket_name: str, s3_key: str) -> tuple:
+        """
+        :return: (True, HEAD response or None when the object is missing) on a hit, (False, None) otherwise
+        """
+        entry = self._entries.get((bucket_name, s3_key))
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def put(self, bucket_name: str, s3_key: str, response: Optional[dict]) -> None:
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entries[(bucket_name, s3_key)] = (time.monotonic() + self.ttl_seconds, response)
+
+    def invalidate(self, bucket_name: str, s3_key: str = None) -> None:
+        """
+        Drops the entry of one key, or every entry when s3_key is None.
+        """
+        with self._lock:
+            if s3_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((bucket_name, s3_key), None)
+
+
+class TransferProgress:
+    """
+    Progress callback of boto3 transfers. Counts the transferred bytes into the S3
+    transfer metrics and logs bytes and throughput every S3_TRANSFER_PROGRESS_LOG_PERCENT
+    percent; finish() records the duration and throughput of the whole transfer.
+    s3transfer calls it from its worker threads, one call per chunk written or read.
+    """
+
+    def __init__(self, direction: str, s3_key: str, total_bytes: int):
+        """
+        :param direction: "upload" or "download"
+        :param s3_key: Key of the object, for the log lines
+        :param total_bytes: Size of the transfer, for the percentage
+        """
+        self.direction = direction
+        self.s3_key = s3_key
+        self.total_bytes = total_bytes
+        self.transferred_bytes = 0
+        self._next_log_percent = S3_TRANSFER_PROGRESS_LOG_PERCENT
+        self._bytes_counter = S3_TRANSFER_BYTES.labels(direction=direction)
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def __call__(self, bytes_amount: int) -> None:
+        # Retried parts are reported as negative amounts; the counter keeps the bytes sent over the wire
+        if bytes_amount > 0:
+            self._bytes_counter.inc(bytes_amount)
+        with self._lock:
+            self.transferred_bytes += bytes_amount
+            percent = 100 * self.transferred_bytes / self.total_bytes if self.total_bytes else 100
+            if percent < self._next_log_percent or percent >= 100:
+                return
+            while self._next_log_percent <= percent:
+                self._next_log_percent += S3_TRANSFER_PROGRESS_LOG_PERCENT
+        logging.info(f"{self.direction.capitalize()} of {self.s3_key}: {self.transferred_bytes / 1024 / 1024:.1f} "
+                     f"of {self.total_bytes / 1024 / 1024:.1f} MB ({percent:.0f}%) at "
+                     f"{self.transferred_bytes / 1024 / 1024 / (time.perf_counter() - self._start):.1f} MB/s")
+
+    def finish(self) -> float:
+        """
+        :return: Throughput of the transfer in bytes per second
+        """
+        duration = time.perf_counter() - self._start
+        throughput = self.transferred_bytes / duration if duration > 0 else 0.0
+        S3_TRANSFER_DURATION.labels(direction=self.direction).observe(duration)
+        S3_TRANSFER_THROUGHPUT.labels(direction=self.direction).set(throughput)
+        logging.info(f"{self.direction.capitalize()} of {self.s3_key} done: "
+                     f"{self.transferred_bytes / 1024 / 1024:.1f} MB in {duration:.2f}s "
+                     f"({throughput / 1024 / 1024:.1f} MB/s)")
+        return throughput
+
+
+class KnownObjectSubscriber(BaseSubscriber):
+    """
+    Hands s3transfer the size and ETag of the object to download, as already known from
+    the metadata cache, so it sends no HEAD request of its own. s3transfer pins ranged
+    part requests to the ETag (IfMatch): if the object was replaced meanwhile they fail
+    instead of mixing parts of two objects.
+    """
+
+    def __init__(self, size: int, e_tag: str):
+        self.size = size
+        self.e_tag = e_tag
+
+    def on_queued(self, future, **kwargs):
+        future.meta.provide_transfer_size(self.size)
+        future.meta.provide_object_etag(f'"{self.e_tag}"')
+
+
 class SimpleStorageService:
 
-    def __init__(self):
+    # Shared by every instance; the storage service is created per use all over the project
+    metadata_cache = ObjectMetadataCache(
+        float(os.getenv(S3_METADATA_CACHE_TTL_SECONDS_ENV_KEY, S3_METADATA_CACHE_TTL_SECONDS)))
+
+    def __init__(self, s3_transfer_config: S3TransferConfig = S3TransferConfig()):
+        """
+        :param s3_transfer_config: Multipart chunk size and concurrency of file uploads and downloads
+        """
         s3_clinet = S3Connection()
         self.s3_resource = s3_clinet.s3_resource
         self.s3_client = s3_clinet.s3_client
+        self.transfer_config = TransferConfig(
+            multipart_threshold=s3_transfer_config.multipart_threshold_mb * 1024 * 1024,
+            multipart_chunksize=s3_transfer_config.chunk_size_mb * 1024 * 1024,
+            max_concurrency=s3_transfer_config.max_concurrency,
+            use_threads=s3_transfer_config.max_concurrency > 1,
+        )
 
     def s3_key_path_available(self,bucket_name,s3_key)->bool:
+        """
+        Tells whether s3_key is an object or a prefix of at least one object.
+        An exact key is answered by a (cached) HEAD request; only otherwise is
+        the prefix listed, and then for a single key rather than the full listing.
+        """
         try:
-            bucket= self.get_bucket(bucket_name)
-            file_obj = [file_object for file_object in bucket.objects.filter(Prefix=s3_key)]
-            return len(file_obj)>0
+            if self._head_object(s3_key, bucket_name) is not None:
+                return True
+            response = self.s3_client.list_objects_v2(Bucket=bucket_name, Prefix=s3_key, MaxKeys=1)
+            return response.get("KeyCount", 0) > 0
         except Exception as e:
             raise CustomException(e,sys) from e
+
+    def _head_object(self, s3_key: str, bucket_name: str, use_cache: bool = True) -> Optional[dict]:
+        """
+        Returns the HEAD response of an object, or None when it does not exist.
+        """
+        if use_cache:
+            found, response = self.metadata_cache.get(bucket_name, s3_key)
+            if found:
+                return response
+        try:
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                raise
+            response = None
+        self.metadata_cache.put(bucket_name, s3_key, response)
+        return response
         
     def get_bucket(self,bucket_name)->Bucket:
         try:
@@ -64,6 +226,14 @@ class SimpleStorageService:
         """
         logging.info("Entered the get_file_object method of SimpleStorageService class")
         try:
+            response = self._head_object(filename, bucket_name)
+            if response is not None:
+                # Exact key: no listing; the HEAD response backs e_tag, content_length etc.
+                file_object = self.s3_resource.Object(bucket_name, filename)
+                file_object.meta.data = response
+                logging.info("Exited the get_file_object method of SimpleStorageService class")
+                return file_object
+
             bucket = self.get_bucket(bucket_name)
             file_objects = [file_object for file_object in bucket.objects.filter(Prefix=filename)]
             func = lambda x: x[0] if len(x) == 1 else x
@@ -75,7 +245,7 @@ class SimpleStorageService:
 
     def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
         """
-        Loads a serialized model from the specified S3 bucket.
+        Loads a serialized model from the specified S3 bucket, see load_model_and_version.
 
         Args:
             model_name (str): Name of the model file in the bucket.
@@ -85,13 +255,216 @@ class SimpleStorageService:
         Returns:
             object: The deserialized model object.
         """
+        return self.load_model_and_version(model_name, bucket_name, model_dir)[0]
+
+    def load_model_and_version(self, model_name: str, bucket_name: str, model_dir: str = None) -> tuple:
+        """
+        Loads a serialized model from the specified S3 bucket together with the ETag of
+        the content that was loaded, taken from the GET responses themselves rather than
+        a separate (possibly cached) HEAD request.
+        A compressed model (compression in its object metadata, see upload_file) is
+        unpickled while the response body streams through the decompressor, so neither
+        the compressed nor the decompressed file is held in memory; the codec is taken
+        from the leading bytes of that body, not from the possibly cached metadata.
+        Other objects below the multipart threshold are read with a single GET; larger
+        ones are downloaded in parallel parts, pinned to one ETag, straight into one
+        in-memory buffer, which is unpickled in place.
+
+        Args:
+            model_name (str): Name of the model file in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            model_dir (str): Directory path within the bucket.
+
+        Returns:
+            tuple: (deserialized model object, e_tag without quotes)
+        """
         try:
             model_file = model_dir + "/" + model_name if model_dir else model_name
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
-            model = pickle.loads(model_obj)
+            metadata = self.get_object_metadata(model_file, bucket_name)
+            if metadata["compression"]:
+                model, e_tag = self._load_streamed_model(model_file, bucket_name, metadata)
+            elif metadata["size"] < self.transfer_config.multipart_threshold:
+                progress = TransferProgress("download", model_file, metadata["size"])
+                response = self.s3_client.get_object(Bucket=bucket_name, Key=model_file)
+                model_bytes = response["Body"].read()
+                progress(len(model_bytes))
+                progress.finish()
+                model, e_tag = self._unpickle_model(model_bytes), response["ETag"].strip('"')
+            else:
+                buffer = BytesIO()
+                # Every part is requested with IfMatch on this ETag, so the buffer holds exactly its content
+                self.download_fileobj(model_file, bucket_name, buffer, metadata=metadata)
+                with buffer.getbuffer() as model_bytes:
+                    model = self._unpickle_model(model_bytes)
+                e_tag = metadata["e_tag"]
             logging.info("Production model loaded from S3 bucket.")
-            return model
+            return model, e_tag
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _unpickle_model(model_bytes) -> object:
+        # Compressed files uploaded without the metadata are recognized by their leading bytes
+        compression = detect_compression(bytes(model_bytes[:COMPRESSION_HEADER_SIZE]))
+        if compression:
+            with open_decompressed_reader(BytesIO(model_bytes), compression) as reader:
+                return pickle.load(reader)
+        return pickle.loads(model_bytes)
+
+    def _load_streamed_model(self, s3_key: str, bucket_name: str, metadata: dict) -> tuple:
+        progress = TransferProgress("download", s3_key, metadata["size"])
+        response = self.s3_client.get_object(Bucket=bucket_name, Key=s3_key)
+        # The object may have been replaced since the (cached) HEAD, so the body names its own codec
+        with BufferedReader(response["Body"]) as body:
+            compression = detect_compression(body.peek(COMPRESSION_HEADER_SIZE)[:COMPRESSION_HEADER_SIZE])
+            if compression:
+                with open_decompressed_reader(body, compression) as reader:
+                    model = pickle.load(reader)
+            else:
+                model = pickle.load(body)
+        # Reported once the stream is consumed; the duration includes decompressing and unpickling
+        progress(response["ContentLength"])
+        progress.finish()
+        return model, response["ETag"].strip('"')
+
+    def get_object_metadata(self, s3_key: str, bucket_name: str, use_cache: bool = True) -> dict:
+        """
+        Returns the size, ETag and last-modified time of one object with a single HEAD
+        request, reused from the metadata cache for S3_METADATA_CACHE_TTL_SECONDS.
+
+        Args:
+            s3_key (str): Key of the object in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            use_cache (bool): If False, always asks S3 (and refreshes the cache).
+
+        Returns:
+            dict: size (int), e_tag (str, without quotes), last_modified (datetime) and
+                compression (str, codec recorded by upload_file, None for uncompressed objects).
+        """
+        try:
+            response = self._head_object(s3_key, bucket_name, use_cache=use_cache)
+            if response is None:
+                raise FileNotFoundError(f"No object {s3_key} in bucket {bucket_name}")
+            return {
+                "size": response["ContentLength"],
+                "e_tag": response["ETag"].strip('"'),
+                "last_modified": response["LastModified"],
+                "compression": response.get("Metadata", {}).get("compression"),
+            }
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def download_file(self, s3_key: str, bucket_name: str, to_filename: str, metadata: dict = None) -> str:
+        """
+        Downloads an object to a local file. The object is written under a temporary
+        name and renamed into place, so readers of to_filename never see a partial file.
+
+        Args:
+            s3_key (str): Key of the object in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            to_filename (str): Local path to write.
+            metadata (dict): get_object_metadata of the object if already known; read (cached) otherwise.
+
+        Returns:
+            str: to_filename
+        """
+        logging.info(f"Downloading {s3_key} from {bucket_name} to {to_filename}")
+        try:
+            dir_path = os.path.dirname(to_filename)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            temp_filename = f"{to_filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                self._download(s3_key, bucket_name, temp_filename, metadata)
+                os.replace(temp_filename, to_filename)
+            finally:
+                if os.path.exists(temp_filename):
+                    os.remove(temp_filename)
+            return to_filename
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def download_fileobj(self, s3_key: str, bucket_name: str, fileobj: BinaryIO, metadata: dict = None) -> None:
+        """
+        Downloads an object into a writable binary file object, e.g. a BytesIO. Objects
+        above the multipart threshold are fetched as parallel ranged requests and every
+        part is written at its offset, with no intermediate copy of the whole body.
+
+        Args:
+            s3_key (str): Key of the object in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            fileobj (BinaryIO): Seekable binary file object to write to.
+            metadata (dict): get_object_metadata of the object if already known; read (cached) otherwise.
+        """
+        try:
+            self._download(s3_key, bucket_name, fileobj, metadata)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _download(self, s3_key: str, bucket_name: str, target: Union[str, BinaryIO], metadata: dict = None) -> None:
+        """
+        Downloads an object to a file name or file object with the transfer settings. The
+        size and ETag come from metadata, so s3transfer sends no HEAD request of its own.
+        """
+        metadata = metadata or self.get_object_metadata(s3_key, bucket_name)
+        progress = TransferProgress("download", s3_key, metadata["size"])
+        with create_transfer_manager(self.s3_client, self.transfer_config) as transfer_manager:
+            transfer_manager.download(bucket_name, s3_key, target, subscribers=[
+                KnownObjectSubscriber(metadata["size"], metadata["e_tag"]),
+                ProgressCallbackInvoker(progress),
+            ]).result()
+        progress.finish()
+
+    def get_object_body(self, s3_key: str, bucket_name: str) -> Optional[tuple]:
+        """
+        Reads a small object, e.g. a JSON manifest, with a single GET request.
+
+        Args:
+            s3_key (str): Key of the object in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+
+        Returns:
+            Optional[tuple]: (body bytes, e_tag), or None when the object does not exist.
+        """
+        try:
+            try:
+                response = self.s3_client.get_object(Bucket=bucket_name, Key=s3_key)
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+                return None
+            return response["Body"].read(), response["ETag"].strip('"')
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def put_object_body(self, s3_key: str, bucket_name: str, body: bytes,
+                        content_type: str = "application/octet-stream",
+                        if_match: str = None, if_none_match: bool = False) -> str:
+        """
+        Writes a small object with a single PUT request. S3 replaces an object
+        atomically: readers get either the previous or the new body, never a mix.
+
+        Args:
+            s3_key (str): Key of the object in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            body (bytes): Content of the object.
+            content_type (str): Content-Type stored with the object.
+            if_match (str): Only write if the object still has this ETag (compare-and-swap).
+            if_none_match (bool): Only write if the object does not exist yet.
+
+        Returns:
+            str: ETag of the written object.
+        """
+        try:
+            conditions = {}
+            if if_match:
+                conditions["IfMatch"] = f'"{if_match}"'
+            if if_none_match:
+                conditions["IfNoneMatch"] = "*"
+            response = self.s3_client.put_object(Bucket=bucket_name, Key=s3_key, Body=body,
+                                                 ContentType=content_type, **conditions)
+            self.metadata_cache.invalidate(bucket_name, s3_key)
+            return response["ETag"].strip('"')
         except Exception as e:
             raise CustomException(e, sys) from e
 
@@ -112,22 +485,48 @@ class SimpleStorageService:
             if e.response["Error"]["Code"] == "404":
                 folder_obj = folder_name + "/"
                 self.s3_client.put_object(Bucket=bucket_name, Key=folder_obj)
+                self.metadata_cache.invalidate(bucket_name, folder_obj)
             logging.info("Exited the create_folder method of SimpleStorageService class")
 
-    def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True):
+    def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True,
+                    compression: str = None, compression_level: int = None):
         """
         Uploads a local file to the specified S3 bucket with an optional file deletion.
+        The codec of a compressed upload is stored in the object metadata, which
+        load_model reads to decompress the model while it streams in.
 
         Args:
             from_filename (str): Path of the local file.
             to_filename (str): Target file path in the bucket.
             bucket_name (str): Name of the S3 bucket.
             remove (bool): If True, deletes the local file after upload.
+            compression (str): "gzip", "bz2", "lzma" or "zstd" to upload the file compressed;
+                files that already are compressed (save_object) are uploaded as they are, and
+                model artifacts (MODEL_ARTIFACT_SUFFIX), which are memory-mapped, uncompressed.
+            compression_level (int): Codec compression level, None for the codec's default.
         """
         logging.info("Entered the upload_file method of SimpleStorageService class")
+        compressed_filename = None
         try:
             logging.info(f"Uploading {from_filename} to {to_filename} in {bucket_name}")
-            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename)
+            compression = normalize_compression(compression)
+            if compression is not None and to_filename.endswith(MODEL_ARTIFACT_SUFFIX):
+                logging.info(f"Uploading the model artifact {from_filename} without {compression} compression")
+                compression = None
+            file_compression = detect_file_compression(from_filename)
+            upload_filename = from_filename
+            if compression is not None and file_compression is None:
+                compressed_filename = compress_file(from_filename, compression, compression_level)
+                upload_filename, file_compression = compressed_filename, compression
+                logging.info(f"Compressed {from_filename} with {compression} from "
+                             f"{os.path.getsize(from_filename) / 1024 / 1024:.1f} MB to "
+                             f"{os.path.getsize(compressed_filename) / 1024 / 1024:.1f} MB")
+            extra_args = {"Metadata": {"compression": file_compression}} if file_compression else None
+            progress = TransferProgress("upload", to_filename, os.path.getsize(upload_filename))
+            self.s3_client.upload_file(upload_filename, bucket_name, to_filename, ExtraArgs=extra_args,
+                                       Config=self.transfer_config, Callback=progress)
+            progress.finish()
+            self.metadata_cache.invalidate(bucket_name, to_filename)
             logging.info(f"Uploaded {from_filename} to {to_filename} in {bucket_name}")
 
             # Delete the local file if remove is True
@@ -137,6 +536,9 @@ class SimpleStorageService:
             logging.info("Exited the upload_file method of SimpleStorageService class")
         except Exception as e:
             raise CustomException(e, sys) from e
+        finally:
+            if compressed_filename is not None and os.path.exists(compressed_filename):
+                os.remove(compressed_filename)
 
     def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str) -> None:
         """
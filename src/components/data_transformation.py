@@ -6,7 +6,7 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.compose import ColumnTransformer
 
-from src.constants import TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR
+from src.constants import TARGET_COLUMN, SCHEMA_FILE_PATH, CURRENT_YEAR, PREDICTION_FEATURE_COLUMNS
 from src.entity.config_entity import DataTransformationConfig
 from src.entity.artifact_entity import DataTransformationArtifact, DataIngestionArtifact, DataValidationArtifact
 from src.exception import CustomException
@@ -99,6 +99,37 @@ class DataTransformation:
             logging.error(f"Exception occurred in drop_id_column method of DataTransformation class: {e}")
             raise CustomException(e,sys)
 
+    @staticmethod
+    def build_model_features(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the feature engineering of initiate_data_transformation (gender mapping,
+        id drop, dummy columns and renames) to raw rows at prediction time.
+        Dummy columns are built from the known categories instead of pd.get_dummies, so
+        every chunk of a file gets the same columns whatever categories it contains.
+        Rows that are already engineered are passed through. Returns the columns in
+        training order; unknown categories raise ValueError.
+        """
+        if all(column in df.columns for column in PREDICTION_FEATURE_COLUMNS):
+            return df[list(PREDICTION_FEATURE_COLUMNS)]
+
+        gender = df['Gender'].map({'Male': 1, 'Female': 0})
+        vehicle_age = df['Vehicle_Age']
+        vehicle_damage = df['Vehicle_Damage']
+        if gender.isna().any():
+            raise ValueError("Gender must be 'Male' or 'Female'")
+        if not vehicle_age.isin(["< 1 Year", "1-2 Year", "> 2 Years"]).all():
+            raise ValueError("Vehicle_Age must be '< 1 Year', '1-2 Year' or '> 2 Years'")
+        if not vehicle_damage.isin(["Yes", "No"]).all():
+            raise ValueError("Vehicle_Damage must be 'Yes' or 'No'")
+
+        features = df.assign(
+            Gender=gender.astype(int),
+            Vehicle_Age_lt_1_Year=(vehicle_age == "< 1 Year").astype(int),
+            Vehicle_Age_gt_2_Years=(vehicle_age == "> 2 Years").astype(int),
+            Vehicle_Damage_Yes=(vehicle_damage == "Yes").astype(int),
+        )
+        return features[list(PREDICTION_FEATURE_COLUMNS)]
+
     def initiate_data_transformation(self)->DataTransformationArtifact:
         logging.info(f"Initiating data transformation")
         try:
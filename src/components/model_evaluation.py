@@ -133,7 +133,8 @@ class ModelEvaluation:
                 is_model_accepted=evaluate_model_response.is_model_accepted,
                 changed_accuracy=evaluate_model_response.difference,
                 s3_model_path=s3_model_path,
-                trained_model_path=self.model_trainer_artifact.trained_model_file_path
+                trained_model_path=self.model_trainer_artifact.trained_model_file_path,
+                classification_metric_artifact=self.model_trainer_artifact.classification_metric_artifact
             )
             logging.info(f"Model evaluation artifact: {model_evaluation_artifact}")
             return model_evaluation_artifact
@@ -145,7 +146,8 @@ class ModelEvaluation:
                 is_model_accepted=True,  # Accept model by default for first run
                 changed_accuracy=0.0,
                 s3_model_path=s3_model_path,
-                trained_model_path=self.model_trainer_artifact.trained_model_file_path
+                trained_model_path=self.model_trainer_artifact.trained_model_file_path,
+                classification_metric_artifact=self.model_trainer_artifact.classification_metric_artifact
             )
             logging.info(f"Created default model evaluation artifact due to error: {model_evaluation_artifact}")
             return model_evaluation_artifact
@@ -1,10 +1,12 @@
 import sys
+from dataclasses import asdict
 
 from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import CustomException
 from src.logger import logging
 from src.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtifact
 from src.entity.config_entity import ModelPusherConfig
+from src.entity.model_registry import ModelRegistry
 from src.entity.s3_estimator import Proj1Estimator
 
 
@@ -20,6 +22,17 @@ class ModelPusher:
         self.model_pusher_config = model_pusher_config
         self.proj1_estimator = Proj1Estimator(bucket_name=model_pusher_config.bucket_name,
                                 model_path=model_pusher_config.s3_model_key_path)
+        self.model_registry = ModelRegistry(bucket_name=model_pusher_config.bucket_name,
+                                            registry_prefix=model_pusher_config.registry_prefix)
+
+    def get_model_metrics(self) -> dict:
+        """
+        Returns the metrics recorded in the registry manifest of the pushed model
+        """
+        metrics = {"changed_accuracy": self.model_evaluation_artifact.changed_accuracy}
+        if self.model_evaluation_artifact.classification_metric_artifact is not None:
+            metrics.update(asdict(self.model_evaluation_artifact.classification_metric_artifact))
+        return metrics
 
     def initiate_model_pusher(self) -> ModelPusherArtifact:
         """
@@ -36,9 +49,20 @@ class ModelPusher:
             logging.info("Uploading artifacts folder to s3 bucket")
             
             logging.info("Uploading new model to S3 bucket....")
-            self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
+            self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path,
+                                            compression=self.model_pusher_config.compression,
+                                            compression_level=self.model_pusher_config.compression_level)
+
+            logging.info("Registering new model version in the model registry....")
+            manifest = self.model_registry.register_model(self.model_evaluation_artifact.trained_model_path,
+                                                          metrics=self.get_model_metrics(),
+                                                          compression=self.model_pusher_config.compression,
+                                                          compression_level=self.model_pusher_config.compression_level)
+            self.model_registry.promote(manifest["version"])
             model_pusher_artifact = ModelPusherArtifact(bucket_name=self.model_pusher_config.bucket_name,
-                                                        s3_model_path=self.model_pusher_config.s3_model_key_path)
+                                                        s3_model_path=self.model_pusher_config.s3_model_key_path,
+                                                        model_version=manifest["version"],
+                                                        registry_model_path=manifest["model_key"])
 
             logging.info("Uploaded artifacts folder to s3 bucket")
             logging.info(f"Model pusher artifact: [{model_pusher_artifact}]")
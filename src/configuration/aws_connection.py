@@ -1,31 +1,92 @@
 import os
+import threading
 import boto3
+from botocore.config import Config
 from src.constants import AWS_ACCESS_KEY_ID_ENV_KEY, AWS_SECRET_ACCESS_KEY_ENV_KEY, REGION_NAME
+from src.entity.config_entity import S3ConnectionConfig
 from src.exception import CustomException
 import sys
 
 class S3Connection:
-    def __init__(self):
+    """
+    Process-wide S3 connection shared by every S3Connection instance.
+
+    The boto3 session and client (with its HTTP connection pool) are created
+    once per process instead of on every SimpleStorageService(); clients are
+    thread-safe and shared by all threads. boto3 resources are not, so every
+    thread gets its own s3_resource, created once and reused.
+    """
+
+    session = None  # Shared boto3 Session across all S3Connection instances
+    s3_client = None  # Shared S3 client across all S3Connection instances and threads
+    _resources = threading.local()
+    _pid = None
+    _lock = threading.Lock()
+
+    def __init__(self, s3_connection_config: S3ConnectionConfig = S3ConnectionConfig()):
+        """
+        :param s3_connection_config: Connection pool, timeout and retry settings, applied by the first instance
+        """
         try:
-            self.access_key_id = os.getenv(AWS_ACCESS_KEY_ID_ENV_KEY)
-            self.secret_access_key = os.getenv(AWS_SECRET_ACCESS_KEY_ENV_KEY)
-            
-            if not self.access_key_id or not self.secret_access_key:
-                raise CustomException("AWS credentials not found in environment variables")
-
-            self.s3_client = boto3.client(
-                's3',
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.secret_access_key,
-                region_name=REGION_NAME
-            )
-
-            self.s3_resource = boto3.resource(
-                's3',
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.secret_access_key,
-                region_name=REGION_NAME
-            )
-            
+            # A forked child must not reuse the connections of its parent
+            if S3Connection.s3_client is None or S3Connection._pid != os.getpid():
+                with S3Connection._lock:
+                    if S3Connection.s3_client is None or S3Connection._pid != os.getpid():
+                        self._connect(s3_connection_config)
+
+            self.s3_client = S3Connection.s3_client
+            self.s3_resource = self.get_resource()
         except Exception as e:
             raise CustomException(e, sys)
+
+    @staticmethod
+    def get_client_config(s3_connection_config: S3ConnectionConfig) -> Config:
+        return Config(
+            max_pool_connections=s3_connection_config.max_pool_connections,
+            connect_timeout=s3_connection_config.connect_timeout,
+            read_timeout=s3_connection_config.read_timeout,
+            retries={"mode": s3_connection_config.retry_mode,
+                     "max_attempts": s3_connection_config.max_attempts},
+        )
+
+    @classmethod
+    def _connect(cls, s3_connection_config: S3ConnectionConfig) -> None:
+        access_key_id = os.getenv(AWS_ACCESS_KEY_ID_ENV_KEY)
+        secret_access_key = os.getenv(AWS_SECRET_ACCESS_KEY_ENV_KEY)
+        if not access_key_id or not secret_access_key:
+            raise Exception("AWS credentials not found in environment variables")
+
+        cls.session = boto3.session.Session(
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            region_name=REGION_NAME
+        )
+        cls.client_config = cls.get_client_config(s3_connection_config)
+        cls.s3_client = cls.session.client('s3', config=cls.client_config)
+        cls._resources = threading.local()
+        cls._pid = os.getpid()
+
+    @classmethod
+    def get_resource(cls):
+        """
+        Returns the S3 resource of the calling thread, creating it on first use.
+        """
+        s3_resource = getattr(cls._resources, "s3_resource", None)
+        if s3_resource is None:
+            # Sessions are not thread-safe either; resources are created one at a time
+            with cls._lock:
+                s3_resource = cls.session.resource('s3', config=cls.client_config)
+            cls._resources.s3_resource = s3_resource
+        return s3_resource
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drops the shared session, client and resources; the next instance connects again,
+        e.g. after the credentials or connection settings changed.
+        """
+        with cls._lock:
+            cls.session = None
+            cls.s3_client = None
+            cls._resources = threading.local()
+            cls._pid = None
@@ -11,6 +11,8 @@ PIPELINE_NAME: str = ""
 ARTIFACT_DIR: str = "artifact"
 
 MODEL_FILE_NAME = "model.pkl"
+# Memory-mapped model artifacts (see src.entity.model_store), always stored uncompressed
+MODEL_ARTIFACT_SUFFIX = ".vipmodel"
 
 TARGET_COLUMN = "Response"
 CURRENT_YEAR = date.today().year
@@ -25,6 +27,29 @@ SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 AWS_ACCESS_KEY_ID_ENV_KEY = "AWS_ACCESS_KEY_ID"
 AWS_SECRET_ACCESS_KEY_ENV_KEY = "AWS_SECRET_ACCESS_KEY"
 REGION_NAME = "us-east-1"
+# Seconds HEAD results (size, ETag, last-modified, or absence) of S3 objects are reused for
+S3_METADATA_CACHE_TTL_SECONDS_ENV_KEY = "S3_METADATA_CACHE_TTL_SECONDS"
+S3_METADATA_CACHE_TTL_SECONDS: float = 5.0
+# botocore client settings of the shared S3 connection
+S3_MAX_POOL_CONNECTIONS_ENV_KEY = "S3_MAX_POOL_CONNECTIONS"
+S3_CONNECT_TIMEOUT_SECONDS_ENV_KEY = "S3_CONNECT_TIMEOUT_SECONDS"
+S3_READ_TIMEOUT_SECONDS_ENV_KEY = "S3_READ_TIMEOUT_SECONDS"
+S3_RETRY_MODE_ENV_KEY = "S3_RETRY_MODE"
+S3_MAX_ATTEMPTS_ENV_KEY = "S3_MAX_ATTEMPTS"
+S3_MAX_POOL_CONNECTIONS: int = 32
+S3_CONNECT_TIMEOUT_SECONDS: float = 5.0
+S3_READ_TIMEOUT_SECONDS: float = 60.0
+S3_RETRY_MODE: str = "standard"
+S3_MAX_ATTEMPTS: int = 5
+# Multipart transfer settings of model uploads and downloads
+S3_TRANSFER_MULTIPART_THRESHOLD_MB_ENV_KEY = "S3_TRANSFER_MULTIPART_THRESHOLD_MB"
+S3_TRANSFER_CHUNK_SIZE_MB_ENV_KEY = "S3_TRANSFER_CHUNK_SIZE_MB"
+S3_TRANSFER_MAX_CONCURRENCY_ENV_KEY = "S3_TRANSFER_MAX_CONCURRENCY"
+S3_TRANSFER_MULTIPART_THRESHOLD_MB: int = 16
+S3_TRANSFER_CHUNK_SIZE_MB: int = 16
+S3_TRANSFER_MAX_CONCURRENCY: int = 10
+# Transfers log their progress every this many percent
+S3_TRANSFER_PROGRESS_LOG_PERCENT: int = 25
 
 
 """
@@ -71,6 +96,80 @@ MODEL Evaluation related constants
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
 MODEL_BUCKET_NAME = "mlopsmodelbucket"
 MODEL_PUSHER_S3_KEY = "model-registry"
+# Registry layout under MODEL_PUSHER_S3_KEY: immutable models/<sha256><ext>, manifests/<sha256>.json
+# and the current.json pointer to the served version
+MODEL_REGISTRY_MODELS_DIR = "models"
+MODEL_REGISTRY_MANIFESTS_DIR = "manifests"
+MODEL_REGISTRY_POINTER_NAME = "current.json"
+# Codec of pushed models: none, gzip, bz2, lzma or zstd (zstd requires zstandard); empty level = codec default
+MODEL_PUSHER_COMPRESSION_ENV_KEY = "MODEL_COMPRESSION"
+MODEL_PUSHER_COMPRESSION_LEVEL_ENV_KEY = "MODEL_COMPRESSION_LEVEL"
+MODEL_PUSHER_COMPRESSION: str = "none"
+
+
+"""
+Prediction related constants start with PREDICTION VAR NAME
+"""
+# Model input features in training column order, with the dtype each one is validated as
+PREDICTION_FEATURE_COLUMNS: dict = {
+    "Gender": "int64",
+    "Age": "int64",
+    "Driving_License": "int64",
+    "Region_Code": "float64",
+    "Previously_Insured": "int64",
+    "Annual_Premium": "float64",
+    "Policy_Sales_Channel": "float64",
+    "Vintage": "int64",
+    "Vehicle_Age_lt_1_Year": "int64",
+    "Vehicle_Age_gt_2_Years": "int64",
+    "Vehicle_Damage_Yes": "int64",
+}
+PREDICTION_BATCH_MAX_RECORDS: int = 10000
+PREDICTION_POSITIVE_CLASS: int = 1
+PREDICTION_DEFAULT_THRESHOLD: float = 0.5
+BULK_PREDICTION_CHUNK_SIZE: int = 10000
+PREDICTION_COMPILED_FOREST_ENV_KEY = "USE_COMPILED_FOREST"
+PREDICTION_COMPILED_FOREST_MAX_ROWS_ENV_KEY = "COMPILED_FOREST_MAX_ROWS"
+PREDICTION_COMPILED_FOREST_MAX_ROWS: int = 1024
+PREDICTION_CACHE_MAX_ENTRIES_ENV_KEY = "PREDICTION_CACHE_MAX_ENTRIES"
+PREDICTION_CACHE_MAX_BYTES_ENV_KEY = "PREDICTION_CACHE_MAX_BYTES"
+PREDICTION_CACHE_MAX_ENTRIES: int = 100000
+PREDICTION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+PREDICTION_WARMUP_ROWS_ENV_KEY = "MODEL_WARMUP_ROWS"
+PREDICTION_WARMUP_ROWS: int = 256
+PREDICTION_SHARED_MODEL_STORE_DIR_ENV_KEY = "SHARED_MODEL_STORE_DIR"
+# Bucket key of the served model: a dill pickle (model.pkl) or a model artifact (*.vipmodel)
+PREDICTION_MODEL_FILE_PATH_ENV_KEY = "MODEL_FILE_PATH"
+# Local cache of downloaded models keyed by bucket, key and ETag; model artifacts are mapped from it.
+# Disabled unless set, e.g. MODEL_CACHE_DIR=/var/cache/vehicle-insurance-model
+PREDICTION_MODEL_CACHE_DIR_ENV_KEY = "MODEL_CACHE_DIR"
+# "1" serves the version the model registry's current.json points to instead of MODEL_FILE_PATH
+PREDICTION_USE_MODEL_REGISTRY_ENV_KEY = "USE_MODEL_REGISTRY"
+# Seconds between polls of the model version marker for a hot swap; 0 disables the refresher
+PREDICTION_MODEL_REFRESH_INTERVAL_SECONDS_ENV_KEY = "MODEL_REFRESH_INTERVAL_SECONDS"
+PREDICTION_MODEL_REFRESH_INTERVAL_SECONDS: float = 60.0
+
+"""
+Serving related constants start with SERVING VAR NAME
+"""
+SERVING_INFERENCE_WORKERS_ENV_KEY = "INFERENCE_WORKERS"
+SERVING_IO_WORKERS_ENV_KEY = "IO_WORKERS"
+SERVING_MAX_QUEUE_SIZE_ENV_KEY = "INFERENCE_MAX_QUEUE_SIZE"
+SERVING_INFERENCE_WORKERS: int = min(4, os.cpu_count() or 1)
+SERVING_IO_WORKERS: int = 4
+SERVING_MAX_QUEUE_SIZE: int = 256
+SERVING_BATCH_MAX_SIZE_ENV_KEY = "PREDICTION_BATCH_MAX_SIZE"
+SERVING_BATCH_MAX_WAIT_MS_ENV_KEY = "PREDICTION_BATCH_MAX_WAIT_MS"
+SERVING_BATCH_MAX_SIZE: int = 64
+SERVING_BATCH_MAX_WAIT_MS: float = 5.0
+
+"""
+Training job related constants start with TRAINING_JOB VAR NAME
+"""
+TRAINING_JOB_HISTORY_SIZE_ENV_KEY = "TRAINING_JOB_HISTORY_SIZE"
+TRAINING_JOB_NICENESS_ENV_KEY = "TRAINING_JOB_NICENESS"
+TRAINING_JOB_HISTORY_SIZE: int = 20
+TRAINING_JOB_NICENESS: int = 10
 
 
 APP_HOST = "0.0.0.0"
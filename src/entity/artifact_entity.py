@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass 
 class DataIngestionArtifact:
@@ -39,10 +40,13 @@ class ModelEvaluationArtifact:
     changed_accuracy: float
     s3_model_path: str
     trained_model_path :str
+    classification_metric_artifact: Optional[ClassificationMetricArtifact] = None
     
 
 @dataclass
 class ModelPusherArtifact:
     bucket_name:str
     s3_model_path:str
+    model_version: Optional[str] = None
+    registry_model_path: Optional[str] = None
 
@@ -66,8 +66,63 @@ class ModelEvaluationConfig:
 class ModelPusherConfig:
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
+    registry_prefix: str = MODEL_PUSHER_S3_KEY
+    # Pickled models only; model artifacts (*.vipmodel) are memory-mapped and must stay uncompressed
+    compression: str = os.getenv(MODEL_PUSHER_COMPRESSION_ENV_KEY, MODEL_PUSHER_COMPRESSION)
+    compression_level: int = (int(os.getenv(MODEL_PUSHER_COMPRESSION_LEVEL_ENV_KEY))
+                              if os.getenv(MODEL_PUSHER_COMPRESSION_LEVEL_ENV_KEY) else None)
 
 @dataclass
 class VehiclePredictorConfig:
-    model_file_path: str = MODEL_FILE_NAME
-    model_bucket_name: str = MODEL_BUCKET_NAME
\ No newline at end of file
+    model_file_path: str = os.getenv(PREDICTION_MODEL_FILE_PATH_ENV_KEY, MODEL_FILE_NAME)
+    model_bucket_name: str = MODEL_BUCKET_NAME
+    # Empty (the default) disables the cache; model artifacts (*.vipmodel) require it
+    model_cache_dir: str = os.getenv(PREDICTION_MODEL_CACHE_DIR_ENV_KEY, "")
+    use_model_registry: bool = os.getenv(PREDICTION_USE_MODEL_REGISTRY_ENV_KEY, "0") == "1"
+    model_registry_prefix: str = MODEL_PUSHER_S3_KEY
+    model_refresh_interval_seconds: float = float(os.getenv(PREDICTION_MODEL_REFRESH_INTERVAL_SECONDS_ENV_KEY,
+                                                            PREDICTION_MODEL_REFRESH_INTERVAL_SECONDS))
+    use_compiled_forest: bool = os.getenv(PREDICTION_COMPILED_FOREST_ENV_KEY, "0") == "1"
+    compiled_forest_max_rows: int = int(os.getenv(PREDICTION_COMPILED_FOREST_MAX_ROWS_ENV_KEY,
+                                                  PREDICTION_COMPILED_FOREST_MAX_ROWS))
+    warmup_rows: int = int(os.getenv(PREDICTION_WARMUP_ROWS_ENV_KEY, PREDICTION_WARMUP_ROWS))
+    # Empty disables the shared store; e.g. /dev/shm/vehicle-model to map the model from shared memory
+    shared_model_store_dir: str = os.getenv(PREDICTION_SHARED_MODEL_STORE_DIR_ENV_KEY, "")
+
+@dataclass
+class PredictionCacheConfig:
+    max_entries: int = int(os.getenv(PREDICTION_CACHE_MAX_ENTRIES_ENV_KEY, PREDICTION_CACHE_MAX_ENTRIES))
+    max_bytes: int = int(os.getenv(PREDICTION_CACHE_MAX_BYTES_ENV_KEY, PREDICTION_CACHE_MAX_BYTES))
+
+@dataclass
+class ServingConfig:
+    inference_workers: int = int(os.getenv(SERVING_INFERENCE_WORKERS_ENV_KEY, SERVING_INFERENCE_WORKERS))
+    io_workers: int = int(os.getenv(SERVING_IO_WORKERS_ENV_KEY, SERVING_IO_WORKERS))
+    max_queue_size: int = int(os.getenv(SERVING_MAX_QUEUE_SIZE_ENV_KEY, SERVING_MAX_QUEUE_SIZE))
+
+@dataclass
+class PredictionBatcherConfig:
+    max_batch_size: int = int(os.getenv(SERVING_BATCH_MAX_SIZE_ENV_KEY, SERVING_BATCH_MAX_SIZE))
+    max_wait_ms: float = float(os.getenv(SERVING_BATCH_MAX_WAIT_MS_ENV_KEY, SERVING_BATCH_MAX_WAIT_MS))
+
+@dataclass
+class TrainingJobConfig:
+    history_size: int = int(os.getenv(TRAINING_JOB_HISTORY_SIZE_ENV_KEY, TRAINING_JOB_HISTORY_SIZE))
+    niceness: int = int(os.getenv(TRAINING_JOB_NICENESS_ENV_KEY, TRAINING_JOB_NICENESS))
+
+@dataclass
+class S3ConnectionConfig:
+    max_pool_connections: int = int(os.getenv(S3_MAX_POOL_CONNECTIONS_ENV_KEY, S3_MAX_POOL_CONNECTIONS))
+    connect_timeout: float = float(os.getenv(S3_CONNECT_TIMEOUT_SECONDS_ENV_KEY, S3_CONNECT_TIMEOUT_SECONDS))
+    read_timeout: float = float(os.getenv(S3_READ_TIMEOUT_SECONDS_ENV_KEY, S3_READ_TIMEOUT_SECONDS))
+    # "legacy", "standard" or "adaptive" (client-side rate limiting on throttling errors)
+    retry_mode: str = os.getenv(S3_RETRY_MODE_ENV_KEY, S3_RETRY_MODE)
+    max_attempts: int = int(os.getenv(S3_MAX_ATTEMPTS_ENV_KEY, S3_MAX_ATTEMPTS))
+
+@dataclass
+class S3TransferConfig:
+    multipart_threshold_mb: int = int(os.getenv(S3_TRANSFER_MULTIPART_THRESHOLD_MB_ENV_KEY,
+                                                S3_TRANSFER_MULTIPART_THRESHOLD_MB))
+    chunk_size_mb: int = int(os.getenv(S3_TRANSFER_CHUNK_SIZE_MB_ENV_KEY, S3_TRANSFER_CHUNK_SIZE_MB))
+    # Parts transferred in parallel; 1 transfers on the calling thread
+    max_concurrency: int = int(os.getenv(S3_TRANSFER_MAX_CONCURRENCY_ENV_KEY, S3_TRANSFER_MAX_CONCURRENCY))
@@ -1,11 +1,21 @@
 import sys
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
+from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, StandardScaler
 
+from src.constants import PREDICTION_COMPILED_FOREST_MAX_ROWS, PREDICTION_FEATURE_COLUMNS
+from src.entity.forest_engine import CompiledForest
 from src.exception import CustomException
 from src.logger import logging
+from src.utils.metrics import PREDICTION_STAGE_DURATION
+
+_PREPROCESS_TIMER = PREDICTION_STAGE_DURATION.labels(stage="preprocess_transform")
+_FOREST_PREDICT_TIMER = PREDICTION_STAGE_DURATION.labels(stage="forest_predict")
 
 class TargetValueMapping:
     def __init__(self):
@@ -17,6 +27,112 @@ class TargetValueMapping:
         mapping_response = self._asdict()
         return dict(zip(mapping_response.values(),mapping_response.keys()))
 
+class CompiledPreprocessor:
+    """
+    Pandas-free form of the fitted preprocessing pipeline.
+
+    The ColumnTransformer is flattened into a column gather followed by
+    ((x - offset) / scale) * multiplier + addend with per-column arrays:
+    StandardScaler columns use (mean_, scale_, 1, 0), MinMaxScaler columns
+    (0, 1, scale_, min_) and passthrough columns (0, 1, 1, 0). The identity
+    steps are exact in IEEE arithmetic, so the output is bit-for-bit identical
+    to preprocessing_object.transform on the same rows.
+    """
+
+    def __init__(self, preprocessing_object: Pipeline, feature_names: List[str]):
+        """
+        :param preprocessing_object: Fitted Pipeline (or ColumnTransformer) used at training time
+        :param feature_names: Column order of the feature matrices passed to transform
+        """
+        column_transformer = preprocessing_object
+        if isinstance(column_transformer, Pipeline):
+            column_transformer = column_transformer.steps[-1][1]
+        if not isinstance(column_transformer, ColumnTransformer):
+            raise ValueError(f"Cannot compile preprocessor of type {type(column_transformer).__name__}")
+
+        feature_names = list(feature_names)
+        input_names = list(getattr(column_transformer, "feature_names_in_", feature_names))
+        positions = {name: feature_names.index(name) for name in input_names}
+
+        indices, offset, scale, multiplier, addend = [], [], [], [], []
+        for name, transformer, columns in column_transformer.transformers_:
+            if isinstance(transformer, str) and transformer == "drop":
+                continue
+            columns = self._get_column_names(columns, input_names)
+            if len(columns) == 0:
+                continue
+            n_columns = len(columns)
+            identity = np.zeros(n_columns), np.ones(n_columns), np.ones(n_columns), np.zeros(n_columns)
+
+            if isinstance(transformer, StandardScaler):
+                column_offset = transformer.mean_ if transformer.with_mean else identity[0]
+                column_scale = transformer.scale_ if transformer.with_std else identity[1]
+                column_params = (column_offset, column_scale, identity[2], identity[3])
+            elif isinstance(transformer, MinMaxScaler) and not transformer.clip:
+                column_params = (identity[0], identity[1], transformer.scale_, transformer.min_)
+            elif (isinstance(transformer, str) and transformer == "passthrough") or \
+                    (isinstance(transformer, FunctionTransformer) and transformer.func is None):
+                column_params = identity
+            else:
+                raise ValueError(f"Cannot compile transformer '{name}' of type {type(transformer).__name__}")
+
+            indices.extend(positions[column] for column in columns)
+            for params, values in zip((offset, scale, multiplier, addend), column_params):
+                params.extend(np.asarray(values, dtype="float64"))
+
+        self._set_arrays(feature_names, indices, offset, scale, multiplier, addend)
+
+    def _set_arrays(self, feature_names, indices, offset, scale, multiplier, addend) -> None:
+        self.feature_names = list(feature_names)
+        self.indices = np.array(indices, dtype="intp")
+        self.offset = np.array(offset, dtype="float64")
+        self.scale = np.array(scale, dtype="float64")
+        self.multiplier = np.array(multiplier, dtype="float64")
+        self.addend = np.array(addend, dtype="float64")
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the column gather and scaling arrays, for saving with save_mapped_arrays.
+        """
+        return {"indices": self.indices, "offset": self.offset, "scale": self.scale,
+                "multiplier": self.multiplier, "addend": self.addend}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], feature_names: List[str]) -> "CompiledPreprocessor":
+        """
+        Rebuilds the preprocessor on the arrays of to_arrays.
+        """
+        compiled_preprocessor = cls.__new__(cls)
+        compiled_preprocessor._set_arrays(feature_names, arrays["indices"], arrays["offset"], arrays["scale"],
+                                          arrays["multiplier"], arrays["addend"])
+        return compiled_preprocessor
+
+    @staticmethod
+    def _get_column_names(columns, input_names: List[str]) -> List[str]:
+        """
+        Resolves a transformer's column selection (names, indices, slice or mask) to column names
+        """
+        if isinstance(columns, str):
+            return [columns]
+        if not isinstance(columns, slice):
+            columns = list(columns)
+            if all(isinstance(column, str) for column in columns):
+                return columns
+        return [input_names[index] for index in np.arange(len(input_names))[columns]]
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """
+        :param features: float64 matrix of shape (n_rows, n_features) in feature_names order
+        :return: Transformed matrix, identical to the pipeline's transform output
+        """
+        transformed = np.asarray(features, dtype="float64")[:, self.indices]
+        transformed -= self.offset
+        transformed /= self.scale
+        transformed *= self.multiplier
+        transformed += self.addend
+        return transformed
+
+
 class MyModel:
     def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
         """
@@ -26,6 +142,18 @@ class MyModel:
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
 
+    @classmethod
+    def from_compiled(cls, preprocessing_object: Optional[Pipeline], compiled_forest: CompiledForest,
+                      compiled_preprocessor: CompiledPreprocessor) -> "MyModel":
+        """
+        Builds a model that scores every batch with the compiled forest and holds no sklearn trees,
+        e.g. on arrays memory-mapped from a model artifact. Without a preprocessing_object,
+        DataFrames are transformed by the compiled preprocessor as well.
+        """
+        model = cls(preprocessing_object=preprocessing_object, trained_model_object=compiled_forest)
+        model._compiled_preprocessor = compiled_preprocessor
+        return model
+
     def predict(self, dataframe: pd.DataFrame) -> DataFrame:
         """
         Function accepts preprocessed inputs (with all custom transformations already applied),
@@ -35,11 +163,12 @@ class MyModel:
             logging.info("Starting prediction process.")
 
             # Step 1:   Apply scaling transformations using the pre-trained preprocessing object
-            transformed_feature = self.preprocessing_object.transform(dataframe)
+            with _PREPROCESS_TIMER.time():
+                transformed_feature = self._transform_dataframe(dataframe)
 
             # Step 2: Perform prediction using the trained model
             logging.info("Using the trained model to get predictions")
-            predictions = self.trained_model_object.predict(transformed_feature)
+            predictions = self._predict_transformed(transformed_feature)
 
             return predictions
 
@@ -47,7 +176,87 @@ class MyModel:
             logging.error("Error occurred in predict method", exc_info=True)
             raise CustomException(e, sys) from e
 
+    def predict_proba(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        Same inputs as predict; returns the class probabilities, one column per entry of classes_.
+        """
+        try:
+            logging.info("Starting probability prediction process.")
+            with _PREPROCESS_TIMER.time():
+                transformed_feature = self._transform_dataframe(dataframe)
+            return self._predict_proba_transformed(transformed_feature)
+
+        except Exception as e:
+            logging.error("Error occurred in predict_proba method", exc_info=True)
+            raise CustomException(e, sys) from e
+
+    def _transform_dataframe(self, dataframe: pd.DataFrame) -> np.ndarray:
+        if self.preprocessing_object is None:
+            compiled_preprocessor = self.get_compiled_preprocessor()
+            return compiled_preprocessor.transform(
+                dataframe[compiled_preprocessor.feature_names].to_numpy(dtype="float64"))
+        return self.preprocessing_object.transform(dataframe)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.trained_model_object.classes_
+
+    def get_compiled_preprocessor(self) -> CompiledPreprocessor:
+        """
+        Returns the pandas-free preprocessor, compiling it from preprocessing_object on first use.
+        """
+        compiled_preprocessor: Optional[CompiledPreprocessor] = getattr(self, "_compiled_preprocessor", None)
+        if compiled_preprocessor is None:
+            compiled_preprocessor = CompiledPreprocessor(self.preprocessing_object, list(PREDICTION_FEATURE_COLUMNS))
+            self._compiled_preprocessor = compiled_preprocessor
+        return compiled_preprocessor
+
+    def predict_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Fast path of predict for a float64 feature matrix in PREDICTION_FEATURE_COLUMNS order.
+        Skips DataFrame construction and ColumnTransformer column lookups; the
+        predictions are identical to predict on the equivalent DataFrame.
+        """
+        try:
+            with _PREPROCESS_TIMER.time():
+                transformed_feature = self.get_compiled_preprocessor().transform(features)
+            return self._predict_transformed(transformed_feature)
+        except Exception as e:
+            logging.error("Error occurred in predict_features method", exc_info=True)
+            raise CustomException(e, sys) from e
+
+
+
+    def compile_forest(self, max_rows: int = PREDICTION_COMPILED_FOREST_MAX_ROWS) -> CompiledForest:
+        """
+        Packs the trained forest into flat node arrays and routes batches of up to max_rows
+        rows through the compiled engine. Larger batches stay on sklearn, which is faster
+        once its per-call overhead is amortized. Predictions are identical either way.
+        """
+        try:
+            if isinstance(self.trained_model_object, CompiledForest):
+                # Models mapped from an artifact hold no sklearn trees and always use the compiled forest
+                return self.trained_model_object
+            self._compiled_forest = CompiledForest.from_sklearn(self.trained_model_object)
+            self._compiled_forest_max_rows = max_rows
+            logging.info(f"Compiled {self._compiled_forest.n_trees} trees for batches of up to {max_rows} rows")
+            return self._compiled_forest
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _predict_transformed(self, transformed_feature: np.ndarray) -> np.ndarray:
+        compiled_forest: Optional[CompiledForest] = getattr(self, "_compiled_forest", None)
+        with _FOREST_PREDICT_TIMER.time():
+            if compiled_forest is not None and transformed_feature.shape[0] <= self._compiled_forest_max_rows:
+                return compiled_forest.predict(transformed_feature)
+            return self.trained_model_object.predict(transformed_feature)
 
+    def _predict_proba_transformed(self, transformed_feature: np.ndarray) -> np.ndarray:
+        compiled_forest: Optional[CompiledForest] = getattr(self, "_compiled_forest", None)
+        with _FOREST_PREDICT_TIMER.time():
+            if compiled_forest is not None and transformed_feature.shape[0] <= self._compiled_forest_max_rows:
+                return compiled_forest.predict_proba(transformed_feature)
+            return self.trained_model_object.predict_proba(transformed_feature)
 
     def __repr__(self):
         return f"{type(self.trained_model_object).__name__}()"
@@ -0,0 +1,179 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class CompiledForest:
+    """
+    Flat-array inference engine for a fitted RandomForestClassifier.
+
+    All trees are packed into shared node arrays (feature, threshold, left and
+    right child, missing-value direction, per-node class probabilities) with
+    leaves pointing at themselves, so a whole batch descends every tree at once with a handful of
+    vectorized gathers per depth level. Inputs are rounded to float32 and tree
+    probabilities are summed in tree order before dividing by the number of
+    trees, exactly as sklearn does, and NaN inputs follow each node's
+    missing_go_to_left, so predictions and probabilities are identical to the
+    sklearn path.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children_left: np.ndarray,
+                 children_right: np.ndarray, node_proba: np.ndarray, roots: np.ndarray,
+                 classes: np.ndarray, max_depth: int, children: Optional[np.ndarray] = None,
+                 missing_go_to_left: Optional[np.ndarray] = None):
+        """
+        :param feature: Feature index compared at each node (0 for leaves)
+        :param threshold: Split threshold of each node
+        :param children_left: Global index of the left child; leaves point at themselves
+        :param children_right: Global index of the right child; leaves point at themselves
+        :param node_proba: Normalized class probabilities of each node, shape (n_nodes, n_classes)
+        :param roots: Global index of the root node of each tree, in estimator order
+        :param classes: Class labels of the forest
+        :param max_depth: Depth of the deepest tree
+        :param children: Precomputed interleaved (right, left) children, e.g. from a memory-mapped store
+        :param missing_go_to_left: Whether NaN inputs take the left child at each node; None sends them right
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.node_proba = node_proba
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = int(max_depth)
+        # Interleaved (right, left) children so that node -> children[2 * node + go_left]
+        if children is None:
+            children = np.stack([children_right, children_left], axis=1).ravel()
+        self._children = children
+        if missing_go_to_left is None:
+            missing_go_to_left = np.zeros(len(feature), dtype="bool")
+        self.missing_go_to_left = missing_go_to_left
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "CompiledForest":
+        """
+        Packs the trees of a fitted single-output RandomForestClassifier.
+        """
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        n_classes = len(forest.classes_)
+        features, thresholds, lefts, rights, missing_lefts, probas, roots = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype="int64")
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype("int64"))
+            thresholds.append(tree.threshold.astype("float64"))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            # Where sklearn sends NaN at each split; trees fitted without NaN still route it to a child
+            missing_lefts.append(np.asarray(tree.missing_go_to_left, dtype="bool") & ~is_leaf)
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :n_classes].astype("float64")
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            probas.append(proba / normalizer)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children_left=np.concatenate(lefts),
+            children_right=np.concatenate(rights),
+            node_proba=np.concatenate(probas),
+            roots=np.array(roots, dtype="int64"),
+            classes=np.asarray(forest.classes_),
+            max_depth=max_depth,
+            missing_go_to_left=np.concatenate(missing_lefts),
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the node arrays, for saving with save_mapped_arrays.
+        """
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "children": self._children,
+            "node_proba": self.node_proba,
+            "roots": self.roots,
+            "classes": self.classes,
+            "max_depth": np.array([self.max_depth], dtype="int64"),
+            "missing_go_to_left": self.missing_go_to_left,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "CompiledForest":
+        """
+        Rebuilds the engine on the arrays of to_arrays without copying them, so a
+        forest backed by a read-only memory map stays shared between processes.
+        """
+        children = arrays["children"]
+        return cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            children_left=children[1::2],
+            children_right=children[0::2],
+            node_proba=arrays["node_proba"],
+            roots=arrays["roots"],
+            classes=arrays["classes"],
+            max_depth=int(arrays["max_depth"][0]),
+            children=children,
+            missing_go_to_left=arrays.get("missing_go_to_left"),
+        )
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.classes
+
+    # Number of (tree, row) pairs walked together; keeps the working set in cache
+    _block_elements = 1 << 16
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns the global leaf index reached in every tree, shape (n_trees, n_rows).
+        """
+        # sklearn evaluates trees on float32 inputs compared against float64 thresholds
+        X = np.asarray(X, dtype="float32").astype("float64")
+        n_rows, n_features = X.shape
+        leaves = np.empty((self.n_trees, n_rows), dtype="int64")
+
+        # Walk the trees over cache-sized row blocks; each level is a few flat gathers
+        block_size = max(1, self._block_elements // self.n_trees)
+        for start in range(0, n_rows, block_size):
+            block = X[start:start + block_size]
+            flat_block = block.ravel()
+            row_offsets = np.arange(block.shape[0], dtype="int64") * n_features
+            nodes = np.repeat(self.roots[:, np.newaxis], block.shape[0], axis=1)
+            has_missing = np.isnan(flat_block).any()
+            for _ in range(self.max_depth):
+                values = flat_block[row_offsets + self.feature[nodes]]
+                go_left = values <= self.threshold[nodes]
+                if has_missing:
+                    go_left |= np.isnan(values) & self.missing_go_to_left[nodes]
+                nodes = self._children[2 * nodes + go_left]
+            leaves[:, start:start + block_size] = nodes
+        return leaves
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.apply(X)
+        proba = np.zeros((leaves.shape[1], self.node_proba.shape[1]), dtype="float64")
+        # Accumulate tree by tree, in estimator order, to reproduce sklearn's summation
+        for tree_leaves in leaves:
+            proba += self.node_proba[tree_leaves]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
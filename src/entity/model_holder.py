@@ -0,0 +1,327 @@
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from src.constants import PREDICTION_FEATURE_COLUMNS
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.estimator import MyModel
+from src.entity.model_registry import ModelRegistry
+from src.entity.model_store import SharedModelStore
+from src.entity.s3_estimator import Proj1Estimator
+from src.exception import CustomException
+from src.logger import logging
+from src.utils.metrics import MODEL_LOAD_DURATION, MODEL_LOADS, MODEL_SWAPS
+
+# Plausible value ranges of the model features, used to build synthetic warm-up rows
+_WARMUP_FEATURE_RANGES = {
+    "Gender": (0, 1),
+    "Age": (20, 85),
+    "Driving_License": (0, 1),
+    "Region_Code": (0, 52),
+    "Previously_Insured": (0, 1),
+    "Annual_Premium": (2630, 100000),
+    "Policy_Sales_Channel": (1, 163),
+    "Vintage": (10, 299),
+    "Vehicle_Age_lt_1_Year": (0, 1),
+    "Vehicle_Age_gt_2_Years": (0, 1),
+    "Vehicle_Damage_Yes": (0, 1),
+}
+
+
+def make_synthetic_features(rows: int, seed: int = 0) -> DataFrame:
+    """
+    Returns rows of random model features within plausible ranges, in PREDICTION_FEATURE_COLUMNS order.
+    """
+    rng = np.random.default_rng(seed)
+    return DataFrame({
+        column: rng.integers(low, high, size=rows, endpoint=True).astype(dtype)
+        for column, dtype in PREDICTION_FEATURE_COLUMNS.items()
+        for low, high in [_WARMUP_FEATURE_RANGES[column]]
+    })
+
+
+class ModelSnapshot(NamedTuple):
+    """
+    A loaded model together with its identity. The holder replaces it as a whole,
+    so whoever took a snapshot scores with exactly the model its version names.
+    """
+    model: MyModel
+    model_version: str
+    estimator: Proj1Estimator
+    loaded_at: datetime
+    load_duration: float
+    warmup_duration: Optional[float]
+
+
+class ModelHolder:
+    """
+    Process-wide holder of the production model.
+
+    The model is fetched from S3 and unpickled once, kept resident in a
+    ModelSnapshot and shared by every request and worker thread of the
+    application. Every newly loaded model is warmed up with a synthetic batch
+    before it is published, so the first real request does not pay for
+    first-call overhead in sklearn/numpy.
+
+    Loads are double-buffered: the new model is built next to the served one
+    and published by a single reference swap, so a reload (see refresh) never
+    makes requests wait; requests in flight finish on the snapshot they took.
+    """
+
+    def __init__(self, prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig()) -> None:
+        """
+        :param prediction_pipeline_config: Bucket and key of the production model, or its model registry
+        """
+        self.prediction_pipeline_config = prediction_pipeline_config
+        self.shared_model_store: Optional[SharedModelStore] = None
+        if prediction_pipeline_config.shared_model_store_dir:
+            self.shared_model_store = SharedModelStore(prediction_pipeline_config.shared_model_store_dir)
+        self.model_registry: Optional[ModelRegistry] = None
+        if prediction_pipeline_config.use_model_registry:
+            self.model_registry = ModelRegistry(prediction_pipeline_config.model_bucket_name,
+                                                prediction_pipeline_config.model_registry_prefix)
+        self._snapshot: Optional[ModelSnapshot] = None
+        self._load_listeners: List[Callable[[MyModel, str], None]] = []
+        self._lock = threading.Lock()
+
+    def add_load_listener(self, listener: Callable[[MyModel, str], None]) -> None:
+        """
+        Registers a callback run with (model, model_version) after every model load,
+        e.g. to invalidate caches of the previous model.
+        """
+        self._load_listeners.append(listener)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def estimator(self) -> Optional[Proj1Estimator]:
+        snapshot = self._snapshot
+        return snapshot.estimator if snapshot else None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        snapshot = self._snapshot
+        return snapshot.model_version if snapshot else None
+
+    @property
+    def loaded_at(self) -> Optional[datetime]:
+        snapshot = self._snapshot
+        return snapshot.loaded_at if snapshot else None
+
+    @property
+    def load_duration(self) -> Optional[float]:
+        snapshot = self._snapshot
+        return snapshot.load_duration if snapshot else None
+
+    @property
+    def warmup_duration(self) -> Optional[float]:
+        snapshot = self._snapshot
+        return snapshot.warmup_duration if snapshot else None
+
+    def load(self) -> MyModel:
+        """
+        Downloads and unpickles the production model, replacing the resident one.
+        Concurrent callers are serialized so the bucket is only read once per load.
+        """
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> MyModel:
+        try:
+            logging.info("Loading production model into the model holder")
+            start = time.perf_counter()
+            estimator, model_version = self._resolve_model()
+            if self.shared_model_store is not None:
+                model, model_version = self._load_shared_model(estimator, model_version)
+            else:
+                with MODEL_LOAD_DURATION.time():
+                    model, loaded_version = estimator.load_model_and_version()
+                # The ETag of the content just loaded; a separate HEAD may already name another version
+                model_version = model_version or loaded_version
+                if self.prediction_pipeline_config.use_compiled_forest:
+                    model.compile_forest(max_rows=self.prediction_pipeline_config.compiled_forest_max_rows)
+            load_duration = time.perf_counter() - start
+            warmup_duration = self.warm_up(model, self.prediction_pipeline_config.warmup_rows)
+
+            previous_snapshot = self._snapshot
+            # The swap: one reference assignment, requests see either the previous or the new snapshot
+            self._snapshot = ModelSnapshot(model=model, model_version=model_version, estimator=estimator,
+                                           loaded_at=datetime.now(timezone.utc), load_duration=load_duration,
+                                           warmup_duration=warmup_duration)
+            logging.info(f"Loaded model {model} version {model_version} in {load_duration:.3f}s")
+            MODEL_LOADS.labels(result="success").inc()
+            if previous_snapshot is not None and previous_snapshot.model_version != model_version:
+                MODEL_SWAPS.inc()
+                logging.info(f"Swapped model version {previous_snapshot.model_version} for {model_version}")
+            for listener in self._load_listeners:
+                listener(model, model_version)
+            return model
+        except Exception as e:
+            MODEL_LOADS.labels(result="failure").inc()
+            raise CustomException(e, sys) from e
+
+    def _resolve_model(self) -> tuple:
+        """
+        Returns the estimator of the model to serve and its version. With the model
+        registry that is the version current.json points to, identified by its SHA-256;
+        otherwise the configured key, whose version (ETag) is read when it is loaded.
+        :return: (Proj1Estimator, model version or None)
+        """
+        model_version = None
+        model_path = self.prediction_pipeline_config.model_file_path
+        if self.model_registry is not None:
+            manifest = self.model_registry.get_current_manifest()
+            if manifest is None:
+                raise ValueError(f"No model version is promoted in the model registry "
+                                 f"{self.model_registry.registry_prefix}")
+            model_version, model_path = manifest["version"], manifest["model_key"]
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.estimator.model_path == model_path:
+            return snapshot.estimator, model_version
+        estimator = Proj1Estimator(
+            bucket_name=self.prediction_pipeline_config.model_bucket_name,
+            model_path=model_path,
+            cache_dir=self.prediction_pipeline_config.model_cache_dir,
+        )
+        return estimator, model_version
+
+    def _load_shared_model(self, estimator: Proj1Estimator, model_version: Optional[str]) -> tuple:
+        """
+        Maps the model from the shared model store. The first worker to need a
+        version downloads, unpickles and packs it; the others only map the file.
+        Without a registry version the current ETag selects the stored version, but a
+        download is stored under the ETag of the content it actually loaded.
+        :return: (MyModel, model version)
+        """
+        if model_version is None:
+            model_version = estimator.get_model_version()
+        if not self.shared_model_store.has_model(model_version):
+            with MODEL_LOAD_DURATION.time():
+                model, loaded_version = estimator.load_model_and_version()
+            # A registry version names immutable content; an ETag is replaced by the one loaded
+            if self.model_registry is None:
+                model_version = loaded_version
+            self.shared_model_store.save_model(model, model_version)
+            # Drop the private sklearn copy; only the mapped arrays stay resident
+            del model
+            self._remove_superseded_versions(model_version)
+        model = self.shared_model_store.load_model(model_version)
+        logging.info(f"Mapped model version {model_version} from {self.shared_model_store.store_dir}")
+        return model, model_version
+
+    def _remove_superseded_versions(self, model_version: str) -> None:
+        """
+        Removes the other versions from the shared model store, but only while model_version
+        is still the published one: a worker that fell behind would otherwise delete the
+        newer version another worker has just packed.
+        """
+        try:
+            latest_version = self.get_latest_version()
+            if latest_version != model_version:
+                logging.info(f"Keeping the other packed versions: {model_version} was superseded by {latest_version}")
+                return
+            self.shared_model_store.remove_other_versions(model_version)
+        except Exception as e:
+            logging.warning(f"Could not clean up the shared model store: {e}")
+
+    @staticmethod
+    def warm_up(model: MyModel, rows: int) -> Optional[float]:
+        """
+        Runs a synthetic batch of rows and a single row through the model so lazy
+        initialization in sklearn/numpy happens before real traffic arrives.
+        :param model: Model to warm up
+        :param rows: Size of the synthetic batch, 0 disables the warm-up
+        :return: Warm-up latency in seconds, None when disabled
+        """
+        if rows <= 0:
+            return None
+        warmup_df = make_synthetic_features(rows)
+
+        start = time.perf_counter()
+        model.predict(dataframe=warmup_df)
+        model.predict_features(warmup_df.to_numpy(dtype="float64")[:1])
+        warmup_duration = time.perf_counter() - start
+        logging.info(f"Warmed up model with {rows} synthetic rows in {warmup_duration:.3f}s")
+        return warmup_duration
+
+    def get_latest_version(self) -> str:
+        """
+        Reads the version marker of the model to serve without downloading the model:
+        the registry pointer, or else the ETag of the model key (an uncached HEAD request).
+        """
+        try:
+            estimator, model_version = self._resolve_model()
+            return model_version or estimator.get_model_version(use_cache=False)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def refresh(self) -> bool:
+        """
+        Loads the model again if its version marker changed. The served model keeps
+        answering every request while the new one is downloaded and warmed up, and is
+        then replaced by the snapshot swap of load.
+        :return: True if a new model version was loaded
+        """
+        try:
+            latest_version = self.get_latest_version()
+            if latest_version == self.model_version:
+                return False
+            with self._lock:
+                # Another caller may have loaded it while this one waited for the lock
+                if latest_version == self.model_version:
+                    return False
+                logging.info(f"Model version changed from {self.model_version} to {latest_version}")
+                self._load()
+            return True
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def get_snapshot(self) -> ModelSnapshot:
+        """
+        Returns the resident model with its version, loading it on first use if startup loading failed.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                self._load()
+            return self._snapshot
+
+    def get_model(self) -> MyModel:
+        """
+        Returns the resident model, loading it on first use if startup loading failed.
+        """
+        return self.get_snapshot().model
+
+    def predict(self, dataframe: DataFrame):
+        return self.get_model().predict(dataframe=dataframe)
+
+    def predict_proba(self, dataframe: DataFrame):
+        return self.get_model().predict_proba(dataframe=dataframe)
+
+    def get_model_info(self) -> dict:
+        """
+        Returns the identity and load timings of the resident model.
+        """
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "model": str(snapshot.model) if snapshot else None,
+            "model_version": snapshot.model_version if snapshot else None,
+            "bucket_name": self.prediction_pipeline_config.model_bucket_name,
+            "model_path": snapshot.estimator.model_path if snapshot else self.prediction_pipeline_config.model_file_path,
+            "model_registry": self.model_registry.registry_prefix if self.model_registry else None,
+            "loaded_at": snapshot.loaded_at.isoformat() if snapshot else None,
+            "load_duration_seconds": snapshot.load_duration if snapshot else None,
+            "warmup_rows": self.prediction_pipeline_config.warmup_rows,
+            "warmup_duration_seconds": snapshot.warmup_duration if snapshot else None,
+            "refresh_interval_seconds": self.prediction_pipeline_config.model_refresh_interval_seconds,
+        }
@@ -0,0 +1,185 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.constants import (MODEL_ARTIFACT_SUFFIX, MODEL_PUSHER_S3_KEY, MODEL_REGISTRY_MANIFESTS_DIR,
+                           MODEL_REGISTRY_MODELS_DIR, MODEL_REGISTRY_POINTER_NAME)
+from src.exception import CustomException
+from src.logger import logging
+from src.utils.common import get_file_sha256
+from src.utils.compression import COMPRESSION_SUFFIXES, detect_file_compression, normalize_compression
+
+MODEL_REGISTRY_FORMAT = "vehicle-model-registry/1"
+
+
+class ModelRegistry:
+    """
+    Versioned model registry in the model bucket, under registry_prefix:
+
+      models/<sha256><ext>       model files, content-addressed and never overwritten,
+                                 with the codec's suffix when stored compressed
+      manifests/<sha256>.json    per version: hash, size, compression, metrics, creation time
+      current.json               pointer: the manifest of the served version
+
+    Registering uploads a model once per content hash; promoting swaps
+    current.json with a single conditional PUT, so readers see either the
+    previous or the new pointer and concurrent promotions cannot silently
+    overwrite each other. Servers poll the small pointer instead of the model,
+    and a rollback is a pointer change back to an existing version.
+    """
+
+    def __init__(self, bucket_name: str, registry_prefix: str = MODEL_PUSHER_S3_KEY):
+        """
+        :param bucket_name: Name of the model bucket
+        :param registry_prefix: Key prefix of the registry in the bucket
+        """
+        self.bucket_name = bucket_name
+        self.registry_prefix = registry_prefix.strip("/")
+        self.s3 = SimpleStorageService()
+
+    @property
+    def pointer_key(self) -> str:
+        return f"{self.registry_prefix}/{MODEL_REGISTRY_POINTER_NAME}"
+
+    def get_model_key(self, version: str, extension: str) -> str:
+        return f"{self.registry_prefix}/{MODEL_REGISTRY_MODELS_DIR}/{version}{extension}"
+
+    def get_manifest_key(self, version: str) -> str:
+        return f"{self.registry_prefix}/{MODEL_REGISTRY_MANIFESTS_DIR}/{version}.json"
+
+    def register_model(self, file_path: str, metrics: dict = None, metadata: dict = None,
+                       compression: str = None, compression_level: int = None) -> dict:
+        """
+        Uploads a model file as an immutable version named after its SHA-256 digest and
+        writes its manifest. Registering content that is already registered uploads nothing
+        and returns the existing manifest.
+        :param file_path: Local model file (model.pkl or a *.vipmodel artifact)
+        :param metrics: Evaluation metrics of the model, e.g. f1_score
+        :param metadata: Further JSON-serializable details to record, e.g. the training run
+        :param compression: Codec to store a pickled model with, see SimpleStorageService.upload_file;
+            model artifacts are always stored uncompressed
+        :param compression_level: Codec compression level, None for the codec's default
+        :return: Manifest of the version
+        """
+        try:
+            version = get_file_sha256(file_path)
+            existing_manifest = self.get_manifest(version)
+            if existing_manifest is not None:
+                logging.info(f"Model {file_path} is already registered as version {version}")
+                return existing_manifest
+
+            compression = detect_file_compression(file_path) or normalize_compression(compression)
+            extension = os.path.splitext(file_path)[1]
+            if extension == MODEL_ARTIFACT_SUFFIX:
+                # Memory-mapped from the downloaded file, so never compressed (nor named *.vipmodel.zst)
+                compression = None
+            if compression is not None and extension != COMPRESSION_SUFFIXES[compression]:
+                extension += COMPRESSION_SUFFIXES[compression]
+            manifest = {
+                "format": MODEL_REGISTRY_FORMAT,
+                "version": version,
+                "sha256": version,
+                "size": os.path.getsize(file_path),
+                "compression": compression,
+                "model_key": self.get_model_key(version, extension),
+                "file_name": os.path.basename(file_path),
+                "metrics": metrics or {},
+                "metadata": metadata or {},
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self.s3.upload_file(file_path, to_filename=manifest["model_key"], bucket_name=self.bucket_name,
+                                remove=False, compression=compression, compression_level=compression_level)
+            manifest["stored_size"] = self.s3.get_object_metadata(manifest["model_key"], self.bucket_name)["size"]
+            # Written after the model, so every manifest points at a complete upload
+            self.s3.put_object_body(self.get_manifest_key(version), self.bucket_name,
+                                    json.dumps(manifest, indent=2).encode(), content_type="application/json")
+            logging.info(f"Registered model {file_path} as version {version} at {manifest['model_key']}")
+            return manifest
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def get_manifest(self, version: str) -> Optional[dict]:
+        """
+        :return: Manifest of version, None when it is not registered
+        """
+        try:
+            result = self.s3.get_object_body(self.get_manifest_key(version), self.bucket_name)
+            return None if result is None else json.loads(result[0])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def list_versions(self) -> List[dict]:
+        """
+        :return: Manifests of all registered versions, oldest first
+        """
+        try:
+            prefix = f"{self.registry_prefix}/{MODEL_REGISTRY_MANIFESTS_DIR}/"
+            manifests = []
+            for page in self.s3.s3_client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket_name,
+                                                                                      Prefix=prefix):
+                for entry in page.get("Contents", []):
+                    manifests.append(json.loads(self.s3.get_object_body(entry["Key"], self.bucket_name)[0]))
+            return sorted(manifests, key=lambda manifest: manifest["created_at"])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def get_current(self) -> Optional[tuple]:
+        """
+        Reads the pointer with one small GET request.
+        :return: (pointer, e_tag), None when no version was promoted yet
+        """
+        try:
+            result = self.s3.get_object_body(self.pointer_key, self.bucket_name)
+            return None if result is None else (json.loads(result[0]), result[1])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def get_current_manifest(self) -> Optional[dict]:
+        """
+        :return: Manifest of the served version with promoted_at and previous_version, None before the first promotion
+        """
+        current = self.get_current()
+        return None if current is None else current[0]
+
+    def promote(self, version: str) -> dict:
+        """
+        Points current.json at a registered version. The PUT is conditional on the pointer
+        read just before, so it fails instead of overwriting a concurrent promotion.
+        :param version: SHA-256 version of a registered model
+        :return: The new pointer
+        """
+        try:
+            manifest = self.get_manifest(version)
+            if manifest is None:
+                raise ValueError(f"Model version {version} is not registered in {self.registry_prefix}")
+            current = self.get_current()
+            pointer = dict(manifest,
+                           promoted_at=datetime.now(timezone.utc).isoformat(),
+                           previous_version=current[0]["version"] if current else None)
+            self.s3.put_object_body(self.pointer_key, self.bucket_name,
+                                    json.dumps(pointer, indent=2).encode(), content_type="application/json",
+                                    if_match=current[1] if current else None, if_none_match=current is None)
+            logging.info(f"Promoted model version {version} (previous: {pointer['previous_version']})")
+            return pointer
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def rollback(self, version: str = None) -> dict:
+        """
+        Points current.json back at an earlier version; no model is uploaded again.
+        :param version: Version to serve, by default the one served before the current
+        :return: The new pointer
+        """
+        try:
+            current = self.get_current_manifest()
+            if version is None:
+                if current is None or not current.get("previous_version"):
+                    raise ValueError("There is no previous model version to roll back to")
+                version = current["previous_version"]
+            logging.info(f"Rolling back model from {current['version'] if current else None} to {version}")
+            return self.promote(version)
+        except Exception as e:
+            raise CustomException(e, sys) from e
@@ -0,0 +1,145 @@
+import glob
+import os
+import sys
+from datetime import datetime, timezone
+
+from src.constants import MODEL_ARTIFACT_SUFFIX, PREDICTION_FEATURE_COLUMNS
+from src.entity.estimator import CompiledPreprocessor, MyModel
+from src.entity.forest_engine import CompiledForest
+from src.exception import CustomException
+from src.logger import logging
+from src.utils.common import MAPPED_ARRAYS_MAGIC, load_mapped_arrays, save_mapped_arrays
+
+MODEL_ARTIFACT_FORMAT = "vehicle-insurance-model/1"
+
+
+def is_model_artifact(file_path: str) -> bool:
+    """
+    Tells a model artifact from a dill/pickle file by its leading magic bytes.
+    """
+    with open(file_path, "rb") as file_obj:
+        return file_obj.read(len(MAPPED_ARRAYS_MAGIC)) == MAPPED_ARRAYS_MAGIC
+
+
+def save_model_artifact(file_path: str, model: MyModel, metadata: dict = None) -> dict:
+    """
+    Writes a MyModel as a model artifact: the forest node arrays and preprocessor
+    scaling arrays, uncompressed and 64-byte aligned, behind a small JSON manifest.
+    Nothing in the file is pickled, so loading is a memory map (load_model_artifact).
+    :param file_path: Path of the artifact, conventionally ending in MODEL_ARTIFACT_SUFFIX
+    :param model: Model to write; its sklearn forest and ColumnTransformer are compiled
+    :param metadata: Extra manifest entries, e.g. the model version or source file
+    :return: The manifest
+    """
+    try:
+        compiled_forest = model.trained_model_object
+        if not isinstance(compiled_forest, CompiledForest):
+            compiled_forest = CompiledForest.from_sklearn(compiled_forest)
+        compiled_preprocessor = model.get_compiled_preprocessor()
+        arrays = {f"forest.{name}": array for name, array in compiled_forest.to_arrays().items()}
+        arrays.update({f"preprocessor.{name}": array for name, array in compiled_preprocessor.to_arrays().items()})
+        manifest = {
+            "format": MODEL_ARTIFACT_FORMAT,
+            "model": str(model),
+            "feature_names": compiled_preprocessor.feature_names,
+            "classes": compiled_forest.classes.tolist(),
+            "n_trees": compiled_forest.n_trees,
+            "n_nodes": int(len(compiled_forest.feature)),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        manifest.update(metadata or {})
+        save_mapped_arrays(file_path, arrays, manifest)
+        return manifest
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def load_model_artifact(file_path: str) -> MyModel:
+    """
+    Maps a model artifact read-only; no forest or preprocessor is unpickled. The model
+    scores DataFrames and feature matrices with the compiled preprocessor and forest,
+    with predictions identical to the sklearn model it was written from.
+    """
+    try:
+        arrays, manifest = load_mapped_arrays(file_path)
+        forest_arrays = {name[len("forest."):]: array
+                         for name, array in arrays.items() if name.startswith("forest.")}
+        preprocessor_arrays = {name[len("preprocessor."):]: array
+                               for name, array in arrays.items() if name.startswith("preprocessor.")}
+        feature_names = manifest.get("feature_names", list(PREDICTION_FEATURE_COLUMNS))
+        return MyModel.from_compiled(
+            preprocessing_object=None,
+            compiled_forest=CompiledForest.from_arrays(forest_arrays),
+            compiled_preprocessor=CompiledPreprocessor.from_arrays(preprocessor_arrays, feature_names),
+        )
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def read_model_artifact_manifest(file_path: str) -> dict:
+    """
+    Returns the manifest of a model artifact without touching its arrays.
+    """
+    try:
+        return load_mapped_arrays(file_path)[1]
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+class SharedModelStore:
+    """
+    Memory-mapped store of the production model, shared by all worker processes.
+
+    Every model version is written once as a model artifact under store_dir
+    and mapped read-only by every worker. The node arrays then live once in
+    the page cache (or in POSIX shared memory when store_dir is on /dev/shm)
+    instead of once per process, so memory no longer grows with the number of
+    uvicorn workers.
+    """
+
+    def __init__(self, store_dir: str):
+        """
+        :param store_dir: Directory of the packed model files, shared by the workers of a node
+        """
+        self.store_dir = store_dir
+
+    def get_model_path(self, model_version: str) -> str:
+        return os.path.join(self.store_dir, f"{model_version}{MODEL_ARTIFACT_SUFFIX}")
+
+    def has_model(self, model_version: str) -> bool:
+        return os.path.exists(self.get_model_path(model_version))
+
+    def save_model(self, model: MyModel, model_version: str) -> str:
+        """
+        Packs a loaded MyModel under model_version. Workers racing on the same version
+        write identical files; the last rename wins. Files of other versions are kept:
+        versions have no order, so only a caller that knows model_version is the published
+        one may remove them (remove_other_versions), not a worker that fell behind.
+        :return: Path of the packed file
+        """
+        try:
+            model_path = self.get_model_path(model_version)
+            save_model_artifact(model_path, model, {"model_version": model_version})
+            logging.info(f"Packed model version {model_version} into {model_path} "
+                         f"({os.path.getsize(model_path) / 1024 / 1024:.1f} MB)")
+            return model_path
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def load_model(self, model_version: str) -> MyModel:
+        """
+        Maps the packed model of model_version read-only; no forest is unpickled.
+        """
+        return load_model_artifact(self.get_model_path(model_version))
+
+    def remove_other_versions(self, model_version: str) -> None:
+        """
+        Deletes packed files of other versions. Workers still mapping one keep
+        their mapping valid; the space is freed once the last one unmaps it.
+        """
+        for model_path in glob.glob(os.path.join(self.store_dir, f"*{MODEL_ARTIFACT_SUFFIX}")):
+            if model_path != self.get_model_path(model_version):
+                try:
+                    os.remove(model_path)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,112 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from src.entity.config_entity import PredictionCacheConfig
+from src.logger import logging
+
+# Approximate bookkeeping cost of one OrderedDict entry beyond its key and value
+_ENTRY_OVERHEAD_BYTES = 100
+
+
+class PredictionCache:
+    """
+    Bounded LRU memo of predictions.
+
+    Keys are the model version plus the canonicalized feature tuple of a row,
+    so an entry can never be served for a different model. The cache is
+    bounded both by entry count and by an estimate of its memory footprint,
+    evicting least recently used entries first, and is cleared whenever the
+    model holder loads a new model. Once a model is loaded, puts for any
+    other version (a scorer still running on the previous snapshot) are
+    dropped: such entries could never be hit and would only hold memory.
+    """
+
+    def __init__(self, prediction_cache_config: PredictionCacheConfig = PredictionCacheConfig()):
+        """
+        :param prediction_cache_config: Entry and memory bounds of the cache
+        """
+        self.prediction_cache_config = prediction_cache_config
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Version of the model holder's current model; None accepts every version
+        self.model_version: Optional[str] = None
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @staticmethod
+    def make_key(model_version: str, features: Tuple[float, ...]) -> Hashable:
+        """
+        Canonical key of one row: floats, with -0.0 folded into 0.0, so 1 and 1.0 share an entry
+        """
+        return (model_version, tuple(float(value) + 0.0 for value in features))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._estimate_size(key, value)
+        with self._lock:
+            if self.model_version is not None and key[0] != self.model_version:
+                self.stale_puts += 1
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self._entries and (len(self._entries) > self.prediction_cache_config.max_entries
+                                     or self.current_bytes > self.prediction_cache_config.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, model: Any = None, model_version: Optional[str] = None) -> None:
+        """
+        Drops every entry; registered as a model holder load listener.
+        :param model_version: Version of the newly loaded model; only its predictions are cached from now on
+        """
+        with self._lock:
+            self.model_version = model_version
+            self._entries.clear()
+            self.current_bytes = 0
+            self.invalidations += 1
+        logging.info("Prediction cache invalidated")
+
+    @staticmethod
+    def _estimate_size(key: Hashable, value: Any) -> int:
+        model_version, features = key
+        return (sys.getsizeof(key) + sys.getsizeof(model_version) + sys.getsizeof(features)
+                + sum(sys.getsizeof(feature) for feature in features)
+                + sys.getsizeof(value) + _ENTRY_OVERHEAD_BYTES)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_puts": self.stale_puts,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "max_entries": self.prediction_cache_config.max_entries,
+                "max_bytes": self.prediction_cache_config.max_bytes,
+            }
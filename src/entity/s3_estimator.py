@@ -1,23 +1,35 @@
 from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import CustomException
 from src.entity.estimator import MyModel
+from src.entity.model_store import MODEL_ARTIFACT_SUFFIX, load_model_artifact
+from src.logger import logging
+from src.utils.common import load_object
+from src.utils.metrics import MODEL_CACHE_LOOKUPS
+import glob
+import os
 import sys
+import threading
 from pandas import DataFrame
 
+# Downloads retried when the object changes while it is being downloaded
+MODEL_CACHE_DOWNLOAD_ATTEMPTS = 3
+
 
 class Proj1Estimator:
     """
     This class is used to save and retrieve our model from s3 bucket and to do prediction
     """
 
-    def __init__(self,bucket_name,model_path,):
+    def __init__(self,bucket_name,model_path,cache_dir:str=None):
         """
         :param bucket_name: Name of your model bucket
         :param model_path: Location of your model in bucket
+        :param cache_dir: Local model cache keyed by bucket, key and ETag; None downloads on every load
         """
         self.bucket_name = bucket_name
         self.s3 = SimpleStorageService()
         self.model_path = model_path
+        self.cache_dir = cache_dir
         self.loaded_model:MyModel=None
 
 
@@ -33,21 +45,130 @@ class Proj1Estimator:
         Load the model from the model_path
         :return:
         """
+        return self.load_model_and_version()[0]
+
+    def load_model_and_version(self,)->tuple:
+        """
+        Loads the model from the model_path together with the ETag of exactly the content
+        that was loaded: the ETag of the GET, or of the cache file the model was read from.
+        :return: (MyModel, model version)
+        """
+        try:
+            if self.cache_dir:
+                return self._load_cached_model_and_version()
+            if self.model_path.endswith(MODEL_ARTIFACT_SUFFIX):
+                raise ValueError(f"Loading the model artifact {self.model_path} requires a cache_dir (set MODEL_CACHE_DIR)")
+            return self.s3.load_model_and_version(self.model_path,bucket_name=self.bucket_name)
+        except Exception as e:
+            raise CustomException(e, sys) from e
 
-        return self.s3.load_model(self.model_path,bucket_name=self.bucket_name)
+    def get_cached_model_path(self,e_tag:str)->str:
+        return os.path.join(self.cache_dir, self.bucket_name, self.model_path,
+                            e_tag + os.path.splitext(self.model_path)[1])
 
-    def save_model(self,from_file,remove:bool=False)->None:
+    def load_cached_model(self)->MyModel:
+        """
+        Loads the model through the local cache: a HEAD request reads the current ETag
+        and the model is only downloaded when no file of that ETag is cached yet.
+        Model artifacts are memory-mapped from the cached file, pickles unpickled from it.
+        """
+        try:
+            return self._load_cached_model_and_version()[0]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _load_cached_model_and_version(self)->tuple:
+        """
+        :return: (MyModel, ETag of the cache file it was read from)
+        """
+        e_tag = self.s3.get_object_metadata(self.model_path, bucket_name=self.bucket_name)["e_tag"]
+        cached_path = self.get_cached_model_path(e_tag)
+        if os.path.exists(cached_path):
+            try:
+                model = self._load_model_file(cached_path)
+                MODEL_CACHE_LOOKUPS.labels(result="hit").inc()
+                logging.info(f"Production model {e_tag} loaded from the local cache {cached_path}")
+                return model, e_tag
+            except Exception as e:
+                logging.warning(f"Discarding unreadable cached model {cached_path}: {e}")
+                os.remove(cached_path)
+
+        cached_path, e_tag = self._download_to_cache()
+        MODEL_CACHE_LOOKUPS.labels(result="download").inc()
+        return self._load_model_file(cached_path), e_tag
+
+    def _download_to_cache(self)->tuple:
+        """
+        Downloads the model into the cache file of its current ETag. Every process downloads to its own
+        temporary file, which is only renamed into place once a second HEAD request shows the
+        object still has that ETag, so a cache file always holds the content its name claims.
+        :return: (path of the cache file, its ETag)
+        """
+        for _ in range(MODEL_CACHE_DOWNLOAD_ATTEMPTS):
+            # Fresh size and ETag for the transfer, which sends no HEAD request of its own
+            metadata = self.s3.get_object_metadata(self.model_path, bucket_name=self.bucket_name, use_cache=False)
+            e_tag = metadata["e_tag"]
+            cached_path = self.get_cached_model_path(e_tag)
+            temp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.download"
+            self.s3.download_file(self.model_path, bucket_name=self.bucket_name, to_filename=temp_path,
+                                  metadata=metadata)
+            current_e_tag = self.s3.get_object_metadata(self.model_path, bucket_name=self.bucket_name,
+                                                        use_cache=False)["e_tag"]
+            if current_e_tag == e_tag:
+                os.replace(temp_path, cached_path)
+                logging.info(f"Production model {e_tag} downloaded into the local cache {cached_path}")
+                self._remove_other_cached_versions(e_tag)
+                return cached_path, e_tag
+            os.remove(temp_path)
+            logging.info(f"Model {self.model_path} changed from {e_tag} to {current_e_tag} during the download")
+        raise RuntimeError(f"Model {self.model_path} kept changing during {MODEL_CACHE_DOWNLOAD_ATTEMPTS} downloads")
+
+    def _remove_other_cached_versions(self,e_tag:str)->None:
+        """
+        Deletes the cache files of other ETags of the model. Processes still using one
+        keep their open file or mapping; the space is freed once they release it.
+        """
+        current_path = self.get_cached_model_path(e_tag)
+        suffix = os.path.splitext(self.model_path)[1]
+        for cached_path in glob.glob(os.path.join(os.path.dirname(current_path), f"*{suffix}")):
+            if cached_path != current_path:
+                try:
+                    os.remove(cached_path)
+                except FileNotFoundError:
+                    pass
+
+    def _load_model_file(self,file_path:str)->MyModel:
+        if self.model_path.endswith(MODEL_ARTIFACT_SUFFIX):
+            return load_model_artifact(file_path)
+        return load_object(file_path)
+
+    def get_model_version(self,use_cache:bool=True)->str:
+        """
+        Returns the ETag of the model object in the bucket, used as the model identity
+        :param use_cache: If False, asks S3 instead of the metadata cache
+        """
+        try:
+            return self.s3.get_object_metadata(self.model_path, bucket_name=self.bucket_name,
+                                               use_cache=use_cache)["e_tag"]
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save_model(self,from_file,remove:bool=False,compression:str=None,compression_level:int=None)->None:
         """
         Save the model to the model_path
         :param from_file: Your local system model path
         :param remove: By default it is false that mean you will have your model locally available in your system folder
+        :param compression: Codec to upload the model compressed with, see SimpleStorageService.upload_file
+        :param compression_level: Codec compression level, None for the codec's default
         :return:
         """
         try:
             self.s3.upload_file(from_file,
                                 to_filename=self.model_path,
                                 bucket_name=self.bucket_name,
-                                remove=remove
+                                remove=remove,
+                                compression=compression,
+                                compression_level=compression_level
                                 )
         except Exception as e:
             raise CustomException(e, sys)
@@ -62,5 +183,17 @@ class Proj1Estimator:
             if self.loaded_model is None:
                 self.loaded_model = self.load_model()
             return self.loaded_model.predict(dataframe=dataframe)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_proba(self,dataframe:DataFrame):
+        """
+        :param dataframe:
+        :return: class probabilities, one column per entry of the model's classes_
+        """
+        try:
+            if self.loaded_model is None:
+                self.loaded_model = self.load_model()
+            return self.loaded_model.predict_proba(dataframe=dataframe)
         except Exception as e:
             raise CustomException(e, sys)
\ No newline at end of file
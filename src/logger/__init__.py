@@ -1,28 +1,210 @@
+import atexit
+import collections
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from from_root import from_root
 from datetime import datetime
 
+from src.utils.metrics import LOG_RECORDS_DROPPED
+
 # Constants for log configuration
 LOG_DIR = 'logs'
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3  # Number of backup log files to keep
 
+# "sync" writes records on the logging thread, "queue" hands them to a background listener
+LOG_MODE = os.getenv("LOG_MODE", "sync").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_QUEUE_FLUSH_INTERVAL_MS = float(os.getenv("LOG_QUEUE_FLUSH_INTERVAL_MS", 50))
+# Longest wait at exit for the listener to make room for its stop marker in a full queue
+LOG_QUEUE_STOP_TIMEOUT_SECONDS = float(os.getenv("LOG_QUEUE_STOP_TIMEOUT_SECONDS", 5))
+# Per-module minimum levels, e.g. "src.entity.estimator=WARNING,src.cloud_storage=INFO"
+LOG_MODULE_LEVELS = os.getenv("LOG_MODULE_LEVELS", "")
+# Records below WARNING kept per call site and second; 0 keeps everything
+LOG_RATE_LIMIT_PER_SECOND = int(os.getenv("LOG_RATE_LIMIT_PER_SECOND", 0))
+
 # Construct log file path
 log_dir_path = os.path.join(from_root(), LOG_DIR)
 os.makedirs(log_dir_path, exist_ok=True)
 log_file_path = os.path.join(log_dir_path, LOG_FILE)
 
+
+class ModuleLevelFilter(logging.Filter):
+    """
+    Applies a minimum level per source module.
+
+    Most of the project logs through the root logger, so logger names cannot
+    tell modules apart; the module is derived from the record's
+    pathname (e.g. src.entity.estimator) and matched on the longest configured
+    dotted prefix.
+    """
+
+    def __init__(self, module_levels: dict):
+        """
+        :param module_levels: Dotted module prefix -> minimum level
+        """
+        super().__init__()
+        self.module_levels = module_levels
+        self._levels_by_path = {}
+        self._root = str(from_root())
+
+    @staticmethod
+    def parse(module_levels: str) -> dict:
+        levels = {}
+        for entry in filter(None, (item.strip() for item in module_levels.split(","))):
+            module, _, level = entry.partition("=")
+            levels[module.strip()] = logging.getLevelName(level.strip().upper())
+        return levels
+
+    def _get_level(self, pathname: str) -> int:
+        level = self._levels_by_path.get(pathname)
+        if level is None:
+            module = os.path.splitext(os.path.relpath(pathname, self._root))[0].replace(os.sep, ".")
+            matches = [prefix for prefix in self.module_levels
+                       if module == prefix or module.startswith(prefix + ".")]
+            level = self.module_levels[max(matches, key=len)] if matches else logging.NOTSET
+            self._levels_by_path[pathname] = level
+        return level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self._get_level(record.pathname)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Keeps at most max_per_second records below WARNING per call site (file and line).
+    Warnings and errors always pass; dropped records are counted in
+    vehicle_log_records_dropped_total{reason="rate_limited"}.
+
+    One instance may be attached to several handlers: the decision is stored on
+    the record, so a record reaching the file and the console handler is
+    counted once.
+    """
+
+    def __init__(self, max_per_second: int):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self._windows = {}
+        self._lock = threading.Lock()
+        self.dropped = LOG_RECORDS_DROPPED.labels(reason="rate_limited")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        passed = getattr(record, "rate_limit_passed", None)
+        if passed is None:
+            passed = record.rate_limit_passed = self._count(record)
+        return passed
+
+    def _count(self, record: logging.LogRecord) -> bool:
+        call_site = (record.pathname, record.lineno)
+        second = int(time.monotonic())
+        with self._lock:
+            window = self._windows.get(call_site)
+            if window is None or window[0] != second:
+                self._windows[call_site] = [second, 1]
+                return True
+            window[1] += 1
+            if window[1] <= self.max_per_second:
+                return True
+        self.dropped.inc()
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that defers formatting to the listener and drops records
+    instead of blocking or erroring when the queue is full. Dropped records are
+    counted in vehicle_log_records_dropped_total{reason="queue_full"}.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = LOG_RECORDS_DROPPED.labels(reason="queue_full")
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments, which may be mutated once the call returns; the
+        # Formatter work (timestamps, exception text) is left to the listener
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped.inc()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains the queue every flush_interval seconds instead of
+    blocking on it. A blocked listener is woken by every enqueued record and
+    then competes with the request thread for the GIL (and, on small machines,
+    the CPU) in the middle of the request; polling keeps enqueueing a plain
+    append and moves the formatting and writes to the idle time between batches.
+    """
+
+    def __init__(self, record_queue: queue.Queue, *handlers, flush_interval: float, respect_handler_level: bool,
+                 stop_timeout: float = LOG_QUEUE_STOP_TIMEOUT_SECONDS):
+        super().__init__(record_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+        self.stop_timeout = stop_timeout
+        self._pending = collections.deque()
+
+    def enqueue_sentinel(self) -> None:
+        # The queue is bounded: put_nowait of the base class raises queue.Full when it is
+        # full, so wait for the listener to drain a batch and make room
+        self.queue.put(self._sentinel, timeout=self.stop_timeout)
+
+    def stop(self) -> None:
+        """
+        Writes the queued records and stops the listener thread. Safe to call more than once;
+        if the stop marker cannot be queued within stop_timeout the thread is left running
+        (it is a daemon thread) instead of raising at interpreter exit.
+        """
+        if self._thread is None:
+            return
+        try:
+            self.enqueue_sentinel()
+        except queue.Full:
+            return
+        self._thread.join()
+        self._thread = None
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while not self._pending:
+            time.sleep(self.flush_interval)
+            try:
+                while True:
+                    self._pending.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+        return self._pending.popleft()
+
+
+# Background listener of the queue mode; None in sync mode
+log_listener = None
+
+
 def configure_logger():
     """
     Configures logging with a rotating file handler and a console handler.
+    In queue mode request threads only enqueue records; a background listener
+    formats them and writes the file and console output.
     """
+    global log_listener
+
     # Create a custom logger
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
-    
+
     # Define formatter
     formatter = logging.Formatter("[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s")
 
@@ -30,16 +212,41 @@ def configure_logger():
     file_handler = RotatingFileHandler(log_file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT)
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
-    
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
-    
-    # Add handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+
+    # Filters go on the handlers: filters of the root logger are skipped for records
+    # propagated from named loggers. They run on the calling thread, before anything
+    # is formatted or queued
+    filters = []
+    module_levels = ModuleLevelFilter.parse(LOG_MODULE_LEVELS)
+    if module_levels:
+        filters.append(ModuleLevelFilter(module_levels))
+    if LOG_RATE_LIMIT_PER_SECOND > 0:
+        filters.append(RateLimitFilter(LOG_RATE_LIMIT_PER_SECOND))
+
+    if LOG_MODE == "queue":
+        queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        for log_filter in filters:
+            queue_handler.addFilter(log_filter)
+        log_listener = BatchingQueueListener(queue_handler.queue, file_handler, console_handler,
+                                             flush_interval=LOG_QUEUE_FLUSH_INTERVAL_MS / 1e3,
+                                             respect_handler_level=True)
+        log_listener.start()
+        # Flush the queued records on interpreter exit
+        atexit.register(log_listener.stop)
+        logger.addHandler(queue_handler)
+    else:
+        # Add handlers to the logger
+        for log_filter in filters:
+            file_handler.addFilter(log_filter)
+            console_handler.addFilter(log_filter)
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
 
 # Configure the logger
 configure_logger()
-logger = logging.getLogger()
\ No newline at end of file
+logger = logging.getLogger()
@@ -0,0 +1,125 @@
+import sys
+import time
+from typing import IO, Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_transformation import DataTransformation
+from src.constants import BULK_PREDICTION_CHUNK_SIZE, PREDICTION_FEATURE_COLUMNS
+from src.exception import CustomException
+from src.logger import logging
+from src.pipline.prediction_pipeline import VehicleDataClassifier, VehicleDataSchema, VehicleDataValidationError
+from src.utils.metrics import PREDICTION_BATCH_SIZE
+
+BULK_FILE_FORMATS = ("csv", "ndjson")
+# Columns of raw rows: the categorical columns build_model_features encodes replace the dummy features
+RAW_FEATURE_COLUMNS = tuple(column for column in PREDICTION_FEATURE_COLUMNS
+                            if not column.startswith(("Vehicle_Age_", "Vehicle_Damage_"))) + \
+                      ("Vehicle_Age", "Vehicle_Damage")
+
+
+class BulkPredictor:
+    """
+    Scores large customer files chunk by chunk.
+
+    Input is read in fixed-size chunks, each chunk goes through the feature
+    engineering of DataTransformation and one vectorized scoring pass, so
+    memory stays bounded by the chunk size whatever the size of the file.
+    """
+
+    def __init__(self, model_predictor: VehicleDataClassifier, chunk_size: int = BULK_PREDICTION_CHUNK_SIZE,
+                 schema: VehicleDataSchema = None):
+        """
+        :param model_predictor: Classifier used to score every chunk
+        :param chunk_size: Number of rows read and scored at a time
+        :param schema: Feature ranges every row must be within; None only requires finite features
+        """
+        self.model_predictor = model_predictor
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.chunks = 0
+        self.started_at = time.perf_counter()
+
+    @staticmethod
+    def get_file_format(filename: str, content_type: str = None) -> str:
+        """
+        Infers csv or ndjson from the file extension or content type.
+        """
+        filename = (filename or "").lower()
+        content_type = (content_type or "").lower()
+        if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+            return "ndjson"
+        if filename.endswith(".csv") or "csv" in content_type:
+            return "csv"
+        raise ValueError("Upload a .csv or .ndjson file")
+
+    def read_chunks(self, file_obj: IO, file_format: str) -> Iterator[pd.DataFrame]:
+        """
+        Yields the file as DataFrames of at most chunk_size rows; the index keeps the row number.
+        """
+        if file_format == "csv":
+            return iter(pd.read_csv(file_obj, chunksize=self.chunk_size, na_values="na"))
+        if file_format == "ndjson":
+            return iter(pd.read_json(file_obj, lines=True, chunksize=self.chunk_size))
+        raise ValueError(f"Unsupported file format '{file_format}', expected one of {BULK_FILE_FORMATS}")
+
+    @staticmethod
+    def check_columns(chunk: pd.DataFrame) -> None:
+        """
+        Raises VehicleDataValidationError naming the missing columns unless the chunk holds
+        either every engineered feature or every raw column.
+        """
+        if all(column in chunk.columns for column in PREDICTION_FEATURE_COLUMNS):
+            return
+        missing = [column for column in RAW_FEATURE_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise VehicleDataValidationError({column: "column required" for column in missing})
+
+    def score_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Engineers the features of a raw chunk and scores it in one pass.
+        Returns: row number, id (when the input has one), score, prediction and status per row;
+        raises VehicleDataValidationError keyed "row <number>.<field>" for invalid features
+        """
+        try:
+            self.check_columns(chunk)
+            features = DataTransformation.build_model_features(chunk)
+            if self.schema is not None:
+                errors = self.schema.check_columns(
+                    {column: features[column].to_numpy(dtype="float64") for column in PREDICTION_FEATURE_COLUMNS},
+                    [f"row {row}" for row in chunk.index])
+                if errors:
+                    raise VehicleDataValidationError(errors)
+            elif not np.isfinite(features.to_numpy(dtype="float64")).all():
+                raise ValueError("Every feature must be a finite number")
+            features = features.astype(PREDICTION_FEATURE_COLUMNS)
+
+            PREDICTION_BATCH_SIZE.labels(source="bulk").observe(len(features))
+            result = self.model_predictor.score(features)
+            scored = pd.DataFrame({"row": chunk.index}, index=chunk.index)
+            if "id" in chunk.columns:
+                scored["id"] = chunk["id"]
+            scored["score"] = result.scores
+            scored["prediction"] = result.predictions
+            scored["status"] = np.where(result.predictions == 1, "Response-Yes", "Response-No")
+
+            self.rows += len(chunk)
+            self.chunks += 1
+            return scored
+        except VehicleDataValidationError:
+            raise
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def get_summary(self) -> dict:
+        seconds = time.perf_counter() - self.started_at
+        summary = {
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(self.rows / seconds, 1) if seconds > 0 else 0.0,
+        }
+        logging.info(f"Bulk prediction summary: {summary}")
+        return summary
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Optional
+
+from src.entity.model_holder import ModelHolder
+from src.logger import logging
+from src.utils.executor import ServingExecutor
+from src.utils.metrics import MODEL_REFRESH_CHECKS
+
+
+class ModelRefresher:
+    """
+    Background hot swap of the production model.
+
+    Every interval_seconds the version marker of the served model (the registry
+    pointer or the ETag of the model key) is read on the I/O pool. When it
+    changed, ModelHolder.refresh downloads and warms up the new model on that
+    pool as well and swaps it in; requests keep scoring with the previous model
+    meanwhile, so a new model is picked up without restarting the process.
+    A failed check or load is logged and retried on the next poll.
+    """
+
+    def __init__(self, model_holder: ModelHolder, serving_executor: ServingExecutor, interval_seconds: float):
+        """
+        :param model_holder: Holder of the served model
+        :param serving_executor: Executor whose I/O pool runs the checks and loads
+        :param interval_seconds: Seconds between two checks, 0 disables the refresher
+        """
+        self.model_holder = model_holder
+        self.serving_executor = serving_executor
+        self.interval_seconds = interval_seconds
+        self._poller: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.interval_seconds <= 0:
+            logging.info("Model refresher disabled")
+            return
+        self._poller = asyncio.create_task(self._poll())
+        logging.info(f"Model refresher started, checking the model version every {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.check()
+
+    async def check(self) -> bool:
+        """
+        Checks the version marker once and swaps in a changed model.
+        :return: True if a new model version was swapped in
+        """
+        try:
+            swapped = await self.serving_executor.run_io(self.model_holder.refresh)
+        except Exception as e:
+            MODEL_REFRESH_CHECKS.labels(result="failed").inc()
+            logging.warning(f"Model refresh failed, still serving version {self.model_holder.model_version}: {e}")
+            return False
+        MODEL_REFRESH_CHECKS.labels(result="swapped" if swapped else "unchanged").inc()
+        return swapped
@@ -0,0 +1,169 @@
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+from src.entity.config_entity import PredictionBatcherConfig
+from src.logger import logging
+from src.pipline.prediction_pipeline import VehicleData
+from src.utils.executor import ExecutorOverloadedError, ServingExecutor
+from src.utils.metrics import PREDICTION_BATCH_SIZE
+
+_BATCH_SIZE_HISTOGRAM = PREDICTION_BATCH_SIZE.labels(source="batcher")
+
+
+class PredictionBatcher:
+    """
+    Dynamic micro-batcher for single-row predictions.
+
+    Concurrent requests are gathered for at most max_wait_ms or until
+    max_batch_size rows are queued, scored with one vectorized predict call on
+    the inference pool and the results are fanned back out to the callers.
+    At most one batch per inference worker is in flight; while all workers are
+    busy new requests keep queueing, so batches grow with load. The wait window
+    is only applied while traffic is concurrent (the previous batch had more
+    than one row), so a lone request is never delayed.
+    """
+
+    def __init__(self, predict_func: Callable, serving_executor: ServingExecutor,
+                 batcher_config: PredictionBatcherConfig = PredictionBatcherConfig()):
+        """
+        :param predict_func: Vectorized predict over a list of VehicleData, e.g. VehicleDataClassifier.predict_vehicle_data
+        :param serving_executor: Executor whose inference pool runs the batches
+        :param batcher_config: Maximum batch size and wait window
+        """
+        self.predict_func = predict_func
+        self.serving_executor = serving_executor
+        self.batcher_config = batcher_config
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._in_flight = set()
+        self._last_batch_size = 0
+        self.batches = 0
+        self.rows = 0
+        self.max_observed_batch_size = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.serving_executor.serving_config.inference_workers)
+        self._collector = asyncio.create_task(self._collect())
+        logging.info(f"Prediction batcher started with {self.batcher_config}")
+
+    async def stop(self) -> None:
+        """
+        Stops batching, fails the rows still queued and waits for the batches being scored,
+        so the executor is not shut down under them.
+        """
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def predict(self, vehicle_data: VehicleData):
+        """
+        Queues one row and waits for its prediction.
+        """
+        if self._collector is None:
+            raise RuntimeError("Prediction batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((vehicle_data, future))
+        return await future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        max_batch_size = self.batcher_config.max_batch_size
+        max_wait = self.batcher_config.max_wait_ms / 1000
+
+        while True:
+            batch = [await self._queue.get()]
+            await self._slots.acquire()
+            deadline = loop.time() + (max_wait if self._last_batch_size > 1 else 0)
+
+            while len(batch) < max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            self._last_batch_size = len(batch)
+            self.batches += 1
+            self.rows += len(batch)
+            self.max_observed_batch_size = max(self.max_observed_batch_size, len(batch))
+            _BATCH_SIZE_HISTOGRAM.observe(len(batch))
+            task = asyncio.create_task(self._score(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _score(self, batch: List[Tuple[VehicleData, asyncio.Future]]) -> None:
+        try:
+            try:
+                values = await self._predict([vehicle_data for vehicle_data, _ in batch])
+            except ExecutorOverloadedError as e:
+                # Retrying row by row would only send more tasks to the full pool
+                self._fail(batch, e)
+                return
+            except Exception as e:
+                if len(batch) == 1:
+                    self._set_exception(batch[0][1], e)
+                    return
+                # Score rows one by one so a single bad row cannot fail the whole batch
+                logging.warning(f"Batch of {len(batch)} rows failed, retrying row by row: {e}")
+                for position, (vehicle_data, future) in enumerate(batch):
+                    try:
+                        self._set_result(future, (await self._predict([vehicle_data]))[0])
+                    except ExecutorOverloadedError as row_error:
+                        self._fail(batch[position:], row_error)
+                        return
+                    except Exception as row_error:
+                        self._set_exception(future, row_error)
+                return
+
+            for (_, future), value in zip(batch, values):
+                self._set_result(future, value)
+        finally:
+            self._slots.release()
+
+    async def _predict(self, vehicle_data_list: List[VehicleData]):
+        return await self.serving_executor.run_inference(self.predict_func, vehicle_data_list)
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, value) -> None:
+        if not future.done():
+            future.set_result(value)
+
+    @staticmethod
+    def _set_exception(future: asyncio.Future, error: Exception) -> None:
+        if not future.done():
+            future.set_exception(error)
+
+    def _fail(self, batch: List[Tuple[VehicleData, asyncio.Future]], error: Exception) -> None:
+        for _, future in batch:
+            self._set_exception(future, error)
+
+    def get_stats(self) -> dict:
+        """
+        Returns batch counts, queue depth and the observed batch sizes.
+        """
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_observed_batch_size": self.max_observed_batch_size,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.batcher_config.max_batch_size,
+            "max_wait_ms": self.batcher_config.max_wait_ms,
+        }
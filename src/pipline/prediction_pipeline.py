@@ -1,10 +1,22 @@
 import sys
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.constants import (PREDICTION_BATCH_MAX_RECORDS, PREDICTION_DEFAULT_THRESHOLD, PREDICTION_FEATURE_COLUMNS,
+                           PREDICTION_POSITIVE_CLASS, SCHEMA_FILE_PATH)
 from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.model_holder import ModelHolder
+from src.entity.prediction_cache import PredictionCache
 from src.entity.s3_estimator import Proj1Estimator
 from src.exception import CustomException
 from src.logger import logging
+from src.utils.common import read_yaml
+from src.utils.metrics import PREDICTION_STAGE_DURATION
 from pandas import DataFrame
 
+_DATAFRAME_BUILD_TIMER = PREDICTION_STAGE_DURATION.labels(stage="dataframe_build")
+_FEATURE_VECTOR_BUILD_TIMER = PREDICTION_STAGE_DURATION.labels(stage="feature_vector_build")
+
 
 class VehicleData:
     def __init__(self,
@@ -46,8 +58,9 @@ class VehicleData:
         """
         try:
             
-            vehicle_input_dict = self.get_vehicle_data_as_dict()
-            return DataFrame(vehicle_input_dict)
+            with _DATAFRAME_BUILD_TIMER.time():
+                vehicle_input_dict = self.get_vehicle_data_as_dict()
+                return DataFrame(vehicle_input_dict)
         
         except Exception as e:
             raise CustomException(e, sys) from e
@@ -81,13 +94,202 @@ class VehicleData:
         except Exception as e:
             raise CustomException(e, sys) from e
 
+    def get_vehicle_feature_vector(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        This function returns the features as a float64 row vector of shape (1, n_features)
+        in training column order, without building a dict or DataFrame.
+        out: optional preallocated (1, n_features) array to fill in place
+        """
+        try:
+            if out is None:
+                out = np.empty((1, len(PREDICTION_FEATURE_COLUMNS)), dtype="float64")
+            row = out[0]
+            for position, column in enumerate(PREDICTION_FEATURE_COLUMNS):
+                row[position] = float(getattr(self, column))
+            return out
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+class VehicleDataValidationError(ValueError):
+    """
+    Raised when a prediction record does not match the schema; errors maps each field to its problem.
+    """
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__("; ".join(f"{field}: {error}" for field, error in errors.items()))
+        self.errors = errors
+
+
+class VehicleDataSchema:
+    """
+    Validates prediction input against the model features and the
+    prediction_feature_ranges section of schema.yaml.
+
+    Every field is checked once (present, numeric, integral for integer
+    features, finite and within range). Single JSON records are turned
+    straight into a VehicleData; lists of records and engineered feature
+    chunks are checked column by column with the same rules and messages, so
+    every prediction entry point accepts and rejects the same values.
+    """
+
+    def __init__(self, feature_ranges: Dict[str, Tuple[float, float]]):
+        """
+        :param feature_ranges: Inclusive (min, max) of every model feature
+        """
+        missing = [column for column in PREDICTION_FEATURE_COLUMNS if column not in feature_ranges]
+        if missing:
+            raise ValueError(f"No prediction range configured for {missing}")
+        self.feature_ranges = {column: (float(low), float(high)) for column, (low, high) in feature_ranges.items()}
+        self._fields = [(column, dtype == "int64", self.feature_ranges[column])
+                        for column, dtype in PREDICTION_FEATURE_COLUMNS.items()]
+
+    @classmethod
+    def from_schema_file(cls, schema_file_path: str = SCHEMA_FILE_PATH) -> "VehicleDataSchema":
+        try:
+            schema_config = read_yaml(schema_file_path)
+            return cls(schema_config["prediction_feature_ranges"])
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _check_value(value, is_integer: bool, low: float, high: float) -> Optional[str]:
+        """
+        Returns the problem of one decoded JSON value, None when it is valid.
+        """
+        if value is None:
+            return "field required"
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return "must be a number"
+        if value != value or value in (float("inf"), float("-inf")):
+            return "must be finite"
+        if is_integer and value != int(value):
+            return "must be an integer"
+        if not low <= value <= high:
+            return f"must be between {low:.15g} and {high:.15g}"
+        return None
+
+    def parse(self, record) -> VehicleData:
+        """
+        Returns the VehicleData of a decoded JSON record; raises VehicleDataValidationError
+        listing every invalid field.
+        """
+        if not isinstance(record, dict):
+            raise VehicleDataValidationError({"body": "expected a JSON object with the model features"})
+
+        errors, values = {}, {}
+        for column, is_integer, (low, high) in self._fields:
+            value = record.get(column)
+            error = self._check_value(value, is_integer, low, high)
+            if error is not None:
+                errors[column] = error
+            else:
+                values[column] = int(value) if is_integer else float(value)
+        for column in record.keys() - self.feature_ranges.keys():
+            errors[column] = "unexpected field"
+        if errors:
+            raise VehicleDataValidationError(errors)
+        return VehicleData(**values)
+
+    def parse_records(self, records) -> Dict[str, np.ndarray]:
+        """
+        Validates a list of decoded JSON records with the rules of parse.
+        Returns: one float64 array per model feature; raises VehicleDataValidationError
+        keyed "records[<position>].<field>", naming the first invalid record of every field
+        """
+        if not isinstance(records, list) or len(records) == 0:
+            raise VehicleDataValidationError({"records": "expected a non-empty list of records"})
+        if len(records) > PREDICTION_BATCH_MAX_RECORDS:
+            raise VehicleDataValidationError(
+                {"records": f"at most {PREDICTION_BATCH_MAX_RECORDS} records can be scored per batch"})
+        for position, record in enumerate(records):
+            if not isinstance(record, dict):
+                raise VehicleDataValidationError(
+                    {f"records[{position}]": "expected a JSON object with the model features"})
+
+        errors, columns = {}, {}
+        for column, is_integer, (low, high) in self._fields:
+            values = [record.get(column) for record in records]
+            # Exact types: JSON booleans, strings and nulls are rejected like in parse
+            if not {type(value) for value in values} <= {int, float}:
+                position = next(position for position, value in enumerate(values) if type(value) not in (int, float))
+                errors[f"records[{position}].{column}"] = self._check_value(values[position], is_integer, low, high)
+            else:
+                columns[column] = np.array(values, dtype="float64")
+        errors.update(self.check_columns(columns, [f"records[{position}]" for position in range(len(records))]))
+        for position, record in enumerate(records):
+            for column in record.keys() - self.feature_ranges.keys():
+                errors.setdefault(f"records[{position}].{column}", "unexpected field")
+        if errors:
+            raise VehicleDataValidationError(errors)
+        return columns
+
+    def check_columns(self, columns: Dict[str, np.ndarray], row_labels: Sequence[str]) -> Dict[str, str]:
+        """
+        Vectorized finiteness, integer and range checks of numeric feature columns; columns
+        that are not given are skipped.
+        :param row_labels: Label of every row, e.g. its record position or input row number
+        :return: errors keyed "<row label>.<field>", naming the first invalid row of every field
+        """
+        errors = {}
+        for column, is_integer, (low, high) in self._fields:
+            values = columns.get(column)
+            if values is None:
+                continue
+            values = np.asarray(values, dtype="float64")
+            with np.errstate(invalid="ignore"):
+                valid = np.isfinite(values) & (values >= low) & (values <= high)
+                if is_integer:
+                    valid &= values == np.round(values)
+            if not valid.all():
+                row = int(np.argmin(valid))
+                errors[f"{row_labels[row]}.{column}"] = self._check_value(float(values[row]), is_integer, low, high)
+        return errors
+
+
+class VehicleDataBatch:
+    def __init__(self, records: List[dict], schema: VehicleDataSchema):
+        """
+        Vehicle Data batch constructor
+        Input: list of records, each holding all features of the trained model.
+        The records are validated column by column with the rules of schema;
+        invalid input raises VehicleDataValidationError.
+        """
+        columns = schema.parse_records(records)
+        self.columns = {column: columns[column].astype(dtype) for column, dtype in PREDICTION_FEATURE_COLUMNS.items()}
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def get_vehicle_input_data_frame(self) -> DataFrame:
+        """
+        This function returns a DataFrame with one row per record, in training column order
+        """
+        try:
+            with _DATAFRAME_BUILD_TIMER.time():
+                return DataFrame(self.columns)
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+@dataclass
+class VehicleScoringResult:
+    scores: np.ndarray
+    predictions: np.ndarray
+    ranking: np.ndarray
+    threshold: float
+
 class VehicleDataClassifier:
-    def __init__(self,prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig(),) -> None:
+    def __init__(self,prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig(),
+                 model_holder: Optional[ModelHolder] = None,
+                 prediction_cache: Optional[PredictionCache] = None) -> None:
         """
         :param prediction_pipeline_config: Configuration for prediction the value
+        :param model_holder: Process-wide resident model; when given, no S3 fetch is done per prediction
+        :param prediction_cache: LRU memo of row predictions, used together with model_holder
         """
         try:
             self.prediction_pipeline_config = prediction_pipeline_config
+            self.model_holder = model_holder
+            self.prediction_cache = prediction_cache
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -98,13 +300,98 @@ class VehicleDataClassifier:
         """
         try:
             logging.info("Entered predict method of VehicleDataClassifier class")
+            if self.model_holder is not None:
+                return self.model_holder.predict(dataframe)
+
             model = Proj1Estimator(
                 bucket_name=self.prediction_pipeline_config.model_bucket_name,
                 model_path=self.prediction_pipeline_config.model_file_path,
+                cache_dir=self.prediction_pipeline_config.model_cache_dir,
             )
             result =  model.predict(dataframe)
             
             return result
         
         except Exception as e:
-                raise CustomException(e, sys)
\ No newline at end of file
+                raise CustomException(e, sys)
+
+    def predict_proba(self, dataframe) -> np.ndarray:
+        """
+        This is the method of VehicleDataClassifier
+        Returns: class probabilities, one column per entry of the model's classes_
+        """
+        try:
+            logging.info("Entered predict_proba method of VehicleDataClassifier class")
+            if self.model_holder is not None:
+                return self.model_holder.predict_proba(dataframe)
+
+            model = Proj1Estimator(
+                bucket_name=self.prediction_pipeline_config.model_bucket_name,
+                model_path=self.prediction_pipeline_config.model_file_path,
+                cache_dir=self.prediction_pipeline_config.model_cache_dir,
+            )
+            return model.predict_proba(dataframe)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def score(self, dataframe, threshold: float = PREDICTION_DEFAULT_THRESHOLD,
+              top_k: Optional[int] = None) -> VehicleScoringResult:
+        """
+        Scores a batch in a single vectorized pass.
+        Returns: the positive-class probability of every row, the class of every row at
+        the given threshold (positive when the score is above it) and the row indices
+        ranked by descending score, cut to top_k when given
+        """
+        try:
+            model = self._get_model()
+            proba = model.predict_proba(dataframe)
+            scores = proba[:, list(model.classes_).index(PREDICTION_POSITIVE_CLASS)]
+            predictions = (scores > threshold).astype(int)
+            ranking = np.argsort(-scores, kind="stable")
+            if top_k is not None:
+                ranking = ranking[:top_k]
+            return VehicleScoringResult(scores=scores, predictions=predictions, ranking=ranking, threshold=threshold)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _get_model(self):
+        if self.model_holder is not None:
+            return self.model_holder.get_model()
+        return Proj1Estimator(
+            bucket_name=self.prediction_pipeline_config.model_bucket_name,
+            model_path=self.prediction_pipeline_config.model_file_path,
+            cache_dir=self.prediction_pipeline_config.model_cache_dir,
+        ).load_model()
+
+    def predict_vehicle_data(self, vehicle_data_list: List[VehicleData]) -> np.ndarray:
+        """
+        Pandas-free prediction for VehicleData rows: the rows are written straight into
+        a preallocated feature matrix and scored through MyModel.predict_features.
+        With a prediction cache, rows seen before for the same model version are
+        answered from the cache and only the misses are scored.
+        Returns: one prediction per row, identical to predict on the equivalent DataFrame
+        """
+        try:
+            with _FEATURE_VECTOR_BUILD_TIMER.time():
+                features = np.empty((len(vehicle_data_list), len(PREDICTION_FEATURE_COLUMNS)), dtype="float64")
+                for position, vehicle_data in enumerate(vehicle_data_list):
+                    vehicle_data.get_vehicle_feature_vector(out=features[position:position + 1])
+
+            if self.model_holder is None or self.prediction_cache is None:
+                return self._get_model().predict_features(features)
+
+            # Model and version from one snapshot, so a hot swap cannot cache predictions under the wrong version
+            model, model_version = self.model_holder.get_snapshot()[:2]
+            keys = [PredictionCache.make_key(model_version, row) for row in features.tolist()]
+            predictions = [self.prediction_cache.get(key) for key in keys]
+            misses = [position for position, prediction in enumerate(predictions) if prediction is None]
+            if misses:
+                for position, prediction in zip(misses, model.predict_features(features[misses])):
+                    predictions[position] = prediction
+                    self.prediction_cache.put(keys[position], prediction)
+            return np.array(predictions)
+
+        except Exception as e:
+            raise CustomException(e, sys)
\ No newline at end of file
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from src.entity.config_entity import TrainingJobConfig
+from src.logger import logging
+from src.pipline.training_pipeline import TrainingPipeline
+from src.utils.metrics import TRAINING_STAGE_DURATION
+
+
+def _run_training_process(niceness: int) -> None:
+    """
+    Entry point of the training process (python -m src.pipline.training_jobs): runs the
+    pipeline and reports every stage event and the final outcome as JSON lines on stdout.
+    """
+    # stdout carries the events only; anything else written to it, print() of the
+    # pipeline or native libraries, goes to stderr with the log output
+    event_stream = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def send_event(*event) -> None:
+        event_stream.write(json.dumps(event) + "\n")
+        event_stream.flush()
+
+    if niceness and hasattr(os, "nice"):
+        # Leave the CPU to the serving threads whenever both compete for it
+        os.nice(niceness)
+    try:
+        training_pipeline = TrainingPipeline()
+        training_pipeline.add_stage_listener(
+            lambda stage, event, duration: send_event("stage", stage, event, duration)
+        )
+        model_pusher_artifact = training_pipeline.run_pipeline()
+        send_event("result", model_pusher_artifact is not None, None)
+    except Exception as e:
+        send_event("result", None, str(e))
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str = "running"
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    current_stage: Optional[str] = None
+    stage_durations: Dict[str, float] = field(default_factory=dict)
+    model_accepted: Optional[bool] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "current_stage": self.current_stage,
+            "stage_durations": dict(self.stage_durations),
+            "model_accepted": self.model_accepted,
+            "error": self.error,
+        }
+
+
+class TrainingJobManager:
+    """
+    Runs TrainingPipeline jobs in the background, one at a time.
+
+    Each job executes in its own low-priority process, so ingestion, resampling
+    and forest fitting never hold the GIL or the serving threads of the web
+    worker. The process is a fresh interpreter running this module: neither a
+    fork of the multi-threaded server nor a multiprocessing spawn, which would
+    re-import the server's main script (app.py and its services) in the child.
+    Submissions made while a job is running are coalesced into that job
+    (single flight). Stage progress is streamed back from the training process
+    over its stdout and consumed by a monitor thread.
+    """
+
+    def __init__(self, training_job_config: TrainingJobConfig = TrainingJobConfig()):
+        """
+        :param training_job_config: Number of finished jobs kept and niceness of the training process
+        """
+        self.training_job_config = training_job_config
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._active_job: Optional[TrainingJob] = None
+        self._active_process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def submit(self) -> Tuple[TrainingJob, bool]:
+        """
+        Starts a training run unless one is already running.
+        :return: The job and whether it was newly created (False when coalesced)
+        """
+        with self._lock:
+            if self._active_job is not None:
+                self.coalesced += 1
+                logging.info(f"Training job {self._active_job.job_id} already {self._active_job.status}, "
+                             f"coalescing the new submission")
+                return self._active_job, False
+
+            job = TrainingJob(job_id=uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            self._active_job = job
+            while len(self._jobs) > self.training_job_config.history_size:
+                self._jobs.popitem(last=False)
+
+            process = subprocess.Popen(
+                [sys.executable, "-m", __name__, "--niceness", str(self.training_job_config.niceness)],
+                stdout=subprocess.PIPE, text=True,
+            )
+            self._active_process = process
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+
+        threading.Thread(target=self._monitor, args=(job, process),
+                         name="training-monitor", daemon=True).start()
+        logging.info(f"Started training job {job.job_id} in process {process.pid}")
+        return job, True
+
+    def _monitor(self, job: TrainingJob, process: subprocess.Popen) -> None:
+        accepted, error = None, None
+        try:
+            with process.stdout:
+                for line in process.stdout:
+                    event = json.loads(line)
+                    if event[0] == "result":
+                        _, accepted, error = event
+                        break
+                    _, stage, stage_event, duration = event
+                    with self._lock:
+                        if stage_event == "started":
+                            job.current_stage = stage
+                        else:
+                            job.current_stage = None
+                            job.stage_durations[stage] = duration
+                    if stage_event != "started":
+                        TRAINING_STAGE_DURATION.labels(stage=stage, result=stage_event).observe(duration)
+                else:
+                    error = f"Training process exited with code {process.wait()}"
+        except Exception as e:
+            # A malformed event (e.g. stray output of a native library, or a write cut short by a kill)
+            # fails the job; the process is stopped, as nothing would read its later events
+            accepted, error = None, f"Unreadable event from the training process: {e!r}"
+            process.terminate()
+        finally:
+            # Always finish the job, so later submissions are not coalesced into it forever
+            process.wait()
+            with self._lock:
+                job.finished_at = datetime.now(timezone.utc)
+                job.current_stage = None
+                job.model_accepted = accepted
+                job.error = error
+                job.status = "failed" if error else "succeeded"
+                if self._active_job is job:
+                    self._active_job = None
+                    self._active_process = None
+        logging.info(f"Training job {job.job_id} {job.status}" + (f": {error}" if error else ""))
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def get_jobs(self) -> List[dict]:
+        """
+        Returns the retained jobs, most recent first.
+        """
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "active_job_id": self._active_job.job_id if self._active_job else None,
+                "jobs": len(self._jobs),
+                "coalesced": self.coalesced,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stops a running training process so it does not outlive the server.
+        """
+        with self._lock:
+            process = self._active_process
+        if process is not None and process.poll() is None:
+            logging.info(f"Terminating training process {process.pid}")
+            process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs one training job; used by TrainingJobManager")
+    parser.add_argument("--niceness", type=int, default=0)
+    _run_training_process(parser.parse_args().niceness)
@@ -1,4 +1,6 @@
 import sys
+import time
+from typing import Callable, Dict, List, Optional
 from src.exception import CustomException
 from src.logger import logging
 
@@ -27,6 +29,38 @@ class TrainingPipeline:
         self.model_trainer_config = ModelTrainerConfig()
         self.model_evaluation_config = ModelEvaluationConfig()
         self.model_pusher_config = ModelPusherConfig()
+        self.current_stage: Optional[str] = None
+        self.stage_durations: Dict[str, float] = {}
+        self._stage_listeners: List[Callable[[str, str, Optional[float]], None]] = []
+
+    def add_stage_listener(self, listener: Callable[[str, str, Optional[float]], None]) -> None:
+        """
+        Registers a callback run with (stage, event, duration) when a start_* stage of
+        run_pipeline is "started", "finished" or "failed"; duration is None on "started".
+        """
+        self._stage_listeners.append(listener)
+
+    def _run_stage(self, stage_method: Callable, **kwargs):
+        """
+        Runs one start_* stage, recording it as the current stage and timing it.
+        """
+        stage = stage_method.__name__
+        self.current_stage = stage
+        for listener in self._stage_listeners:
+            listener(stage, "started", None)
+        start = time.perf_counter()
+        event = "failed"
+        try:
+            artifact = stage_method(**kwargs)
+            event = "finished"
+            return artifact
+        finally:
+            duration = time.perf_counter() - start
+            self.stage_durations[stage] = duration
+            self.current_stage = None
+            logging.info(f"Stage {stage} {event} in {duration:.3f}s")
+            for listener in self._stage_listeners:
+                listener(stage, event, duration)
 
     def start_data_ingestion(self) -> DataIngestionArtifact:
         """
@@ -109,18 +143,23 @@ class TrainingPipeline:
         except Exception as e:
             raise CustomException(e, sys) from e
         
-    def run_pipeline(self)->None:
+    def run_pipeline(self)->Optional[ModelPusherArtifact]:
+        """
+        Runs every stage in order.
+        :return: The model pusher artifact, None when the trained model was not accepted
+        """
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-            data_transformation_artifact = self.start_data_transformation(data_validation_artifact=data_validation_artifact,data_ingestion_artifact=data_ingestion_artifact)
-            model_trainer_artifact = self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
-            model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,model_trainer_artifact=model_trainer_artifact)
+            data_ingestion_artifact = self._run_stage(self.start_data_ingestion)
+            data_validation_artifact = self._run_stage(self.start_data_validation, data_ingestion_artifact=data_ingestion_artifact)
+            data_transformation_artifact = self._run_stage(self.start_data_transformation, data_validation_artifact=data_validation_artifact,data_ingestion_artifact=data_ingestion_artifact)
+            model_trainer_artifact = self._run_stage(self.start_model_trainer, data_transformation_artifact=data_transformation_artifact)
+            model_evaluation_artifact = self._run_stage(self.start_model_evaluation, data_ingestion_artifact=data_ingestion_artifact,model_trainer_artifact=model_trainer_artifact)
             if not model_evaluation_artifact.is_model_accepted:
                 logging.info(f"Model not accepted.")
                 return None
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
-            
+            model_pusher_artifact = self._run_stage(self.start_model_pusher, model_evaluation_artifact=model_evaluation_artifact)
+            return model_pusher_artifact
+
 
         except Exception as e:
             raise CustomException(e, sys) from e
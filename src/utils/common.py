@@ -1,3 +1,6 @@
+import hashlib
+import json
+import mmap
 import os
 import yaml
 from box import Box
@@ -5,6 +8,8 @@ from pathlib import Path
 from typing import Any
 import logging
 from src.exception import CustomException
+from src.utils.compression import (COMPRESSION_HEADER_SIZE, detect_compression, normalize_compression,
+                                   open_compressed_writer, open_decompressed_reader)
 import sys
 import dill
 import numpy as np
@@ -72,13 +77,18 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
 def load_object(file_path: str) -> object:
     """
     Returns model/object from project directory.
+    Compressed files (see save_object) are recognized by their leading bytes and
+    decompressed while they are unpickled.
     file_path: str location of file to load
     return: Model/Obj
     """
     try:
         with open(file_path, "rb") as file_obj:
-            obj = dill.load(file_obj)
-        return obj
+            compression = detect_compression(file_obj.peek(COMPRESSION_HEADER_SIZE)[:COMPRESSION_HEADER_SIZE])
+            if compression is None:
+                return dill.load(file_obj)
+            with open_decompressed_reader(file_obj, compression) as reader:
+                return dill.load(reader)
     except Exception as e:
         raise CustomException(e, sys) from e
 
@@ -113,16 +123,105 @@ def load_numpy_array_data(file_path: str) -> np.array:
 
 
 
-def save_object(file_path: str, obj: object) -> None:
+def save_object(file_path: str, obj: object, compression: str = None, compression_level: int = None) -> None:
+    """
+    Pickles obj with dill, optionally compressed while it is written.
+    compression: "gzip", "bz2", "lzma" or "zstd"; None or "none" writes a plain pickle
+    compression_level: codec compression level, None for the codec's default
+    """
     logging.info("Entered the save_object method of utils")
 
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        compression = normalize_compression(compression)
         with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+            if compression is None:
+                dill.dump(obj, file_obj)
+            else:
+                with open_compressed_writer(file_obj, compression, compression_level) as writer:
+                    dill.dump(obj, writer)
 
         logging.info("Exited the save_object method of utils")
 
     except Exception as e:
         raise CustomException(e, sys) from e
 
+
+def get_file_sha256(file_path: str) -> str:
+    """
+    Returns the hex SHA-256 digest of a file, read in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# File layout of save_mapped_arrays: magic, header length, JSON header, then 64-byte aligned arrays
+MAPPED_ARRAYS_MAGIC = b"VIPARR01"
+MAPPED_ARRAYS_ALIGNMENT = 64
+
+
+def save_mapped_arrays(file_path: str, arrays: dict, metadata: dict = None) -> None:
+    """
+    Saves named numpy arrays into one file that load_mapped_arrays can memory-map.
+    The file is written under a temporary name and renamed into place, so readers
+    never see a partial file.
+    file_path: str location of file to save
+    arrays: dict of name -> np.array
+    metadata: JSON-serializable dict stored in the header
+    """
+    try:
+        arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+        entries, offset = {}, 0
+        for name, array in arrays.items():
+            entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += -(-array.nbytes // MAPPED_ARRAYS_ALIGNMENT) * MAPPED_ARRAYS_ALIGNMENT
+        header = json.dumps({"metadata": metadata or {}, "arrays": entries}).encode()
+        data_start = -(-(len(MAPPED_ARRAYS_MAGIC) + 8 + len(header)) // MAPPED_ARRAYS_ALIGNMENT) * MAPPED_ARRAYS_ALIGNMENT
+
+        dir_path = os.path.dirname(file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file_obj:
+            file_obj.write(MAPPED_ARRAYS_MAGIC + len(header).to_bytes(8, "little") + header)
+            for name, array in arrays.items():
+                file_obj.seek(data_start + entries[name]["offset"])
+                file_obj.write(array.tobytes())
+            file_obj.truncate(data_start + offset)
+            file_obj.flush()
+            os.fsync(file_obj.fileno())
+        os.replace(temp_path, file_path)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+def load_mapped_arrays(file_path: str) -> tuple:
+    """
+    Memory-maps a file written by save_mapped_arrays.
+    The arrays are read-only views on the mapping, so every process mapping the
+    same file shares one copy of the data in the page cache.
+    file_path: str location of file to load
+    return: (dict of name -> read-only np.array, metadata dict)
+    """
+    try:
+        with open(file_path, "rb") as file_obj:
+            mapping = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapping[:len(MAPPED_ARRAYS_MAGIC)] != MAPPED_ARRAYS_MAGIC:
+            raise ValueError(f"{file_path} is not a mapped arrays file")
+        header_start = len(MAPPED_ARRAYS_MAGIC) + 8
+        header_length = int.from_bytes(mapping[len(MAPPED_ARRAYS_MAGIC):header_start], "little")
+        header = json.loads(mapping[header_start:header_start + header_length])
+        data_start = -(-(header_start + header_length) // MAPPED_ARRAYS_ALIGNMENT) * MAPPED_ARRAYS_ALIGNMENT
+
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype="int64"))
+            arrays[name] = np.frombuffer(mapping, dtype=dtype, count=count,
+                                         offset=data_start + entry["offset"]).reshape(entry["shape"])
+        return arrays, header["metadata"]
+    except Exception as e:
+        raise CustomException(e, sys) from e
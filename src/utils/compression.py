@@ -0,0 +1,101 @@
+import bz2
+import gzip
+import io
+import lzma
+import shutil
+from typing import BinaryIO, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional, the stdlib codecs work without it
+    zstandard = None
+
+# Codecs a model file can be compressed with: file suffix and leading magic bytes of each
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "bz2": ".bz2", "lzma": ".xz", "zstd": ".zst"}
+_COMPRESSION_MAGIC = {"gzip": b"\x1f\x8b", "bz2": b"BZh", "lzma": b"\xfd7zXZ\x00", "zstd": b"\x28\xb5\x2f\xfd"}
+# Longest magic; enough leading bytes to tell every codec apart
+COMPRESSION_HEADER_SIZE = 6
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def normalize_compression(compression: Optional[str]) -> Optional[str]:
+    """
+    Returns the codec name of compression, None for no compression ("" or "none").
+    Raises ValueError for unknown codecs and when zstd is asked for without zstandard installed.
+    """
+    if not compression or compression == "none":
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression {compression!r}, expected one of none, "
+                         f"{', '.join(COMPRESSION_SUFFIXES)}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package: pip install zstandard")
+    return compression
+
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """
+    Returns the codec whose magic bytes header starts with, None for uncompressed data.
+    """
+    for compression, magic in _COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def detect_file_compression(file_path: str) -> Optional[str]:
+    with open(file_path, "rb") as file_obj:
+        return detect_compression(file_obj.read(COMPRESSION_HEADER_SIZE))
+
+
+def open_compressed_writer(file_obj: BinaryIO, compression: str, level: Optional[int] = None) -> BinaryIO:
+    """
+    Wraps a binary file object so everything written to it is compressed with compression.
+    Closing the writer flushes the codec's frame but leaves file_obj open.
+    :param level: Codec compression level, None for the codec's default
+    """
+    compression = normalize_compression(compression)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=file_obj, mode="wb", mtime=0, compresslevel=9 if level is None else level)
+    if compression == "bz2":
+        return bz2.BZ2File(file_obj, mode="wb", compresslevel=9 if level is None else level)
+    if compression == "lzma":
+        return lzma.LZMAFile(file_obj, mode="wb", preset=level)
+    if compression == "zstd":
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level, threads=-1)
+        return compressor.stream_writer(file_obj, closefd=False)
+    raise ValueError("No compression to write with")
+
+
+def open_decompressed_reader(file_obj: BinaryIO, compression: str) -> BinaryIO:
+    """
+    Wraps a readable binary stream, e.g. an open file or an S3 response body, so reads
+    return the decompressed data. Data is decompressed chunk by chunk as it is read;
+    neither the compressed nor the decompressed content is held in memory as a whole.
+    The reader supports read, readinto and readline, as pickle.load needs.
+    """
+    compression = normalize_compression(compression)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=file_obj, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(file_obj, mode="rb")
+    if compression == "lzma":
+        return lzma.LZMAFile(file_obj, mode="rb")
+    if compression == "zstd":
+        # The zstandard reader has no readline; the buffer adds it
+        reader = zstandard.ZstdDecompressor().stream_reader(file_obj, read_size=_COPY_BUFFER_SIZE, closefd=False)
+        return io.BufferedReader(reader, buffer_size=_COPY_BUFFER_SIZE)
+    raise ValueError("No compression to read with")
+
+
+def compress_file(file_path: str, compression: str, level: Optional[int] = None) -> str:
+    """
+    Writes a compressed copy of file_path next to it, with the codec's suffix.
+    :return: Path of the compressed file
+    """
+    compression = normalize_compression(compression)
+    compressed_path = file_path + COMPRESSION_SUFFIXES[compression]
+    with open(file_path, "rb") as source, open(compressed_path, "wb") as target:
+        with open_compressed_writer(target, compression, level) as writer:
+            shutil.copyfileobj(source, writer, _COPY_BUFFER_SIZE)
+    return compressed_path
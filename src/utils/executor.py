@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.entity.config_entity import ServingConfig
+from src.logger import logging
+
+
+class ExecutorOverloadedError(Exception):
+    """
+    Raised when the inference queue is full and a new task is rejected.
+    """
+
+
+class _PoolStats:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _asdict(self) -> dict:
+        return dict(self.__dict__)
+
+
+class ServingExecutor:
+    """
+    Runs blocking work off the asyncio event loop.
+
+    CPU-bound scoring goes to a bounded inference thread pool and blocking
+    storage calls (S3 listing, download, unpickling) to a separate I/O pool,
+    so a slow request never stalls the other connections of the worker.
+    """
+
+    def __init__(self, serving_config: ServingConfig = ServingConfig()):
+        """
+        :param serving_config: Pool sizes and the maximum number of queued inference tasks
+        """
+        self.serving_config = serving_config
+        self._lock = threading.Lock()
+        self._inference_pool = ThreadPoolExecutor(max_workers=serving_config.inference_workers,
+                                                  thread_name_prefix="inference")
+        self._io_pool = ThreadPoolExecutor(max_workers=serving_config.io_workers,
+                                           thread_name_prefix="storage-io")
+        self._inference_stats = _PoolStats(serving_config.inference_workers)
+        self._io_stats = _PoolStats(serving_config.io_workers)
+        logging.info(f"Serving executor started with {serving_config}")
+
+    async def run_inference(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a CPU-bound callable on the inference pool.
+        Raises ExecutorOverloadedError when max_queue_size tasks are already waiting.
+        """
+        return await self._run(self._inference_pool, self._inference_stats, self.serving_config.max_queue_size,
+                               func, *args, **kwargs)
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a blocking storage call on the I/O pool.
+        """
+        return await self._run(self._io_pool, self._io_stats, None, func, *args, **kwargs)
+
+    def _run(self, pool: ThreadPoolExecutor, stats: _PoolStats, max_queue_size, func: Callable, *args, **kwargs):
+        with self._lock:
+            if max_queue_size is not None and stats.queued >= max_queue_size:
+                stats.rejected += 1
+                raise ExecutorOverloadedError(f"Inference queue is full ({stats.queued} tasks waiting)")
+            stats.queued += 1
+
+        def task():
+            with self._lock:
+                stats.queued -= 1
+                stats.running += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    stats.running -= 1
+                    stats.completed += 1
+
+        future = pool.submit(task)
+        # A future cancelled before it started (the awaiting request went away, or shutdown) never runs task
+        future.add_done_callback(lambda done: self._release_cancelled(stats) if done.cancelled() else None)
+        return asyncio.wrap_future(future)
+
+    def _release_cancelled(self, stats: _PoolStats) -> None:
+        with self._lock:
+            stats.queued -= 1
+
+    def get_stats(self) -> dict:
+        """
+        Returns the current queue depth, running tasks and totals of both pools.
+        """
+        with self._lock:
+            return {
+                "inference": dict(self._inference_stats._asdict(), max_queue_size=self.serving_config.max_queue_size),
+                "io": self._io_stats._asdict(),
+            }
+
+    def shutdown(self) -> None:
+        self._inference_pool.shutdown(wait=False, cancel_futures=True)
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,278 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from 100us to 60s; covers a single-row predict up to a cold model load
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+BATCH_SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 10000)
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def get(self) -> float:
+        return self._value
+
+
+class _GaugeChild(_CounterChild):
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    @contextmanager
+    def track_inprogress(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class _Timer:
+    # A plain class rather than @contextmanager: about half the cost on the hot path
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: "_HistogramChild"):
+        self._histogram = histogram
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def time(self) -> "_Timer":
+        """
+        Context manager observing the wall time of the enclosed block, also when it raises.
+        """
+        return _Timer(self)
+
+    def get(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._default_child = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *label_values, **label_kwargs):
+        """
+        Returns the child series for the given label values; children are created once and cached.
+        """
+        if label_kwargs:
+            label_values = tuple(label_kwargs[name] for name in self.label_names)
+        key = tuple(str(value) for value in label_values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default_child.inc(amount)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield self.name, _format_labels(self.label_names, key), child.get()
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default_child.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default_child.set(value)
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, label_names)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default_child.observe(value)
+
+    def time(self):
+        return self._default_child.time()
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            counts, total = child.get()
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_label = f'le="{_format_value(upper_bound)}"'
+                yield f"{self.name}_bucket", _format_labels(self.label_names, key, bucket_label), cumulative
+            yield f"{self.name}_sum", _format_labels(self.label_names, key), total
+            yield f"{self.name}_count", _format_labels(self.label_names, key), cumulative
+
+
+class MetricsRegistry:
+    """
+    In-process registry of counters, gauges and histograms.
+
+    Recording is a lock-protected add on a pre-created series (a bisect for
+    histograms), cheap enough to stay enabled on the prediction hot path.
+    render() produces the Prometheus text exposition format served at /metrics.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not metric_class:
+                raise ValueError(f"Metric {name} is already registered as a {metric.metric_type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, label_names)
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, label_names)
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        return self._register(Histogram, name, documentation, label_names,
+                              buckets=buckets or DEFAULT_LATENCY_BUCKETS)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry and the metrics of the serving and training paths
+metrics_registry = MetricsRegistry()
+
+HTTP_REQUESTS = metrics_registry.counter(
+    "vehicle_http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    "vehicle_http_requests_in_flight", "HTTP requests currently being handled")
+HTTP_REQUEST_DURATION = metrics_registry.histogram(
+    "vehicle_http_request_duration_seconds", "End-to-end HTTP request latency", ("route",))
+PREDICTION_STAGE_DURATION = metrics_registry.histogram(
+    "vehicle_prediction_stage_duration_seconds",
+    "Latency of one stage of the prediction path: form_parse, dataframe_build, "
+    "feature_vector_build, preprocess_transform, forest_predict", ("stage",))
+PREDICTION_BATCH_SIZE = metrics_registry.histogram(
+    "vehicle_prediction_batch_size", "Rows scored per model call", ("source",), buckets=BATCH_SIZE_BUCKETS)
+MODEL_LOADS = metrics_registry.counter(
+    "vehicle_model_loads_total", "Production model loads from S3", ("result",))
+MODEL_SWAPS = metrics_registry.counter(
+    "vehicle_model_swaps_total", "Served model replaced by a newly loaded model version")
+MODEL_REFRESH_CHECKS = metrics_registry.counter(
+    "vehicle_model_refresh_checks_total",
+    "Polls of the model version marker by the model refresher (unchanged, swapped or failed)", ("result",))
+MODEL_CACHE_LOOKUPS = metrics_registry.counter(
+    "vehicle_model_cache_lookups_total",
+    "Model loads served from the local model cache (hit) or downloaded into it (download)", ("result",))
+MODEL_LOAD_DURATION = metrics_registry.histogram(
+    "vehicle_model_load_duration_seconds", "Time to download and unpickle the production model")
+S3_TRANSFER_BYTES = metrics_registry.counter(
+    "vehicle_s3_transfer_bytes_total", "Bytes uploaded to or downloaded from S3", ("direction",))
+S3_TRANSFER_DURATION = metrics_registry.histogram(
+    "vehicle_s3_transfer_duration_seconds", "Duration of S3 file transfers", ("direction",))
+S3_TRANSFER_THROUGHPUT = metrics_registry.gauge(
+    "vehicle_s3_transfer_last_throughput_bytes_per_second", "Throughput of the last S3 file transfer",
+    ("direction",))
+TRAINING_STAGE_DURATION = metrics_registry.histogram(
+    "vehicle_training_stage_duration_seconds", "Duration of the start_* stages of training jobs",
+    ("stage", "result"))
+LOG_RECORDS_DROPPED = metrics_registry.counter(
+    "vehicle_log_records_dropped_total",
+    "Log records discarded by the rate limit (rate_limited) or a full log queue (queue_full)", ("reason",))
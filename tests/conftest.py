@@ -0,0 +1,22 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.constants import REGION_NAME
+
+BUCKET_NAME = "test-model-bucket"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """
+    boto3 client of a mocked S3 holding the empty bucket BUCKET_NAME.
+    """
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name=REGION_NAME)
+        client.create_bucket(Bucket=BUCKET_NAME)
+        yield client
+        SimpleStorageService.metadata_cache.invalidate(BUCKET_NAME)
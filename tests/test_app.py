@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+from tests.test_prediction_pipeline import RECORD
+
+
+@pytest.fixture(scope="module")
+def client():
+    # No lifespan: invalid requests are answered before any model is needed
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("record, errors", [
+    (dict(RECORD, Age=-5), {"records[0].Age": "must be between 18 and 100"}),
+    (dict(RECORD, Age=True), {"records[0].Age": "must be a number"}),
+])
+def test_batch_rejects_what_predict_rejects(client, record, errors):
+    assert client.post("/predict", json=record).status_code == 422
+    response = client.post("/predict/batch", json={"records": [RECORD, record]})
+    assert response.status_code == 422
+    assert response.json() == {"errors": {key.replace("[0]", "[1]"): error for key, error in errors.items()}}
+
+
+def test_batch_reports_invalid_json_like_predict(client):
+    response = client.post("/predict/batch", content=b"{'records': []}", headers={"content-type": "application/json"})
+    assert response.status_code == 422
+    assert response.json() == {"errors": {"body": "invalid JSON"}}
+
+
+@pytest.mark.parametrize("threshold", [None, True, "0.5", 1.5])
+def test_proba_rejects_a_threshold_that_is_not_a_probability(client, threshold):
+    response = client.post("/predict/proba", json={"records": [RECORD], "threshold": threshold})
+    assert response.status_code == 422
+    assert response.json() == {"errors": {"threshold": "must be a number between 0 and 1"}}
+
+
+def test_proba_rejects_what_predict_rejects(client):
+    response = client.post("/predict/proba", json={"records": [dict(RECORD, Age=-5)], "top_k": 0})
+    assert response.status_code == 422
+    assert response.json() == {"errors": {"records[0].Age": "must be between 18 and 100",
+                                          "top_k": "must be a positive integer"}}
+
+
+def test_upload_names_the_missing_columns(client):
+    csv_text = "id,Gender,Age,Driving_License,Region_Code,Previously_Insured,Annual_Premium,Policy_Sales_Channel," \
+               "Vintage\n1,Male,44,1,28.0,0,40454.0,26.0,217\n"
+    response = client.post("/predict/upload", files={"file": ("customers.csv", csv_text, "text/csv")})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["errors"] == {"Vehicle_Age": "column required", "Vehicle_Damage": "column required"}
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_model import build_model, make_features
+from src.constants import PREDICTION_FEATURE_COLUMNS
+from src.entity.estimator import CompiledPreprocessor, MyModel
+from src.entity.forest_engine import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def model():
+    return build_model(n_rows=2000)
+
+
+def make_rows(model: MyModel, n_rows: int = 600):
+    """
+    Synthetic feature rows where every third row sits exactly on a split threshold of a
+    passthrough column, and a tenth of the rows have a NaN feature.
+    """
+    features = make_features(n_rows, seed=7).astype("float64")
+    compiled_preprocessor = model.get_compiled_preprocessor()
+    # Passthrough columns reach the forest unchanged, so their thresholds can be hit exactly
+    passthrough = (compiled_preprocessor.offset == 0) & (compiled_preprocessor.scale == 1) & \
+                  (compiled_preprocessor.multiplier == 1) & (compiled_preprocessor.addend == 0)
+    tree = model.trained_model_object.estimators_[0].tree_
+    splits = [node for node in np.flatnonzero(tree.children_left != -1) if passthrough[tree.feature[node]]]
+    for row in range(0, n_rows, 3):
+        node = splits[row % len(splits)]
+        column = compiled_preprocessor.feature_names[compiled_preprocessor.indices[tree.feature[node]]]
+        features.loc[row, column] = tree.threshold[node]
+    for row in range(0, n_rows, 10):
+        features.loc[row, features.columns[row % features.shape[1]]] = np.nan
+    return features
+
+
+def test_compiled_preprocessor_matches_pipeline(model):
+    features = make_rows(model)
+    compiled_preprocessor = CompiledPreprocessor(model.preprocessing_object, list(PREDICTION_FEATURE_COLUMNS))
+    np.testing.assert_array_equal(compiled_preprocessor.transform(features.to_numpy()),
+                                  model.preprocessing_object.transform(features))
+
+
+def test_predict_features_matches_pipeline(model):
+    features = make_rows(model)
+    np.testing.assert_array_equal(model.predict_features(features.to_numpy()), model.predict(features))
+
+
+def test_from_compiled_matches_pipeline(model):
+    features = make_rows(model)
+    compiled_model = MyModel.from_compiled(None, CompiledForest.from_sklearn(model.trained_model_object),
+                                           model.get_compiled_preprocessor())
+    np.testing.assert_array_equal(compiled_model.predict(features), model.predict(features))
+    np.testing.assert_array_equal(compiled_model.predict_proba(features), model.predict_proba(features))
+    # Single rows take the same path as a production request
+    for row in (0, 1, 3, 10):
+        np.testing.assert_array_equal(compiled_model.predict_proba(features.iloc[[row]]),
+                                      model.predict_proba(features.iloc[[row]]))
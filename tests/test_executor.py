@@ -0,0 +1,31 @@
+import asyncio
+import threading
+
+from src.entity.config_entity import ServingConfig
+from src.utils.executor import ServingExecutor
+
+
+def test_cancelled_queued_calls_release_their_queue_slots():
+    async def scenario():
+        executor = ServingExecutor(ServingConfig(inference_workers=1, io_workers=1, max_queue_size=3))
+        release = threading.Event()
+        try:
+            blocker = asyncio.ensure_future(executor.run_inference(release.wait))
+            await asyncio.sleep(0.05)
+            queued = [asyncio.ensure_future(executor.run_inference(lambda: None)) for _ in range(3)]
+            await asyncio.sleep(0)
+            assert executor.get_stats()["inference"]["queued"] == 3
+
+            for call in queued:
+                call.cancel()
+            await asyncio.gather(*queued, return_exceptions=True)
+            release.set()
+            await blocker
+
+            assert executor.get_stats()["inference"]["queued"] == 0
+            assert await executor.run_inference(lambda: 42) == 42
+        finally:
+            release.set()
+            executor.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.entity.forest_engine import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def forest():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(0, 2, 3000), rng.integers(18, 90, 3000),
+                         rng.normal(size=3000), rng.uniform(0, 1e5, 3000)])
+    y = ((X[:, 0] == 1) & (X[:, 2] > 0) | (rng.random(3000) < 0.1)).astype(int)
+    return RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+
+
+def make_rows(forest, n_rows: int, seed: int) -> np.ndarray:
+    """
+    Rows drawn around the split thresholds: a third exactly on one, a tenth with a NaN feature.
+    """
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([rng.integers(0, 2, n_rows), rng.integers(18, 90, n_rows),
+                         rng.normal(size=n_rows), rng.uniform(0, 1e5, n_rows)]).astype("float64")
+    tree = forest.estimators_[0].tree_
+    splits = np.flatnonzero(tree.children_left != -1)
+    for row in range(0, n_rows, 3):
+        node = splits[row % len(splits)]
+        X[row, tree.feature[node]] = tree.threshold[node]
+    X[::10, seed % X.shape[1]] = np.nan
+    return X
+
+
+@pytest.mark.parametrize("n_rows", [1, 5000])
+def test_compiled_forest_matches_sklearn(forest, n_rows):
+    compiled_forest = CompiledForest.from_sklearn(forest)
+    for seed in range(4):
+        X = make_rows(forest, n_rows, seed)
+        np.testing.assert_array_equal(compiled_forest.predict_proba(X), forest.predict_proba(X))
+        np.testing.assert_array_equal(compiled_forest.predict(X), forest.predict(X))
+
+
+def test_compiled_forest_round_trips_through_arrays(forest):
+    X = make_rows(forest, 500, seed=0)
+    compiled_forest = CompiledForest.from_arrays(CompiledForest.from_sklearn(forest).to_arrays())
+    np.testing.assert_array_equal(compiled_forest.predict_proba(X), forest.predict_proba(X))
@@ -0,0 +1,86 @@
+import logging
+import os
+import queue
+
+import pytest
+
+import src.logger
+from src.logger import BatchingQueueListener, DroppingQueueHandler, configure_logger
+from src.utils.metrics import LOG_RECORDS_DROPPED
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_listener_stop_drains_a_full_queue():
+    record_queue = queue.Queue(maxsize=3)
+    queue_handler = DroppingQueueHandler(record_queue)
+    list_handler = ListHandler()
+    listener = BatchingQueueListener(record_queue, list_handler, flush_interval=0.05, respect_handler_level=False)
+    dropped_before = LOG_RECORDS_DROPPED.labels(reason="queue_full").get()
+    for i in range(5):
+        queue_handler.handle(make_record(f"record {i}"))
+    assert record_queue.full()
+    assert LOG_RECORDS_DROPPED.labels(reason="queue_full").get() == dropped_before + 2
+
+    listener.start()
+    listener.stop()
+    assert listener._thread is None
+    assert [record.getMessage() for record in list_handler.records] == ["record 0", "record 1", "record 2"]
+    # A second stop, as atexit runs after an explicit one, is a no-op
+    listener.stop()
+
+
+def test_listener_stop_gives_up_when_the_queue_stays_full():
+    record_queue = queue.Queue(maxsize=1)
+    record_queue.put_nowait(make_record("never drained"))
+    listener = BatchingQueueListener(record_queue, ListHandler(), flush_interval=60, respect_handler_level=False,
+                                     stop_timeout=0.05)
+    listener.start()
+    listener.stop()
+    assert listener._thread is not None
+
+
+@pytest.fixture
+def configured_handlers(monkeypatch):
+    """
+    Handlers added to the root logger by configure_logger in sync mode, with their output captured.
+    """
+    monkeypatch.setattr(src.logger, "from_root", lambda: os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    monkeypatch.setattr(src.logger, "LOG_MODE", "sync")
+    monkeypatch.setattr(src.logger, "LOG_MODULE_LEVELS", "tests.test_logger=INFO")
+    monkeypatch.setattr(src.logger, "LOG_RATE_LIMIT_PER_SECOND", 2)
+    root_logger = logging.getLogger()
+    existing_handlers = list(root_logger.handlers)
+    configure_logger()
+    handlers = [handler for handler in root_logger.handlers if handler not in existing_handlers]
+    outputs = []
+    for handler in handlers:
+        records = []
+        monkeypatch.setattr(handler, "emit", records.append)
+        outputs.append(records)
+    yield outputs
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+
+def test_filters_apply_to_named_loggers_and_count_each_record_once(configured_handlers):
+    named_logger = logging.getLogger("tests.named")
+    named_logger.debug("below the module level")
+    for i in range(5):
+        named_logger.info(f"record {i}")
+
+    # The file and the console handler both keep the first two records of the call site
+    for records in configured_handlers:
+        assert [record.getMessage() for record in records] == ["record 0", "record 1"]
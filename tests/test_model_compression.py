@@ -0,0 +1,29 @@
+import gzip
+import pickle
+
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.entity.model_registry import ModelRegistry
+from tests.conftest import BUCKET_NAME
+
+
+def test_load_model_reads_the_codec_from_the_body_not_the_cached_metadata(s3_client):
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=gzip.compress(pickle.dumps("first")),
+                         Metadata={"compression": "gzip"})
+    storage = SimpleStorageService()
+    assert storage.get_object_metadata("model.pkl", BUCKET_NAME)["compression"] == "gzip"
+    # Replaced by an uncompressed model while the metadata cache still says gzip
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="model.pkl", Body=pickle.dumps("second"))
+
+    assert storage.load_model("model.pkl", BUCKET_NAME) == "second"
+
+
+def test_model_artifacts_are_registered_uncompressed(s3_client, tmp_path):
+    artifact_path = tmp_path / "model.vipmodel"
+    artifact_path.write_bytes(b"mapped arrays" * 100)
+
+    manifest = ModelRegistry(BUCKET_NAME).register_model(str(artifact_path), compression="gzip")
+    assert manifest["compression"] is None
+    assert manifest["model_key"].endswith("model-registry/models/" + manifest["version"] + ".vipmodel")
+    stored = s3_client.get_object(Bucket=BUCKET_NAME, Key=manifest["model_key"])
+    assert stored["Body"].read() == artifact_path.read_bytes()
+    assert "compression" not in stored["Metadata"]
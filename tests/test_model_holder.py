@@ -0,0 +1,50 @@
+import pickle
+
+from benchmarks.synthetic_model import build_model
+from src.cloud_storage.aws_storage import SimpleStorageService
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.model_holder import ModelHolder
+from tests.conftest import BUCKET_NAME
+
+MODEL_KEY = "model.pkl"
+
+
+def put_model(s3_client, model) -> str:
+    return s3_client.put_object(Bucket=BUCKET_NAME, Key=MODEL_KEY, Body=pickle.dumps(model))["ETag"].strip('"')
+
+
+def test_model_version_is_the_etag_of_the_loaded_content(s3_client):
+    put_model(s3_client, {"model": "first"})
+    # The metadata cache still holds the first ETag when the model is replaced
+    SimpleStorageService().get_object_metadata(MODEL_KEY, BUCKET_NAME)
+    second_e_tag = put_model(s3_client, {"model": "second"})
+
+    model_holder = ModelHolder(VehiclePredictorConfig(model_file_path=MODEL_KEY, model_bucket_name=BUCKET_NAME,
+                                                      model_cache_dir="", warmup_rows=0))
+    model = model_holder.load()
+    assert model == {"model": "second"}
+    assert model_holder.model_version == second_e_tag
+
+
+def test_a_worker_that_fell_behind_keeps_the_newer_packed_version(s3_client, tmp_path):
+    first_e_tag = put_model(s3_client, build_model(n_rows=500))
+    model_holder = ModelHolder(VehiclePredictorConfig(model_file_path=MODEL_KEY, model_bucket_name=BUCKET_NAME,
+                                                      model_cache_dir="", warmup_rows=0,
+                                                      shared_model_store_dir=str(tmp_path)))
+    shared_model_store = model_holder.shared_model_store
+    save_model = shared_model_store.save_model
+    published = {}
+
+    def save_then_publish(model, model_version):
+        model_path = save_model(model, model_version)
+        # Another worker publishes and packs a newer version before this one cleans up
+        newer_model = build_model(n_rows=500, seed=1)
+        published["version"] = put_model(s3_client, newer_model)
+        save_model(newer_model, published["version"])
+        return model_path
+
+    shared_model_store.save_model = save_then_publish
+    model_holder.load()
+
+    assert model_holder.model_version == first_e_tag
+    assert shared_model_store.has_model(published["version"])
@@ -0,0 +1,79 @@
+import pickle
+
+import pytest
+
+from src.entity.model_registry import ModelRegistry
+from src.exception import CustomException
+from tests.conftest import BUCKET_NAME
+
+
+def write_model(path, content) -> str:
+    path.write_bytes(pickle.dumps(content))
+    return str(path)
+
+
+@pytest.fixture
+def registry(s3_client):
+    return ModelRegistry(BUCKET_NAME, registry_prefix="registry")
+
+
+def test_register_is_idempotent(registry, s3_client, tmp_path):
+    model_path = write_model(tmp_path / "model.pkl", {"model": "first"})
+    manifest = registry.register_model(model_path, metrics={"f1_score": 0.9})
+    upload = s3_client.head_object(Bucket=BUCKET_NAME, Key=manifest["model_key"])
+
+    assert registry.register_model(model_path, metrics={"f1_score": 0.5}) == manifest
+    # The model is not uploaded again
+    assert s3_client.head_object(Bucket=BUCKET_NAME, Key=manifest["model_key"])["LastModified"] == \
+        upload["LastModified"]
+    assert [version["version"] for version in registry.list_versions()] == [manifest["version"]]
+
+
+def test_promote_fails_when_the_pointer_changed_concurrently(registry, tmp_path, monkeypatch):
+    first = registry.register_model(write_model(tmp_path / "first.pkl", {"model": "first"}))
+    second = registry.register_model(write_model(tmp_path / "second.pkl", {"model": "second"}))
+    third = registry.register_model(write_model(tmp_path / "third.pkl", {"model": "third"}))
+    registry.promote(first["version"])
+
+    # This promotion reads the pointer, then another process promotes before its PUT
+    stale_pointer = registry.get_current()
+    ModelRegistry(BUCKET_NAME, registry_prefix="registry").promote(second["version"])
+    monkeypatch.setattr(registry, "get_current", lambda: stale_pointer)
+    with pytest.raises(CustomException):
+        registry.promote(third["version"])
+
+    monkeypatch.undo()
+    assert registry.get_current_manifest()["version"] == second["version"]
+
+
+def test_first_promotion_fails_when_another_one_won(registry, tmp_path, monkeypatch):
+    first = registry.register_model(write_model(tmp_path / "first.pkl", {"model": "first"}))
+    second = registry.register_model(write_model(tmp_path / "second.pkl", {"model": "second"}))
+    ModelRegistry(BUCKET_NAME, registry_prefix="registry").promote(first["version"])
+
+    # Read before the pointer existed, so the PUT requires that it still does not
+    monkeypatch.setattr(registry, "get_current", lambda: None)
+    with pytest.raises(CustomException):
+        registry.promote(second["version"])
+
+    monkeypatch.undo()
+    assert registry.get_current_manifest()["version"] == first["version"]
+
+
+def test_rollback_returns_to_the_previous_version(registry, tmp_path):
+    first = registry.register_model(write_model(tmp_path / "first.pkl", {"model": "first"}))
+    second = registry.register_model(write_model(tmp_path / "second.pkl", {"model": "second"}))
+    registry.promote(first["version"])
+    registry.promote(second["version"])
+
+    pointer = registry.rollback()
+    assert pointer["version"] == first["version"]
+    assert pointer["previous_version"] == second["version"]
+    assert registry.get_current_manifest()["version"] == first["version"]
+
+
+def test_rollback_without_a_previous_version_fails(registry, tmp_path):
+    first = registry.register_model(write_model(tmp_path / "first.pkl", {"model": "first"}))
+    registry.promote(first["version"])
+    with pytest.raises(CustomException, match="no previous model version"):
+        registry.rollback()
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.entity.config_entity import PredictionBatcherConfig, ServingConfig
+from src.pipline.prediction_batcher import PredictionBatcher
+from src.utils.executor import ExecutorOverloadedError, ServingExecutor
+
+
+def test_stop_waits_for_the_batches_being_scored():
+    async def scenario():
+        executor = ServingExecutor(ServingConfig(inference_workers=1, io_workers=1, max_queue_size=10))
+        scoring = threading.Event()
+
+        def predict(rows):
+            scoring.set()
+            threading.Event().wait(0.2)
+            return [row * 2 for row in rows]
+
+        batcher = PredictionBatcher(predict, executor, PredictionBatcherConfig(max_batch_size=8, max_wait_ms=0))
+        await batcher.start()
+        try:
+            prediction = asyncio.ensure_future(batcher.predict(21))
+            while not scoring.is_set():
+                await asyncio.sleep(0.01)
+            await batcher.stop()
+            # The batch finished before stop returned, so the executor can be shut down now
+            assert prediction.done() and prediction.result() == 42
+        finally:
+            executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_overloaded_batch_fails_without_retrying_row_by_row():
+    async def scenario():
+        executor = ServingExecutor(ServingConfig(inference_workers=1, io_workers=1, max_queue_size=10))
+        calls = []
+
+        async def run_inference(func, rows):
+            calls.append(len(rows))
+            raise ExecutorOverloadedError("Inference queue is full")
+
+        executor.run_inference = run_inference
+        batcher = PredictionBatcher(lambda rows: rows, executor,
+                                    PredictionBatcherConfig(max_batch_size=8, max_wait_ms=0))
+        await batcher.start()
+        try:
+            predictions = [asyncio.ensure_future(batcher.predict(row)) for row in range(3)]
+            results = await asyncio.gather(*predictions, return_exceptions=True)
+            assert all(isinstance(result, ExecutorOverloadedError) for result in results)
+            assert calls == [3]
+        finally:
+            await batcher.stop()
+            executor.shutdown()
+
+    asyncio.run(scenario())
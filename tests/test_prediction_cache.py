@@ -0,0 +1,47 @@
+from src.entity.config_entity import PredictionCacheConfig
+from src.entity.prediction_cache import PredictionCache
+
+
+def make_key(model_version: str, row: int):
+    return PredictionCache.make_key(model_version, (row, 1.0))
+
+
+def test_entry_bound_evicts_least_recently_used():
+    prediction_cache = PredictionCache(PredictionCacheConfig(max_entries=2, max_bytes=10 ** 9))
+    for row in range(3):
+        if row == 2:
+            # Touch row 0, so row 1 is the least recently used entry
+            assert prediction_cache.get(make_key("v1", 0)) == 0
+        prediction_cache.put(make_key("v1", row), row)
+
+    assert len(prediction_cache) == 2
+    assert prediction_cache.get(make_key("v1", 1)) is None
+    assert prediction_cache.get(make_key("v1", 0)) == 0
+    assert prediction_cache.get_stats()["evictions"] == 1
+
+
+def test_byte_bound_evicts_until_the_footprint_fits():
+    entry_bytes = PredictionCache._estimate_size(make_key("v1", 0), 0)
+    prediction_cache = PredictionCache(PredictionCacheConfig(max_entries=100, max_bytes=3 * entry_bytes))
+    for row in range(5):
+        prediction_cache.put(make_key("v1", row), 0)
+
+    assert len(prediction_cache) == 3
+    assert prediction_cache.current_bytes <= 3 * entry_bytes
+    assert [prediction_cache.get(make_key("v1", row)) for row in range(5)] == [None, None, 0, 0, 0]
+
+
+def test_invalidation_drops_entries_and_late_puts_of_the_old_version():
+    prediction_cache = PredictionCache(PredictionCacheConfig(max_entries=100, max_bytes=10 ** 9))
+    prediction_cache.invalidate(None, "v1")
+    prediction_cache.put(make_key("v1", 0), 1)
+
+    prediction_cache.invalidate(None, "v2")
+    assert len(prediction_cache) == 0 and prediction_cache.current_bytes == 0
+    # A scorer still running on the v1 snapshot finishes after the swap
+    prediction_cache.put(make_key("v1", 1), 1)
+    prediction_cache.put(make_key("v2", 1), 0)
+
+    assert len(prediction_cache) == 1
+    assert prediction_cache.get(make_key("v2", 1)) == 0
+    assert prediction_cache.get_stats()["stale_puts"] == 1
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from src.pipline.bulk_prediction import BulkPredictor
+from src.pipline.prediction_pipeline import VehicleDataBatch, VehicleDataSchema, VehicleDataValidationError
+
+RECORD = {"Gender": 1, "Age": 44, "Driving_License": 1, "Region_Code": 28.0, "Previously_Insured": 0,
+          "Annual_Premium": 40454.0, "Policy_Sales_Channel": 26.0, "Vintage": 217,
+          "Vehicle_Age_lt_1_Year": 0, "Vehicle_Age_gt_2_Years": 1, "Vehicle_Damage_Yes": 1}
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return VehicleDataSchema.from_schema_file()
+
+
+def test_parse_reports_every_invalid_field(schema):
+    record = dict(RECORD, Age=-5, Vintage=12.5, Gender=True, Region_Code="28", Extra=1)
+    del record["Annual_Premium"]
+
+    with pytest.raises(VehicleDataValidationError) as error:
+        schema.parse(record)
+    assert error.value.errors == {
+        "Gender": "must be a number",
+        "Age": "must be between 18 and 100",
+        "Region_Code": "must be a number",
+        "Annual_Premium": "field required",
+        "Vintage": "must be an integer",
+        "Extra": "unexpected field",
+    }
+
+
+def test_parse_accepts_a_valid_record(schema):
+    assert schema.parse(RECORD).Age == 44
+
+
+def test_batch_records_follow_the_rules_of_parse(schema):
+    records = [RECORD, dict(RECORD, Age=-5), dict(RECORD, Age=True, Vintage=12.5), dict(RECORD, Age=150)]
+    del records[3]["Gender"]
+
+    with pytest.raises(VehicleDataValidationError) as error:
+        VehicleDataBatch(records, schema)
+    assert error.value.errors == {
+        "records[3].Gender": "field required",
+        "records[2].Age": "must be a number",
+        "records[2].Vintage": "must be an integer",
+    }
+
+    with pytest.raises(VehicleDataValidationError) as error:
+        VehicleDataBatch([RECORD, dict(RECORD, Age=-5)], schema)
+    assert error.value.errors == {"records[1].Age": "must be between 18 and 100"}
+    assert len(VehicleDataBatch([RECORD, RECORD], schema)) == 2
+
+
+def test_upload_chunks_are_checked_against_the_ranges(schema):
+    chunk = pd.DataFrame([RECORD, dict(RECORD, Annual_Premium=-1.0)], index=[10, 11])
+    with pytest.raises(VehicleDataValidationError) as error:
+        BulkPredictor(model_predictor=None, schema=schema).score_chunk(chunk)
+    assert error.value.errors == {"row 11.Annual_Premium": "must be between 0 and 1000000"}
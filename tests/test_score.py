@@ -0,0 +1,45 @@
+import pytest
+
+from score import ChunkCheckpoint, read_chunks, score_file
+
+
+@pytest.mark.parametrize("output_content", [None, b"Response\n"])
+def test_resume_fails_clearly_without_the_checkpointed_output(tmp_path, output_content):
+    input_path, output_path = tmp_path / "in.csv", tmp_path / "out.csv"
+    input_path.write_text("Age\n44\n")
+    checkpoint_path = str(tmp_path / "out.csv.checkpoint.json")
+    ChunkCheckpoint(checkpoint_path, str(input_path), 1, resume=False).mark_completed(0, 1, output_bytes=100)
+    if output_content is not None:
+        output_path.write_bytes(output_content)
+
+    checkpoint = ChunkCheckpoint(checkpoint_path, str(input_path), 1, resume=True)
+    with pytest.raises(ValueError, match="Cannot resume"):
+        score_file(str(input_path), str(output_path), 1, 1, sharded=False, checkpoint=checkpoint)
+
+
+def test_read_chunks_numbers_rows_from_the_resume_row(tmp_path):
+    input_path = tmp_path / "in.csv"
+    input_path.write_text("Age\n" + "".join(f"{age}\n" for age in range(20, 30)))
+
+    chunks = list(read_chunks(str(input_path), 4, skip_rows=3, first_chunk=1))
+    assert [index for index, _ in chunks] == [1, 2]
+    assert [list(chunk.index) for _, chunk in chunks] == [[3, 4, 5, 6], [7, 8, 9]]
+    assert list(chunks[0][1]["Age"]) == [23, 24, 25, 26]
+
+
+def test_read_chunks_keeps_row_numbers_across_parquet_row_groups(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    input_path = str(tmp_path / "in.parquet")
+    # Depending on the pyarrow version, row groups of 5 rows end chunks of 4 early
+    pq.write_table(pa.table({"Age": list(range(20, 35))}), input_path, row_group_size=5)
+
+    chunks = list(read_chunks(input_path, 4))
+    assert all(len(chunk) <= 4 for _, chunk in chunks)
+    assert [row for _, chunk in chunks for row in chunk.index] == list(range(15))
+
+    for skip_rows in (7, 10):
+        resumed = list(read_chunks(input_path, 4, skip_rows=skip_rows, first_chunk=3))
+        assert resumed[0][0] == 3
+        assert [row for _, chunk in resumed for row in chunk.index] == list(range(skip_rows, 15))
+        assert [age for _, chunk in resumed for age in chunk["Age"]] == list(range(20 + skip_rows, 35))
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import time
+
+from src.pipline import training_jobs
+from src.pipline.training_jobs import TrainingJobManager
+
+
+def wait_until_finished(manager: TrainingJobManager, job_id: str) -> dict:
+    for _ in range(200):
+        job = manager.get_job(job_id)
+        if job["status"] != "running":
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Training job {job_id} did not finish")
+
+
+def test_malformed_event_fails_the_job_and_frees_the_slot(monkeypatch):
+    # A training process whose stdout starts with output that is not an event
+    script = "import time; print('native library banner'); time.sleep(60)"
+    popen = subprocess.Popen
+    monkeypatch.setattr(training_jobs.subprocess, "Popen",
+                        lambda args, **kwargs: popen([sys.executable, "-c", script], **kwargs))
+    manager = TrainingJobManager()
+
+    job, created = manager.submit()
+    finished = wait_until_finished(manager, job.job_id)
+    assert created
+    assert finished["status"] == "failed"
+    assert "Unreadable event" in finished["error"]
+
+    next_job, created = manager.submit()
+    assert created and next_job.job_id != job.job_id
+    wait_until_finished(manager, next_job.job_id)